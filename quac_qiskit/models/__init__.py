@@ -4,6 +4,8 @@
 """
 
 from .quac_job import QuacJob
-from .generic_backend_configuration import get_generic_configuration
+from .generic_backend_configuration import get_generic_configuration, DEFAULT_MAX_EXPERIMENTS
 from .quac_gates import SpecialQuacGates
 from .noise_model import QuacNoiseModel
+from .packed_memory import PackedMemory
+from .quac_result import QuacResult
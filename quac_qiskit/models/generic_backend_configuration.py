@@ -7,11 +7,15 @@ gates and functionality become available.
 from typing import Optional, List
 from qiskit.providers.models.backendconfiguration import QasmBackendConfiguration
 
+# Experiments of a job may be simulated in parallel, so generic backends accept batches by default
+DEFAULT_MAX_EXPERIMENTS = 300
 
-def get_generic_configuration(n_qubits: int, max_shots: Optional[int] = 8000, max_exp: Optional[int] = 1,
+
+def get_generic_configuration(n_qubits: int, max_shots: Optional[int] = 8000,
+                              max_exp: int = DEFAULT_MAX_EXPERIMENTS,
                               basis_gates: Optional[List[str]] = None) -> QasmBackendConfiguration:
     """Returns a generic backend configuration for users wishing to define their own hardware
-    Note: defaults are max_shots=8000,
+    Note: defaults are max_shots=8000, max_exp=300
     :param n_qubits: the number of qubits in the hardware
     :param max_shots: the maximum number of shots per experiment that can be run
     :param max_exp: the maximum number of experiments (or circuits) that can be run at once
@@ -122,7 +122,7 @@ class QuacNoiseModel:
         :param meas: integer (0 or 1)
         :return: a float
         """
-        return self._meas_matrices[qubit][prep][meas]
+        return self._meas_matrices[qubit][meas][prep]
 
     def zz(self, qubit1: Optional[int] = None, qubit2: Optional[int] = None) -> Union[List[Tuple[int, int]], float]:
         """ZZ getter method
@@ -135,6 +135,43 @@ class QuacNoiseModel:
             return list(self._zz.keys())
         return self._zz[(qubit1, qubit2)]
 
+    def key(self, include_meas: bool = True) -> Tuple:
+        """Returns a hashable summary of all noise parameters, e.g. for reusing simulations that were
+        set up with an identical noise model
+
+        :param include_meas: whether to include measurement error, which does not affect the
+            simulated density matrix
+        :return: a tuple of T1 times, T2 times, measurement matrix entries, and ZZ coupling terms
+        """
+        meas = None
+        if include_meas and self.has_meas():
+            meas = tuple(tuple(np.asarray(meas_matrix, dtype=float).flatten()) for meas_matrix in self._meas_matrices)
+
+        zz = None
+        if self.has_zz():
+            zz = tuple(sorted(self._zz.items()))
+
+        return tuple(self._t1_times), tuple(self._t2_times), meas, zz
+
+    def restrict(self, qubits: List[int]):
+        """Restricts the noise model to some of its qubits, which are relabeled 0, 1, ... in the order given
+
+        :param qubits: a list of qubit indices to keep
+        :return: a QuacNoiseModel object over len(qubits) qubits
+        """
+        meas_matrices = None
+        if self.has_meas():
+            meas_matrices = [self._meas_matrices[qubit] for qubit in qubits]
+
+        zz = None
+        if self.has_zz():
+            new_labels = {qubit: new_qubit for new_qubit, qubit in enumerate(qubits)}
+            zz = {(new_labels[qubit1], new_labels[qubit2]): value for (qubit1, qubit2), value in self._zz.items()
+                  if qubit1 in new_labels and qubit2 in new_labels}
+
+        return QuacNoiseModel([self._t1_times[qubit] for qubit in qubits], [self._t2_times[qubit] for qubit in qubits],
+                              meas_matrices, zz)
+
     @staticmethod
     def get_noiseless_model(n_qubits: int):
         """Returns a QuacNoiseModel that is effectively noiseless
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains a compact container for per-shot classical register memory
+"""
+from collections.abc import Sequence
+from typing import Union, List
+import numpy as np
+from quac_qiskit.exceptions import QuacOptionsError
+
+
+class PackedMemory(Sequence):
+    """Per-shot classical register memory stored as one packed unsigned integer per shot. Qiskit-style
+    hexadecimal strings are only produced when shots are accessed
+    """
+
+    def __init__(self, registers: np.array, memory_slots: int):
+        """Initialize packed memory
+
+        :param registers: a Numpy array of integer classical register values, one per shot
+        :param memory_slots: the number of classical register slots in each value
+        """
+        self._memory_slots = memory_slots
+        self._registers = np.asarray(registers).astype(PackedMemory.register_dtype(memory_slots))
+
+    def __len__(self) -> int:
+        return len(self._registers)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, "PackedMemory"]:
+        if isinstance(index, slice):
+            return PackedMemory(self._registers[index], self._memory_slots)
+        return hex(int(self._registers[index]))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PackedMemory):
+            return np.array_equal(self._registers, other.registers)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"PackedMemory(shots={len(self)}, memory_slots={self._memory_slots})"
+
+    @property
+    def registers(self) -> np.array:
+        """Packed classical register values getter
+
+        :return: a Numpy array with one unsigned integer per shot
+        """
+        return self._registers
+
+    def to_list(self) -> List[str]:
+        """Converts packed memory to a list of Qiskit-style hexadecimal strings
+
+        :return: a list of strings, one per shot
+        """
+        return [hex(register) for register in self._registers.tolist()]
+
+    @staticmethod
+    def register_dtype(memory_slots: int) -> np.dtype:
+        """Chooses the smallest unsigned integer type able to hold a classical register
+
+        :param memory_slots: the number of classical register slots
+        :return: a Numpy unsigned integer dtype
+        """
+        for dtype in [np.uint8, np.uint16, np.uint32, np.uint64]:
+            if memory_slots <= np.iinfo(dtype).bits:
+                return np.dtype(dtype)
+        raise QuacOptionsError("Packed memory supports at most 64 classical register slots")
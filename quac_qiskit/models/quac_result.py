@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains a QuaC result class, which extends the Qiskit Result class so that results
+holding packed per-shot memory can still be serialized
+"""
+from typing import Dict
+from qiskit.result import Result
+from .packed_memory import PackedMemory
+
+
+class QuacResult(Result):
+    """A Qiskit Result whose experiments may keep their per-shot memory packed
+    """
+
+    def to_dict(self) -> Dict:
+        """Converts the result to a dictionary of plain (JSON-serializable) data, producing Qiskit-style
+        hexadecimal strings from packed memory
+
+        :return: a dictionary in the format of Qiskit's Result.to_dict
+        """
+        out_dict = super().to_dict()
+        for experiment_dict in out_dict["results"]:
+            if isinstance(experiment_dict["data"].get("memory"), PackedMemory):
+                experiment_dict["data"] = dict(experiment_dict["data"],
+                                               memory=experiment_dict["data"]["memory"].to_list())
+        return out_dict
@@ -5,28 +5,21 @@ interfaced with
 """
 
 from typing import List, Optional
-import quac
 from qiskit.providers.basebackend import BaseBackend
 from qiskit.providers.baseprovider import BaseProvider
 from qiskit.test.mock.fake_provider import FakeProvider
 from quac_qiskit.simulators import QuacCountsSimulator, QuacDensitySimulator
-from quac_qiskit.models import get_generic_configuration, QuacNoiseModel
+from quac_qiskit.models import get_generic_configuration, QuacNoiseModel, DEFAULT_MAX_EXPERIMENTS
 from .exceptions import QuacBackendError
 
 
 class QuacProvider(BaseProvider):
     """QuaC Provider to serve all QuaC backends
     """
-    provider_instantiated = False
 
     def __init__(self, user_def_backends: Optional[List[BaseBackend]] = None):
-        """Initialize a QuaC provider
+        """Initialize a QuaC provider. QuaC itself is initialized when it first simulates a circuit
         """
-        if not QuacProvider.provider_instantiated:
-            quac.initialize()  # QuaC must only be initialized once
-
-        QuacProvider.provider_instantiated = True
-
         self._sim_types = ["density", "counts"]
         self._ibmq_provider = FakeProvider()
         self._backend_options = []
@@ -76,7 +69,7 @@ class QuacProvider(BaseProvider):
                 get_generic_configuration(
                     n_qubits=kwargs.get("n_qubits"),
                     max_shots=kwargs.get("max_shots"),
-                    max_exp=kwargs.get("max_exp"),
+                    max_exp=kwargs.get("max_exp", DEFAULT_MAX_EXPERIMENTS),
                     basis_gates=kwargs.get("basis_gates")
                 )
             )
@@ -85,7 +78,7 @@ class QuacProvider(BaseProvider):
                 get_generic_configuration(
                     n_qubits=kwargs.get("n_qubits"),
                     max_shots=kwargs.get("max_shots"),
-                    max_exp=kwargs.get("max_exp"),
+                    max_exp=kwargs.get("max_exp", DEFAULT_MAX_EXPERIMENTS),
                     basis_gates=kwargs.get("basis_gates")
                 )
             )
@@ -3,7 +3,17 @@
 """Manages access to backends simulators
 """
 
+from .measurement import classical_register_values, classical_register_table, register_hex_keys, \
+    apply_readout_error, marginalize_probabilities, marginalize_states, combine_independent_probabilities, \
+    apply_meas_matrices, significant_outcomes
+from .cache import LRUCache, ResultCache
 from .quac_simulator import QuacSimulator
 from .quac_density_simulator import QuacDensitySimulator
 from .quac_counts_simulator import QuacCountsSimulator
 from .schedule import list_schedule_experiment
+from .translate import CompiledExperiment, compile_experiment, prune_idle_qubits, split_independent_clusters, \
+    build_quac_circuit
+from .lindblad import LindbladEngine, simulate_prefix_tree
+from .fusion import fuse_gates
+from .statevector import run_statevector
+from .trajectories import TrajectoryEngine
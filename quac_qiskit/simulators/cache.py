@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains caches that let QuaC backends skip work they have already done, such as
+scheduling and translating an experiment that was simulated moments earlier with a different
+noise model, or simulating an experiment that was already simulated with the same noise model.
+"""
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import tempfile
+import numpy as np
+from qiskit.qobj.qasm_qobj import QasmQobjExperiment
+from qiskit.providers.models.backendproperties import BackendProperties
+
+
+class LRUCache:
+    """A least recently used cache that keeps track of its hits and misses
+    """
+
+    def __init__(self, max_size: int):
+        """Initialize an empty cache
+
+        :param max_size: the number of entries kept before the least recently used one is evicted
+        """
+        self._entries = OrderedDict()
+        self._max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Looks up an entry and marks it as most recently used
+
+        :param key: the key of the entry
+        :param default: the value returned on a miss
+        :return: the cached value or default
+        """
+        if key not in self._entries:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Adds an entry, evicting the least recently used entries if the cache is full
+
+        :param key: the key of the entry
+        :param value: the value to cache
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes all entries and resets statistics
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Reports how effective the cache has been
+
+        :return: a dictionary with the number of hits, misses, current entries, and maximum entries
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "max_size": self._max_size}
+
+
+def properties_key(hardware_props: Optional[BackendProperties]) -> Optional[str]:
+    """Computes a digest of backend properties, which determine gate lengths during scheduling
+
+    :param hardware_props: a Qiskit BackendProperties object
+    :return: a hexadecimal digest string, or None if there are no properties
+    """
+    if hardware_props is None:
+        return None
+
+    properties_json = json.dumps(hardware_props.to_dict(), sort_keys=True, default=str)
+    return hashlib.sha1(properties_json.encode()).hexdigest()
+
+
+def _param_key(param: Any) -> Any:
+    """Canonicalizes an instruction parameter for use in a key
+
+    :param param: a Qobj instruction parameter
+    :return: the parameter as a float, or its repr if it is not a real scalar (e.g. an array or string)
+    """
+    try:
+        return float(param)
+    except (TypeError, ValueError):
+        return repr(param)
+
+
+def instructions_key(qexp: QasmQobjExperiment) -> Tuple:
+    """Builds a structural key for the instructions of an experiment. Experiment names and headers are
+    left out, so identically built circuits share a key
+
+    :param qexp: a Qasm quantum object experiment
+    :return: a hashable tuple of the number of qubits and every instruction's name, qubits,
+        parameters, and memory slots
+    """
+    return qexp.config.n_qubits, tuple(
+        (instruction.name,
+         tuple(getattr(instruction, "qubits", [])),
+         tuple(_param_key(param) for param in getattr(instruction, "params", [])),
+         tuple(getattr(instruction, "memory", [])))
+        for instruction in qexp.instructions
+    )
+
+
+def compiled_experiment_key(qexp: QasmQobjExperiment, gate_times: Optional[List[float]],
+                            simulation_length: Optional[float], hardware_props_key: Optional[str],
+                            fusion_window: Optional[float] = None) -> Tuple:
+    """Builds the key under which a compiled experiment is cached
+
+    :param qexp: a Qasm quantum object experiment
+    :param gate_times: custom gate times, if any
+    :param simulation_length: custom simulation length, if any
+    :param hardware_props_key: a digest of the backend properties (see properties_key)
+    :param fusion_window: the fusion window gates were fused with, or None if they were not fused
+    :return: a hashable tuple
+    """
+    return (instructions_key(qexp), tuple(gate_times) if gate_times else None, simulation_length,
+            hardware_props_key, fusion_window)
+
+
+def result_key(*inputs) -> str:
+    """Computes a canonical digest of everything that determines a simulation outcome
+
+    :param inputs: JSON-serializable simulation inputs (tuples, lists, numbers, strings, or None)
+    :return: a hexadecimal SHA-256 digest string
+    """
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=repr).encode()).hexdigest()
+
+
+class ResultCache:
+    """A content-addressed cache of simulation outcomes (probabilities over measured qubits before
+    measurement error) with an in-memory LRU tier and an optional on-disk tier. Since measurement error
+    and sampling are applied afterwards, cached outcomes are shared by the density and counts backends
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_memory_entries: int = 1024,
+                 max_disk_bytes: int = 2 ** 30):
+        """Initialize a result cache
+
+        :param cache_dir: a directory for persisting outcomes across sessions (memory only if None)
+        :param max_memory_entries: the number of outcomes kept in memory
+        :param max_disk_bytes: the total size of outcome files kept on disk before the least recently
+            used ones are deleted
+        """
+        self._memory = LRUCache(max_memory_entries)
+        self._cache_dir = cache_dir
+        self._max_disk_bytes = max_disk_bytes
+        self.disk_hits = 0
+        self.misses = 0
+
+        # The size of the disk tier is tracked as outcomes are written, so only evictions scan the directory
+        self._disk_bytes = 0
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._scan_disk())
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Looks up a simulation outcome, first in memory and then on disk
+
+        :param key: a digest computed via result_key
+        :return: an outcome dictionary or None on a miss
+        """
+        outcome = self._memory.get(key)
+        if outcome is not None:
+            return outcome
+        if self._cache_dir is None:
+            self.misses += 1
+            return None
+
+        path = self._path(key)
+        try:
+            with np.load(path) as outcome_file:
+                qubit_measurements = json.loads(str(outcome_file["qubit_measurements"]))
+                outcome = {
+                    "qubit_measurements": {int(qubit): slots for qubit, slots in qubit_measurements.items()},
+                    "measured_qubits": outcome_file["measured_qubits"].tolist(),
+                    "probabilities": outcome_file["probabilities"]
+                }
+            os.utime(path)  # mark as recently used for eviction
+        except (OSError, KeyError, ValueError):
+            self.misses += 1
+            return None
+
+        self.disk_hits += 1
+        self._memory.put(key, outcome)
+        return outcome
+
+    def put(self, key: str, outcome: Dict) -> None:
+        """Stores a simulation outcome in memory and, if enabled, on disk
+
+        :param key: a digest computed via result_key
+        :param outcome: an outcome dictionary holding qubit measurements, measured qubits, and probabilities
+        """
+        outcome = {name: outcome[name] for name in ["qubit_measurements", "measured_qubits", "probabilities"]}
+        self._memory.put(key, outcome)
+
+        if self._cache_dir is None:
+            return
+
+        # Write atomically so concurrent processes never read partial files
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+        with os.fdopen(file_descriptor, "wb") as temp_file:
+            np.savez(temp_file, probabilities=outcome["probabilities"],
+                     measured_qubits=np.array(outcome["measured_qubits"], dtype=int),
+                     qubit_measurements=json.dumps(outcome["qubit_measurements"]))
+        path = self._path(key)
+        self._disk_bytes += os.path.getsize(temp_path) - self._file_size(path)
+        os.replace(temp_path, path)
+
+        if self._disk_bytes > self._max_disk_bytes:
+            self._evict_disk()
+
+    def clear(self) -> None:
+        """Removes all outcomes from memory and disk
+        """
+        self._memory.clear()
+        self.disk_hits = 0
+        self.misses = 0
+        for path in self._disk_files():
+            os.remove(path)
+        self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Reports how effective the cache has been
+
+        :return: a dictionary with memory hits, disk hits, misses, memory entries, and disk bytes used
+        """
+        memory_stats = self._memory.stats()
+        return {
+            "memory_hits": memory_stats["hits"],
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_size": memory_stats["size"],
+            "disk_bytes": self._disk_bytes
+        }
+
+    def __getstate__(self) -> Dict:
+        """Pickles the cache (e.g. for worker processes) without its in-memory outcomes
+
+        :return: the cache state
+        """
+        state = self.__dict__.copy()
+        state["_memory"] = LRUCache(self._memory.stats()["max_size"])
+        return state
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._cache_dir, key + ".npz")
+
+    def _disk_files(self) -> List[str]:
+        if self._cache_dir is None:
+            return []
+        return [os.path.join(self._cache_dir, name) for name in os.listdir(self._cache_dir) if name.endswith(".npz")]
+
+    @staticmethod
+    def _file_size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0  # not written yet or removed by another process
+
+    def _scan_disk(self) -> List[Tuple[float, int, str]]:
+        """Lists the outcome files on disk
+
+        :return: a list of tuples of the modification time, size, and path of every outcome file
+        """
+        files = []
+        for path in self._disk_files():
+            try:
+                file_stat = os.stat(path)
+            except OSError:
+                continue  # removed by another process
+            files.append((file_stat.st_mtime, file_stat.st_size, path))
+        return files
+
+    def _evict_disk(self) -> None:
+        """Deletes the least recently used outcome files until the disk tier fits its size limit. The
+        directory is rescanned, since other processes may share it
+        """
+        files = self._scan_disk()
+        total_bytes = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total_bytes <= self._max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total_bytes -= size
+
+        self._disk_bytes = total_bytes
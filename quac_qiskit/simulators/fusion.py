@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains a gate fusion pass over compiled experiments. Every gate of a compiled
+experiment is a separate event at which QuaC (or the NumPy engine) stops integrating, so chains of
+single-qubit gates left by the transpiler are merged into single u3 gates, and adjacent two-qubit
+gates on the same pair of qubits are consolidated, along with the single-qubit gates around them,
+into the shortest equivalent sequence of at most one cnot or cz gate and u3 gates (or cancelled).
+"""
+from typing import Dict, List, Optional, Tuple
+import math
+import numpy as np
+from .gates import gate_matrix, has_gate_matrix, u3_angles
+from .translate import CompiledExperiment
+
+# Two-qubit gates consolidated blocks may be rebuilt around (the two-qubit gates experiments are translated to)
+_TWO_QUBIT_GATES = ["cnot", "cz"]
+
+# Exchanges the two qubits of a two-qubit matrix
+_SWAP = gate_matrix("swap", {"qubit1": 0, "qubit2": 1})[0]
+
+
+def _same_up_to_phase(matrix: np.array, other_matrix: np.array, tolerance: float = 1e-9) -> bool:
+    """Checks whether two unitary matrices differ by at most a global phase
+
+    :param matrix: a unitary Numpy array
+    :param other_matrix: a unitary Numpy array of the same shape
+    :param tolerance: the allowed deviation of the normalized overlap from 1
+    :return: True if the matrices are equal up to a global phase
+    """
+    return abs(abs(np.vdot(other_matrix, matrix)) / matrix.shape[0] - 1) < tolerance
+
+
+def _pair_matrix(gate: str, gate_arguments: Dict) -> Tuple[np.array, Tuple[int, int]]:
+    """Looks up the matrix of a two-qubit gate acting on its qubits in ascending order
+
+    :param gate: a QuaC gate name
+    :param gate_arguments: keyword arguments of the gate as passed to quac.Circuit.add_gate
+    :return: a tuple of the 4x4 matrix and the (ascending) pair of qubits it acts on
+    """
+    matrix, qubits = gate_matrix(gate, gate_arguments)
+    if qubits[0] > qubits[1]:
+        return _SWAP @ matrix @ _SWAP, (qubits[1], qubits[0])
+    return matrix, (qubits[0], qubits[1])
+
+
+def _local_factors(matrix: np.array, tolerance: float = 1e-9) -> Optional[Tuple[np.array, np.array]]:
+    """Splits a two-qubit matrix into single-qubit matrices if it is a tensor product of them
+
+    :param matrix: a 4x4 Numpy array acting on two qubits (the first one is the most significant)
+    :param tolerance: the largest relative second singular value of a tensor product
+    :return: a tuple of the 2x2 matrices acting on the first and second qubit (each unitary up to a
+        global phase if matrix is unitary), or None if matrix entangles the qubits
+    """
+    # Rearranged this way, a tensor product A x B becomes the rank-one matrix vec(A) vec(B)^T
+    reshuffled = matrix.reshape(2, 2, 2, 2).transpose(0, 2, 1, 3).reshape(4, 4)
+    left_vectors, singular_values, right_vectors = np.linalg.svd(reshuffled)
+    if singular_values[1] > tolerance * singular_values[0]:
+        return None
+
+    scale = math.sqrt(singular_values[0])
+    return (left_vectors[:, 0] * scale).reshape(2, 2), (right_vectors[0, :] * scale).reshape(2, 2)
+
+
+def _local_gates(factors: Tuple[np.array, np.array], pair: Tuple[int, int], time: float) -> List[Tuple[str, Dict]]:
+    """Turns single-qubit matrices into u3 gates, leaving out the ones equal to the identity
+
+    :param factors: the 2x2 matrices acting on the first and second qubit of pair
+    :param pair: the ascending pair of qubits
+    :param time: the time (in nanoseconds) at which to apply the gates
+    :return: a list of at most two u3 gates
+    """
+    local_gates = []
+    for qubit, factor in zip(pair, factors):
+        if not _same_up_to_phase(factor, np.eye(2)):
+            theta, phi, lam = u3_angles(factor)
+            local_gates.append(("u3", {"qubit1": qubit, "time": time, "theta": theta, "phi": phi, "lam": lam}))
+
+    return local_gates
+
+
+def _rebuild_block(matrix: np.array, pair: Tuple[int, int], time: float) -> Optional[List[Tuple[str, Dict]]]:
+    """Finds the shortest sequence of at most one supported two-qubit gate and u3 gates (before or
+    after it) that is equal to the unitary of a consolidated block
+
+    :param matrix: the 4x4 matrix of the block, acting on pair in ascending order
+    :param pair: the ascending pair of qubits the block acts on
+    :param time: the time (in nanoseconds) at which to apply the replacement
+    :return: a list of replacement gates (empty if the block cancels out), or None if no such
+        sequence exists
+    """
+    candidates = []
+    factors = _local_factors(matrix)
+    if factors is not None:
+        candidates.append(_local_gates(factors, pair, time))
+
+    for gate in _TWO_QUBIT_GATES:
+        for qubit1, qubit2 in [pair, pair[::-1]]:
+            gate_arguments = {"qubit1": qubit1, "qubit2": qubit2, "time": time}
+            two_qubit_matrix = _pair_matrix(gate, gate_arguments)[0]
+
+            # The block either ends with single-qubit gates after the two-qubit gate...
+            factors = _local_factors(matrix @ two_qubit_matrix.conj().T)
+            if factors is not None:
+                candidates.append([(gate, gate_arguments)] + _local_gates(factors, pair, time))
+
+            # ... or starts with single-qubit gates before it
+            factors = _local_factors(two_qubit_matrix.conj().T @ matrix)
+            if factors is not None:
+                candidates.append(_local_gates(factors, pair, time) + [(gate, gate_arguments)])
+
+    return min(candidates, key=len) if candidates else None
+
+
+def _fuse_single_qubit_gates(gates: List[Tuple[str, Dict, float]],
+                             fusion_window: float) -> List[Tuple[str, Dict, float]]:
+    """Merges runs of single-qubit gates on the same qubit into u3 gates
+
+    :param gates: QuaC gate names, keyword arguments, and end times, ordered by time
+    :param fusion_window: the largest idle time (in nanoseconds) between consecutive gates of a run
+    :return: a list of QuaC gate names, keyword arguments, and end times, ordered by time
+    """
+    fused_gates = []
+    runs = {}  # qubit -> gates of the current run on that qubit
+
+    def flush(qubit: int) -> None:
+        run = runs.pop(qubit, [])
+        if len(run) == 1:
+            fused_gates.append(run[0])
+        elif len(run) > 1:
+            matrix = np.eye(2, dtype=complex)
+            for gate, gate_arguments, _ in run:
+                matrix = gate_matrix(gate, gate_arguments)[0] @ matrix
+
+            if _same_up_to_phase(matrix, np.eye(2)):
+                return  # the run cancels out
+
+            # The merged gate takes the place of the last gate of the run
+            theta, phi, lam = u3_angles(matrix)
+            fused_gates.append(("u3", {"qubit1": qubit, "time": run[-1][1]["time"],
+                                       "theta": theta, "phi": phi, "lam": lam}, run[-1][2]))
+
+    for gate, gate_arguments, end_time in gates:
+        if "qubit2" in gate_arguments or not has_gate_matrix(gate, gate_arguments):
+            # Two-qubit gates and gates without a known matrix end the runs on their qubits
+            flush(gate_arguments["qubit1"])
+            flush(gate_arguments.get("qubit2"))
+            fused_gates.append((gate, gate_arguments, end_time))
+            continue
+
+        qubit = gate_arguments["qubit1"]
+        if qubit in runs and gate_arguments["time"] - runs[qubit][-1][2] > fusion_window:
+            flush(qubit)
+        runs.setdefault(qubit, []).append((gate, gate_arguments, end_time))
+
+    for qubit in list(runs):
+        flush(qubit)
+
+    # Runs are flushed late, so restore time order (gates on different qubits at equal times commute)
+    return sorted(fused_gates, key=lambda fused_gate: fused_gate[1]["time"])
+
+
+def _consolidate_two_qubit_gates(gates: List[Tuple[str, Dict, float]],
+                                 fusion_window: float) -> List[Tuple[str, Dict, float]]:
+    """Consolidates adjacent two-qubit gates on the same pair of qubits, together with the single-qubit
+    gates on that pair directly before, between, and after them, into blocks. Each block is replaced
+    with the shortest equivalent sequence of at most one cnot or cz gate and u3 gates if that sequence
+    is shorter than the block (so blocks that cancel out are dropped)
+
+    :param gates: QuaC gate names, keyword arguments, and end times, ordered by time
+    :param fusion_window: the largest idle time (in nanoseconds) between consecutive gates of a block
+    :return: a list of QuaC gate names, keyword arguments, and end times, ordered by time
+    """
+    consolidated_gates = []  # one list of gates per input gate, emptied or replaced as blocks are rebuilt
+    open_blocks = {}  # ascending pair of qubits -> indices of the gates of the block on it
+    latest_single_qubit_gates = {}  # qubit -> index of its latest gate, if that is a single-qubit gate
+
+    def gate_end(index: int) -> float:
+        return consolidated_gates[index][0][2]
+
+    def block_on(qubit: int) -> Optional[Tuple[int, int]]:
+        return next((pair for pair in open_blocks if qubit in pair), None)
+
+    def close(pair: Tuple[int, int]) -> None:
+        indices = open_blocks.pop(pair)
+        if len(indices) < 2:
+            return
+
+        matrix = np.eye(4, dtype=complex)
+        for index in indices:
+            gate, gate_arguments, _ = consolidated_gates[index][0]
+            if "qubit2" in gate_arguments:
+                matrix = _pair_matrix(gate, gate_arguments)[0] @ matrix
+            elif gate_arguments["qubit1"] == pair[0]:
+                matrix = np.kron(gate_matrix(gate, gate_arguments)[0], np.eye(2)) @ matrix
+            else:
+                matrix = np.kron(np.eye(2), gate_matrix(gate, gate_arguments)[0]) @ matrix
+
+        # The replacement takes the place of the last gate of the block
+        replacement = _rebuild_block(matrix, pair, consolidated_gates[indices[-1]][0][1]["time"])
+        if replacement is not None and len(replacement) < len(indices):
+            end_time = gate_end(indices[-1])
+            for index in indices:
+                consolidated_gates[index] = []
+            consolidated_gates[indices[-1]] = [(gate, gate_arguments, end_time)
+                                               for gate, gate_arguments in replacement]
+
+    for gate, gate_arguments, end_time in gates:
+        qubits = [gate_arguments["qubit1"]] + ([gate_arguments["qubit2"]] if "qubit2" in gate_arguments else [])
+        index = len(consolidated_gates)
+        consolidated_gates.append([(gate, gate_arguments, end_time)])
+
+        if not has_gate_matrix(gate, gate_arguments):
+            # Gates without a known matrix are left alone and end any block on their qubits
+            for qubit in qubits:
+                if block_on(qubit) is not None:
+                    close(block_on(qubit))
+                latest_single_qubit_gates.pop(qubit, None)
+            continue
+
+        if len(qubits) == 1:
+            pair = block_on(qubits[0])
+            if pair is not None and gate_arguments["time"] - gate_end(open_blocks[pair][-1]) > fusion_window:
+                close(pair)
+                pair = None
+
+            if pair is None:
+                latest_single_qubit_gates[qubits[0]] = index
+            else:
+                open_blocks[pair].append(index)
+                latest_single_qubit_gates.pop(qubits[0], None)
+            continue
+
+        pair = tuple(sorted(qubits))
+        if pair in open_blocks and gate_arguments["time"] - gate_end(open_blocks[pair][-1]) > fusion_window:
+            close(pair)
+
+        # Any other two-qubit gate on either qubit ends the blocks it touches
+        for qubit in pair:
+            other_pair = block_on(qubit)
+            if other_pair is not None and other_pair != pair:
+                close(other_pair)
+
+        if pair not in open_blocks:
+            # A new block also takes in the single-qubit gates directly before it
+            open_blocks[pair] = sorted(
+                latest_single_qubit_gates[qubit] for qubit in pair if qubit in latest_single_qubit_gates
+                and gate_arguments["time"] - gate_end(latest_single_qubit_gates[qubit]) <= fusion_window)
+        open_blocks[pair].append(index)
+        for qubit in pair:
+            latest_single_qubit_gates.pop(qubit, None)
+
+    for pair in list(open_blocks):
+        close(pair)
+
+    remaining_gates = [timed_gate for replacement in consolidated_gates for timed_gate in replacement]
+    return sorted(remaining_gates, key=lambda timed_gate: timed_gate[1]["time"])
+
+
+def fuse_gates(compiled_experiment: CompiledExperiment, fusion_window: float = 0) -> CompiledExperiment:
+    """Reduces the number of gate events of a compiled experiment. Single-qubit gates on the same qubit
+    are merged into a u3 gate, and blocks of two-qubit gates on the same pair of qubits (with the
+    single-qubit gates around them) are rebuilt from at most one cnot or cz gate and u3 gates (or
+    removed if they cancel out). Gates are fused if each one starts at most fusion_window nanoseconds
+    after the previous one ends, so by default gates that directly follow each other in the schedule
+    (or are simultaneous, for custom gate times) are fused. Gates whose matrix is not known are left
+    alone. Merged gates are applied at the time of their last gate, so the noise acting while the
+    earlier fused gates are scheduled (and, for a positive window, in between) acts on the state before
+    rather than after them. Simultaneous gates are fused exactly
+
+    :param compiled_experiment: a CompiledExperiment object
+    :param fusion_window: the largest idle time (in nanoseconds) between fused gates
+    :return: a CompiledExperiment object with fused gates
+    """
+    gate_lengths = compiled_experiment.gate_lengths or [0] * len(compiled_experiment.gates)
+    gates = [(gate, gate_arguments, gate_arguments["time"] + length)
+             for (gate, gate_arguments), length in zip(compiled_experiment.gates, gate_lengths)]
+
+    gates = _fuse_single_qubit_gates(gates, fusion_window)
+    gates = _consolidate_two_qubit_gates(gates, fusion_window)
+
+    gate_lengths = None
+    if compiled_experiment.gate_lengths is not None:
+        gate_lengths = tuple(end_time - gate_arguments["time"] for _, gate_arguments, end_time in gates)
+    return compiled_experiment._replace(gates=tuple((gate, gate_arguments) for gate, gate_arguments, _ in gates),
+                                        gate_lengths=gate_lengths)
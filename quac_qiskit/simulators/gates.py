@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains the unitary matrices of the gates QuaC circuits are built from, along with
+helpers for applying them to state vectors and density matrices stored as tensors with one axis
+of length 2 per qubit (qubit 0 is the first axis, i.e. the most significant bit).
+"""
+from typing import Dict, List, Tuple
+import cmath
+import math
+import numpy as np
+from quac_qiskit.exceptions import QuacBackendError
+
+# Fixed single-qubit gates, by QuaC gate name
+_FIXED_GATES = {
+    "i": np.eye(2, dtype=complex),
+    "x": np.array([[0, 1], [1, 0]], dtype=complex),
+    "y": np.array([[0, -1j], [1j, 0]], dtype=complex),
+    "z": np.array([[1, 0], [0, -1]], dtype=complex),
+    "h": np.array([[1, 1], [1, -1]], dtype=complex) / math.sqrt(2),
+    "s": np.array([[1, 0], [0, 1j]], dtype=complex),
+    "sdg": np.array([[1, 0], [0, -1j]], dtype=complex),
+    "t": np.array([[1, 0], [0, cmath.exp(1j * math.pi / 4)]], dtype=complex),
+    "tdg": np.array([[1, 0], [0, cmath.exp(-1j * math.pi / 4)]], dtype=complex),
+    "cnot": np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]], dtype=complex),
+    "cz": np.diag([1, 1, 1, -1]).astype(complex),
+    "swap": np.array([[1, 0, 0, 0], [0, 0, 1, 0], [0, 1, 0, 0], [0, 0, 0, 1]], dtype=complex)
+}
+
+
+def u3_matrix(theta: float, phi: float, lam: float) -> np.array:
+    """Computes the matrix of a generic single-qubit rotation
+
+    :param theta: the rotation angle
+    :param phi: the phase applied after the rotation
+    :param lam: the phase applied before the rotation
+    :return: a 2x2 unitary Numpy array
+    """
+    return np.array([
+        [math.cos(theta / 2), -cmath.exp(1j * lam) * math.sin(theta / 2)],
+        [cmath.exp(1j * phi) * math.sin(theta / 2), cmath.exp(1j * (phi + lam)) * math.cos(theta / 2)]
+    ], dtype=complex)
+
+
+def u3_angles(matrix: np.array, tolerance: float = 1e-12) -> Tuple[float, float, float]:
+    """Decomposes a single-qubit unitary into the angles of a u3 gate equal to it up to a global phase
+
+    :param matrix: a 2x2 unitary Numpy array
+    :param tolerance: the magnitude below which matrix entries are treated as zero
+    :return: a tuple of theta, phi, and lambda
+    """
+    theta = 2 * math.atan2(abs(matrix[1, 0]), abs(matrix[0, 0]))
+
+    if abs(matrix[0, 0]) < tolerance:
+        # Only the off-diagonal entries are left, so put the whole phase difference into lambda
+        global_phase = cmath.phase(matrix[1, 0])
+        return theta, 0.0, cmath.phase(-matrix[0, 1]) - global_phase
+
+    global_phase = cmath.phase(matrix[0, 0])
+    if abs(matrix[1, 0]) < tolerance:
+        # A diagonal matrix only fixes the sum of phi and lambda
+        return theta, cmath.phase(matrix[1, 1]) - global_phase, 0.0
+
+    return theta, cmath.phase(matrix[1, 0]) - global_phase, cmath.phase(-matrix[0, 1]) - global_phase
+
+
+def gate_matrix(gate: str, gate_arguments: Dict) -> Tuple[np.array, List[int]]:
+    """Looks up the unitary matrix of a QuaC gate
+
+    :param gate: a QuaC gate name
+    :param gate_arguments: keyword arguments of the gate as passed to quac.Circuit.add_gate
+    :return: a tuple of the unitary matrix and the qubits it acts on (qubit1 is the most significant)
+    """
+    qubits = [gate_arguments["qubit1"]]
+    if "qubit2" in gate_arguments:
+        qubits.append(gate_arguments["qubit2"])
+
+    if gate in _FIXED_GATES:
+        matrix = _FIXED_GATES[gate]
+    elif gate == "u3":
+        matrix = u3_matrix(gate_arguments["theta"], gate_arguments["phi"], gate_arguments["lam"])
+    elif gate == "u2":
+        matrix = u3_matrix(math.pi / 2, gate_arguments["phi"], gate_arguments["lam"])
+    elif gate == "u1":
+        matrix = np.diag([1, cmath.exp(1j * gate_arguments["lam"])])
+    elif gate == "rx":
+        matrix = u3_matrix(gate_arguments["theta"], -math.pi / 2, math.pi / 2)
+    elif gate == "ry":
+        matrix = u3_matrix(gate_arguments["theta"], 0, 0)
+    elif gate == "rz":
+        matrix = np.diag([cmath.exp(-1j * gate_arguments["theta"] / 2), cmath.exp(1j * gate_arguments["theta"] / 2)])
+    else:
+        raise QuacBackendError(f"Gate {gate} is not supported by the NumPy engine")
+
+    if matrix.shape[0] != 2 ** len(qubits):
+        raise QuacBackendError(f"Gate {gate} does not act on {len(qubits)} qubit(s)")
+
+    return matrix, qubits
+
+
+def has_gate_matrix(gate: str, gate_arguments: Dict) -> bool:
+    """Checks whether the unitary matrix of a QuaC gate is known (QuaC supports a few more gates)
+
+    :param gate: a QuaC gate name
+    :param gate_arguments: keyword arguments of the gate as passed to quac.Circuit.add_gate
+    :return: True if gate_matrix can look up the gate
+    """
+    try:
+        gate_matrix(gate, gate_arguments)
+    except (QuacBackendError, KeyError):
+        return False
+    return True
+
+
+def apply_matrix(tensor: np.array, matrix: np.array, axes: List[int]) -> np.array:
+    """Applies a matrix acting on some qubits to the corresponding axes of a state tensor
+
+    :param tensor: a Numpy array with one axis of length 2 per qubit
+    :param matrix: a 2^k x 2^k Numpy array acting on k qubits
+    :param axes: the axes of tensor the matrix acts on, from most to least significant qubit
+    :return: a new Numpy array with the same shape as tensor
+    """
+    n_axes = len(axes)
+    matrix = matrix.reshape([2] * (2 * n_axes))
+    result = np.tensordot(matrix, tensor, axes=(list(range(n_axes, 2 * n_axes)), axes))
+
+    # tensordot puts the output axes first, so move them back into place
+    return np.moveaxis(result, list(range(n_axes)), axes)
+
+
+def apply_gate_to_density_matrix(rho: np.array, gate: str, gate_arguments: Dict, batch_dims: int = 0) -> np.array:
+    """Applies a QuaC gate U to a density matrix as U rho U^dagger
+
+    :param rho: a density matrix tensor of shape [2] * (2 * n_qubits) (row axes first), possibly
+        preceded by batch axes
+    :param gate: a QuaC gate name
+    :param gate_arguments: keyword arguments of the gate as passed to quac.Circuit.add_gate
+    :param batch_dims: the number of leading batch axes of rho
+    :return: a new density matrix tensor
+    """
+    n_qubits = (rho.ndim - batch_dims) // 2
+    matrix, qubits = gate_matrix(gate, gate_arguments)
+    rho = apply_matrix(rho, matrix, [batch_dims + qubit for qubit in qubits])
+    return apply_matrix(rho, matrix.conj(), [batch_dims + n_qubits + qubit for qubit in qubits])
+
+
+def apply_gate_to_statevector(psi: np.array, gate: str, gate_arguments: Dict, batch_dims: int = 0) -> np.array:
+    """Applies a QuaC gate to a state vector
+
+    :param psi: a state vector tensor of shape [2] * n_qubits, possibly preceded by batch axes
+    :param gate: a QuaC gate name
+    :param gate_arguments: keyword arguments of the gate as passed to quac.Circuit.add_gate
+    :param batch_dims: the number of leading batch axes of psi
+    :return: a new state vector tensor
+    """
+    matrix, qubits = gate_matrix(gate, gate_arguments)
+    return apply_matrix(psi, matrix, [batch_dims + qubit for qubit in qubits])
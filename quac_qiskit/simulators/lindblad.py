@@ -0,0 +1,565 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains a NumPy density matrix engine for the Lindblad master equation QuaC solves.
+The engine models the same system QuaC is set up with: per-qubit emission (T1) and number-operator
+dephasing (T2) jump operators, ZZ couplings in the Hamiltonian, and gates that are applied
+instantaneously at their scheduled times. Unlike a QuaC instance, its state is a plain Numpy array,
+so simulations can be checkpointed and resumed.
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+import math
+import numpy as np
+from scipy.linalg import expm
+from quac_qiskit.exceptions import QuacOptionsError
+from quac_qiskit.models import QuacNoiseModel
+from .gates import apply_gate_to_density_matrix
+from .translate import CompiledExperiment
+
+
+def qubit_occupations(n_qubits: int) -> np.array:
+    """Lists the occupation of every qubit in every basis state
+
+    :param n_qubits: the number of qubits
+    :return: a Numpy array of shape (2^n_qubits, n_qubits) whose entry [state, qubit] is 1 if qubit is
+        excited in state (qubit 0 is the most significant bit)
+    """
+    states = np.arange(2 ** n_qubits)[:, np.newaxis]
+    return (states >> (n_qubits - 1 - np.arange(n_qubits))) & 1
+
+
+# Dormand-Prince 5(4) coefficients: stage weights of stages 2 to 7 (the last row doubles as the fifth
+# order solution weights) and the weights of the difference between fifth and fourth order solutions
+_DORMAND_PRINCE_STAGES = [
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+    [35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84]
+]
+_DORMAND_PRINCE_ERROR = [71 / 57600, 0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40]
+
+
+def layer_signature(layer_gates: List[Tuple[str, Dict]]) -> Tuple:
+    """Describes the gates of a layer independently of when the layer is applied
+
+    :param layer_gates: a list of QuaC gate names and keyword arguments
+    :return: a hashable tuple
+    """
+    return tuple((gate, tuple(sorted((name, value) for name, value in gate_arguments.items() if name != "time")))
+                 for gate, gate_arguments in layer_gates)
+
+
+def gate_layers(gates: Tuple[Tuple[str, Dict], ...]) -> List[Tuple[float, List[Tuple[str, Dict]]]]:
+    """Groups consecutive gates applied at the same time into layers
+
+    :param gates: QuaC gate names and keyword arguments as stored in a CompiledExperiment
+    :return: a list of tuples of a layer's time and its gates
+    """
+    layers = []
+    for gate, gate_arguments in gates:
+        if layers and layers[-1][0] == gate_arguments["time"]:
+            layers[-1][1].append((gate, gate_arguments))
+        else:
+            layers.append((gate_arguments["time"], [(gate, gate_arguments)]))
+    return layers
+
+
+def find_periodic_stretches(layers: List[Tuple[float, List]], min_repeats: int,
+                            max_period: int = 4) -> Dict[int, Tuple[int, int]]:
+    """Finds stretches of layers in which the same period of layers and waiting times repeats, such
+    as the identity gates padding T1 and T2 calibration circuits
+
+    :param layers: gate layers as returned by gate_layers
+    :param min_repeats: the minimum number of repetitions worth reporting
+    :param max_period: the maximum number of layers in a period
+    :return: a dictionary mapping the index of the first layer of a stretch to its period (in layers)
+        and number of repetitions
+    """
+    # A layer only fits into a period if the time until the next layer is known and positive
+    steps = [(layer_signature(layer[1]), next_layer[0] - layer[0]) for layer, next_layer in zip(layers, layers[1:])]
+
+    stretches = {}
+    index = 0
+    while index < len(steps):
+        best_period, best_repeats = 1, 1
+        for period in range(1, max_period + 1):
+            if index + period > len(steps) or any(interval <= 0 for _, interval in steps[index:index + period]):
+                break
+            repeats = 1
+            while steps[index + repeats * period:index + (repeats + 1) * period] == steps[index:index + period]:
+                repeats += 1
+            if repeats * period > best_repeats * best_period:
+                best_period, best_repeats = period, repeats
+
+        if best_repeats >= min_repeats:
+            stretches[index] = (best_period, best_repeats)
+            index += best_period * best_repeats
+        else:
+            index += 1
+
+    return stretches
+
+
+class LindbladEngine:
+    """Class for evolving density matrices of a fixed set of qubits under a fixed noise model
+    """
+    max_propagator_qubits = 4  # period superoperators of more qubits take too much time and memory to build
+    max_exponential_qubits = 6  # exact propagation of more qubits takes too much memory
+    min_propagator_repeats = 4  # shorter periodic stretches are cheaper to integrate directly
+    step_weight = 1000  # cost of an integration step per density matrix entry, in matrix product multiply-adds
+
+    def __init__(self, n_qubits: int, noise_model: QuacNoiseModel, dt: float = 10,
+                 reuse_propagators: bool = False, closed_form_idle: bool = True, solver: Optional[str] = None,
+                 atol: Optional[float] = None, rtol: Optional[float] = None):
+        """Initialize a Lindblad engine
+
+        :param n_qubits: the number of qubits to simulate
+        :param noise_model: the noise model to simulate
+        :param dt: the time step (in nanoseconds) of the fixed-step Runge-Kutta integrator
+        :param reuse_propagators: whether periodic stretches of gate layers should be simulated by
+            powering the superoperator of a single period
+        :param closed_form_idle: whether qubits without ZZ coupling should be evolved with their exact
+            amplitude damping and dephasing channels instead of being integrated
+        :param solver: rk4 for fixed steps of at most dt, dopri5 for adaptive steps, or expm for exact
+            propagation with the matrix exponential of the Lindbladian (by default, dopri5 if tolerances
+            are given and rk4 otherwise)
+        :param atol: the absolute tolerance of adaptive integration
+        :param rtol: the relative tolerance of adaptive integration
+        """
+        self.n_qubits = n_qubits
+        self.dt = dt
+
+        if solver is None:
+            solver = "dopri5" if atol is not None or rtol is not None else "rk4"
+        if solver not in ["rk4", "dopri5", "expm"]:
+            raise QuacOptionsError(f"Solver {solver} is not available for the NumPy engine")
+        if solver == "expm" and n_qubits > self.max_exponential_qubits:
+            raise QuacOptionsError(f"The expm solver supports at most {self.max_exponential_qubits} qubits")
+        self.solver = solver
+        self._generator = None
+        self._propagators = {}
+
+        # Adaptive integration starts out at dt and then lets the error estimate pick the step size
+        self.adaptive = solver == "dopri5"
+        self.atol = atol if atol is not None else 1e-8
+        self.rtol = rtol if rtol is not None else 1e-6
+        self.steps_taken = 0
+        self.steps_rejected = 0
+        self.propagator_builds = 0  # matrix exponentials and period superoperators computed
+        self.propagator_applications = 0  # evolutions carried out by a propagator rather than by steps
+        self._adaptive_step = dt
+        self.reuse_propagators = reuse_propagators and n_qubits <= self.max_propagator_qubits
+        self._period_superoperators = {}
+
+        # NOTE: rates follow the QuaC setup (1/T1 for emission and 2/T2 - 1/T1 for dephasing)
+        self.emission_rates = np.array([1 / noise_model.t1(qubit) for qubit in range(n_qubits)])
+        self.dephasing_rates = np.array([2 / noise_model.t2(qubit) - 1 / noise_model.t1(qubit)
+                                         for qubit in range(n_qubits)])
+
+        # Energies of the (diagonal) ZZ coupling Hamiltonian in angular frequency
+        occupations = qubit_occupations(n_qubits)
+        self.energies = np.zeros(2 ** n_qubits)
+        self.zz_couplings = []
+        if noise_model.has_zz():
+            for qubit1, qubit2 in noise_model.zz():
+                if qubit1 < n_qubits and qubit2 < n_qubits:
+                    zeta = noise_model.zz(qubit1, qubit2) * 2 * math.pi
+                    self.zz_couplings.append((qubit1, qubit2, zeta))
+                    self.energies += zeta * occupations[:, qubit1] * occupations[:, qubit2]
+
+        # Uncoupled qubits evolve independently of all others, so their dynamics can be solved exactly
+        coupled_qubits = set(qubit for qubit1, qubit2, _ in self.zz_couplings for qubit in [qubit1, qubit2])
+        self.closed_form_qubits = []
+        if closed_form_idle:
+            self.closed_form_qubits = [qubit for qubit in range(n_qubits) if qubit not in coupled_qubits]
+        self.integrated_qubits = [qubit for qubit in range(n_qubits) if qubit not in self.closed_form_qubits]
+
+        # Every integrated term except the emission jumps scales density matrix entries independently
+        total_rates = self.emission_rates + self.dephasing_rates
+        self.elementwise_rates = -1j * (self.energies[:, np.newaxis] - self.energies[np.newaxis, :])
+        for qubit in self.integrated_qubits:
+            row_occupations = occupations[:, qubit][:, np.newaxis]
+            col_occupations = occupations[:, qubit][np.newaxis, :]
+            self.elementwise_rates = self.elementwise_rates \
+                - 0.5 * total_rates[qubit] * (row_occupations + col_occupations) \
+                + self.dephasing_rates[qubit] * row_occupations * col_occupations
+
+    def initial_state(self) -> np.array:
+        """Creates the density matrix of all qubits in the ground state
+
+        :return: a 2^n_qubits x 2^n_qubits Numpy array
+        """
+        rho = np.zeros((2 ** self.n_qubits, 2 ** self.n_qubits), dtype=complex)
+        rho[0, 0] = 1
+        return rho
+
+    def derivative(self, rho: np.array) -> np.array:
+        """Evaluates the right-hand side of the Lindblad master equation for all terms that are not
+        evolved in closed form
+
+        :param rho: a density matrix, or a stack of density matrices along leading axes
+        :return: the time derivative of rho
+        """
+        drho = self.elementwise_rates * rho
+
+        # Emission moves population and coherences of excited qubits down to the ground state
+        for qubit in self.integrated_qubits:
+            rate = self.emission_rates[qubit]
+            if rate == 0:
+                continue
+            shape = (2 ** qubit, 2, 2 ** (self.n_qubits - qubit - 1))
+            rho_view = rho.reshape(rho.shape[:-2] + shape + shape)
+            drho_view = drho.reshape(rho.shape[:-2] + shape + shape)
+            drho_view[..., :, 0, :, :, 0, :] += rate * rho_view[..., :, 1, :, :, 1, :]
+
+        return drho
+
+    def evolve(self, rho: np.array, duration: float) -> np.array:
+        """Evolves a density matrix, applying the exact channels of uncoupled qubits in closed form and
+        integrating the remaining terms with a fixed-step fourth order Runge-Kutta integrator, using
+        steps no longer than dt
+
+        :param rho: a density matrix, or a stack of density matrices along leading axes
+        :param duration: the length of time (in nanoseconds) to evolve for
+        :return: a new density matrix
+        """
+        if duration <= 0:
+            return rho
+
+        if self.closed_form_qubits:
+            rho = self.evolve_closed_form(rho, duration)
+
+        if not np.any(self.elementwise_rates) and not np.any(self.emission_rates[self.integrated_qubits]):
+            return rho  # nothing left to integrate
+
+        if self.solver == "expm":
+            return self.evolve_exponential(rho, duration)
+
+        if self.adaptive:
+            return self.evolve_adaptive(rho, duration)
+
+        n_steps = math.ceil(duration / self.dt)
+        step = duration / n_steps
+        for _ in range(n_steps):
+            k1 = self.derivative(rho)
+            k2 = self.derivative(rho + step / 2 * k1)
+            k3 = self.derivative(rho + step / 2 * k2)
+            k4 = self.derivative(rho + step * k3)
+            rho = rho + step / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+        self.steps_taken += n_steps
+
+        return rho
+
+    def evolve_exponential(self, rho: np.array, duration: float) -> np.array:
+        """Propagates exactly with the matrix exponential of the (integrated part of the) Lindbladian,
+        which is unaffected by stiffness. Propagators are cached per duration
+
+        :param rho: a density matrix, or a stack of density matrices along leading axes
+        :param duration: the length of time (in nanoseconds) to evolve for
+        :return: a new density matrix
+        """
+        dimension = 2 ** self.n_qubits
+        if self._generator is None:
+            # Map every basis matrix through the right-hand side to obtain the generator column by column
+            basis = np.eye(dimension ** 2, dtype=complex).reshape(dimension ** 2, dimension, dimension)
+            self._generator = self.derivative(basis).reshape(dimension ** 2, dimension ** 2).T
+
+        if duration not in self._propagators:
+            self._propagators[duration] = expm(self._generator * duration)
+            self.propagator_builds += 1
+
+        self.propagator_applications += 1
+        rho_vectors = rho.reshape(rho.shape[:-2] + (dimension ** 2,))
+        return (rho_vectors @ self._propagators[duration].T).reshape(rho.shape)
+
+    def evolve_adaptive(self, rho: np.array, duration: float) -> np.array:
+        """Integrates with the embedded Dormand-Prince 5(4) Runge-Kutta pair, growing the step through
+        slowly changing stretches and shrinking it where the local error estimate exceeds the tolerances
+
+        :param rho: a density matrix, or a stack of density matrices along leading axes
+        :param duration: the length of time (in nanoseconds) to evolve for
+        :return: a new density matrix
+        """
+        elapsed = 0
+        while elapsed < duration:
+            step = min(self._adaptive_step, duration - elapsed)
+            truncated = step < self._adaptive_step  # cut short by the end of the window
+
+            stages = [self.derivative(rho)]
+            for stage_weights in _DORMAND_PRINCE_STAGES:
+                stages.append(self.derivative(rho + step * sum(weight * stage for weight, stage
+                                                               in zip(stage_weights, stages) if weight)))
+            rho_new = rho + step * sum(weight * stage for weight, stage in zip(_DORMAND_PRINCE_STAGES[-1], stages)
+                                       if weight)
+            error = step * sum(weight * stage for weight, stage in zip(_DORMAND_PRINCE_ERROR, stages) if weight)
+
+            # Scaled root mean square error of the embedded fourth order solution
+            scale = self.atol + self.rtol * np.maximum(np.abs(rho), np.abs(rho_new))
+            error_norm = math.sqrt(np.mean(np.abs(error / scale) ** 2))
+
+            # Standard step size controller for a fifth order method
+            growth = 5 if error_norm == 0 else min(5, max(0.2, 0.9 * error_norm ** -0.2))
+
+            if error_norm <= 1:
+                rho = rho_new
+                elapsed += step
+                self.steps_taken += 1
+                if truncated:
+                    # Do not let a short final step of a window shrink the step size of the next one
+                    self._adaptive_step = max(self._adaptive_step, step * growth)
+                else:
+                    self._adaptive_step = step * growth
+            else:
+                self.steps_rejected += 1
+                self._adaptive_step = step * growth
+
+        return rho
+
+    def evolve_closed_form(self, rho: np.array, duration: float) -> np.array:
+        """Applies the exact amplitude damping and dephasing channels of all uncoupled qubits
+
+        :param rho: a density matrix, or a stack of density matrices along leading axes
+        :param duration: the length of time (in nanoseconds) to evolve for
+        :return: a new density matrix
+        """
+        rho = rho.copy()
+        for qubit in self.closed_form_qubits:
+            emission_rate = self.emission_rates[qubit]
+            excited_decay = math.exp(-emission_rate * duration)
+            coherence_decay = math.exp(-(emission_rate + self.dephasing_rates[qubit]) * duration / 2)
+
+            shape = (2 ** qubit, 2, 2 ** (self.n_qubits - qubit - 1))
+            rho_view = rho.reshape(rho.shape[:-2] + shape + shape)
+            rho_view[..., :, 0, :, :, 0, :] += (1 - excited_decay) * rho_view[..., :, 1, :, :, 1, :]
+            rho_view[..., :, 1, :, :, 1, :] *= excited_decay
+            rho_view[..., :, 0, :, :, 1, :] *= coherence_decay
+            rho_view[..., :, 1, :, :, 0, :] *= coherence_decay
+
+        return rho
+
+    def apply_gate(self, rho: np.array, gate: str, gate_arguments: Dict) -> np.array:
+        """Applies a gate instantaneously
+
+        :param rho: a density matrix, or a stack of density matrices along leading axes
+        :param gate: a QuaC gate name
+        :param gate_arguments: keyword arguments of the gate as passed to quac.Circuit.add_gate
+        :return: a new density matrix
+        """
+        batch_shape = rho.shape[:-2]
+        rho_tensor = rho.reshape(batch_shape + (2,) * (2 * self.n_qubits))
+        return apply_gate_to_density_matrix(rho_tensor, gate, gate_arguments, len(batch_shape)).reshape(rho.shape)
+
+    def run(self, compiled_experiment: CompiledExperiment, rho: Optional[np.array] = None,
+            start_time: float = 0) -> np.array:
+        """Runs a compiled experiment, applying each gate at its time and evolving in between
+
+        :param compiled_experiment: a CompiledExperiment object
+        :param rho: the density matrix to start from (all qubits in the ground state if None)
+        :param start_time: the time (in nanoseconds) rho corresponds to
+        :return: the final density matrix at the end of the simulation
+        """
+        return self.run_with_snapshots(compiled_experiment, [], rho, start_time)[0]
+
+    def run_with_snapshots(self, compiled_experiment: CompiledExperiment, snapshot_times: List[float],
+                           rho: Optional[np.array] = None, start_time: float = 0) -> Tuple[np.array, np.array]:
+        """Runs a compiled experiment and records basis state probabilities at the requested times along
+        the way. Gates scheduled exactly at a snapshot time are applied before the snapshot is taken
+
+        :param compiled_experiment: a CompiledExperiment object
+        :param snapshot_times: times (in nanoseconds, between start_time and the end of the simulation)
+            at which to record probabilities
+        :param rho: the density matrix to start from (all qubits in the ground state if None)
+        :param start_time: the time (in nanoseconds) rho corresponds to
+        :return: a tuple of the final density matrix and a Numpy array of shape
+            (len(snapshot_times), 2^n_qubits) of probabilities in the order of snapshot_times
+        """
+        if rho is None:
+            rho = self.initial_state()
+
+        snapshot_order = np.argsort(snapshot_times, kind="stable")
+        snapshots = np.zeros((len(snapshot_times), 2 ** self.n_qubits))
+        next_snapshot = 0
+
+        def take_snapshots(rho: np.array, time: float, until: float, inclusive: bool) -> Tuple[np.array, float]:
+            nonlocal next_snapshot
+            while next_snapshot < len(snapshot_order):
+                snapshot_time = snapshot_times[snapshot_order[next_snapshot]]
+                if snapshot_time > until or (snapshot_time == until and not inclusive):
+                    break
+                rho = self.evolve(rho, snapshot_time - time)
+                time = max(time, snapshot_time)
+                snapshots[snapshot_order[next_snapshot]] = self.bitstring_probs(rho)
+                next_snapshot += 1
+            return rho, time
+
+        layers = gate_layers(compiled_experiment.gates)
+        stretches = {}
+        if self.reuse_propagators:
+            stretches = find_periodic_stretches(layers, self.min_propagator_repeats)
+
+        time = start_time
+        layer_index = 0
+        while layer_index < len(layers):
+            layer_time, layer_gates = layers[layer_index]
+            rho, time = take_snapshots(rho, time, layer_time, inclusive=False)
+            rho = self.evolve(rho, layer_time - time)
+            time = max(time, layer_time)
+
+            if layer_index in stretches:
+                period, repeats = stretches[layer_index]
+                stretch_end_index = layer_index + period * repeats
+                stretch_end_time = layers[stretch_end_index][0]
+
+                # Snapshots have to be taken along the way, so only skip ahead if none are due
+                period_layers = layers[layer_index:layer_index + period + 1]
+                if (next_snapshot == len(snapshot_order)
+                        or snapshot_times[snapshot_order[next_snapshot]] >= stretch_end_time) \
+                        and self.propagation_pays_off(period_layers, repeats):
+                    rho = self.propagate_periodic(rho, period_layers, repeats)
+                    time = stretch_end_time
+                    layer_index = stretch_end_index
+                    continue
+
+            for gate, gate_arguments in layer_gates:
+                rho = self.apply_gate(rho, gate, gate_arguments)
+            layer_index += 1
+
+        end_time = self.end_time(compiled_experiment)
+        rho, time = take_snapshots(rho, time, end_time, inclusive=True)
+
+        return self.evolve(rho, end_time - time), snapshots
+
+    @staticmethod
+    def period_key(period_layers: List[Tuple[float, List]]) -> Tuple:
+        """Identifies a period of gate layers by its gates and waiting times, regardless of when it starts
+
+        :param period_layers: the layers of one period followed by the first layer of the next period,
+            as returned by gate_layers
+        :return: a hashable key
+        """
+        return tuple((layer_signature(layer[1]), next_layer[0] - layer[0])
+                     for layer, next_layer in zip(period_layers, period_layers[1:]))
+
+    def propagation_pays_off(self, period_layers: List[Tuple[float, List]], repeats: int) -> bool:
+        """Estimates whether powering the superoperator of a period is cheaper than integrating every
+        repetition. Building the superoperator evolves all 4^n basis matrices through one period, and
+        raising it to a power takes about 2 log2(repeats) products of 4^n x 4^n matrices, so roughly
+        more than 4^n repetitions are needed (fewer if the superoperator was built before)
+
+        :param period_layers: the layers of one period followed by the first layer of the next period,
+            as returned by gate_layers
+        :param repeats: the number of times the period is repeated
+        :return: True if the stretch should be propagated rather than integrated
+        """
+        superoperator_size = 4 ** self.n_qubits
+        period_steps = sum(max(1, math.ceil((next_layer[0] - layer[0]) / self.dt))
+                           for layer, next_layer in zip(period_layers, period_layers[1:]))
+        period_cost = self.step_weight * period_steps * superoperator_size
+
+        build_cost = 0
+        if self.period_key(period_layers) not in self._period_superoperators:
+            build_cost = superoperator_size * period_cost
+        power_cost = (2 * math.ceil(math.log2(repeats)) + 1) * superoperator_size ** 3
+
+        return repeats * period_cost > build_cost + power_cost
+
+    def propagate_periodic(self, rho: np.array, period_layers: List[Tuple[float, List]], repeats: int) -> np.array:
+        """Applies a period of gate layers repeatedly by raising the superoperator of a single period to
+        a power (through repeated squaring) instead of integrating every repetition
+
+        :param rho: the density matrix at the time of the first layer, before its gates are applied
+        :param period_layers: the layers of one period followed by the first layer of the next period,
+            as returned by gate_layers
+        :param repeats: the number of times the period is repeated
+        :return: the density matrix at the time of the first layer after the repeated stretch
+        """
+        period = [(layer[1], next_layer[0] - layer[0]) for layer, next_layer in zip(period_layers, period_layers[1:])]
+        period_key = self.period_key(period_layers)
+
+        if period_key not in self._period_superoperators:
+            # Map every basis matrix through one period to obtain the superoperator column by column
+            dimension = 2 ** self.n_qubits
+            basis = np.eye(dimension ** 2, dtype=complex).reshape(dimension ** 2, dimension, dimension)
+
+            # Steps spent building the superoperator are not steps along the simulated evolution
+            steps_taken, steps_rejected = self.steps_taken, self.steps_rejected
+            for layer_gates, interval in period:
+                for gate, gate_arguments in layer_gates:
+                    basis = self.apply_gate(basis, gate, gate_arguments)
+                basis = self.evolve(basis, interval)
+            self.steps_taken, self.steps_rejected = steps_taken, steps_rejected
+
+            self._period_superoperators[period_key] = basis.reshape(dimension ** 2, dimension ** 2).T
+            self.propagator_builds += 1
+
+        self.propagator_applications += 1
+        propagator = np.linalg.matrix_power(self._period_superoperators[period_key], repeats)
+        return (propagator @ rho.reshape(-1)).reshape(rho.shape)
+
+    def end_time(self, compiled_experiment: CompiledExperiment) -> float:
+        """Determines when the simulation of an experiment ends (as with QuaC, at least one time step)
+
+        :param compiled_experiment: a CompiledExperiment object
+        :return: the end time in nanoseconds
+        """
+        return max(compiled_experiment.simulation_length, self.dt)
+
+    @staticmethod
+    def bitstring_probs(rho: np.array) -> np.array:
+        """Reads the basis state probabilities off a density matrix
+
+        :param rho: a density matrix
+        :return: a Numpy probability vector (qubit 0 is the most significant bit)
+        """
+        return np.clip(np.real(np.diagonal(rho)), 0, None)
+
+
+class _PrefixNode:
+    """A node of a prefix tree of gate sequences
+    """
+
+    def __init__(self, gate: Optional[str] = None, gate_arguments: Optional[Dict] = None):
+        self.gate = gate
+        self.gate_arguments = gate_arguments
+        self.children = {}
+        self.endings = []  # indices of experiments whose last gate is this node
+
+
+def simulate_prefix_tree(engine: LindbladEngine, compiled_experiments: List[CompiledExperiment],
+                         extract: Callable[[int, np.array], Dict]) -> List[Dict]:
+    """Simulates a family of experiments that share gate prefixes, simulating every shared prefix only
+    once. Experiments are arranged in a prefix tree of timed gates, the density matrix is kept at every
+    branch point, and each branch continues from there
+
+    :param engine: the Lindblad engine all experiments are simulated with
+    :param compiled_experiments: a list of CompiledExperiment objects on the engine's qubits
+    :param extract: a function turning an experiment's index and final density matrix into its outcome
+    :return: a list of outcomes parallel to compiled_experiments
+    """
+    root = _PrefixNode()
+    for index, compiled_experiment in enumerate(compiled_experiments):
+        node = root
+        for gate, gate_arguments in compiled_experiment.gates:
+            gate_key = (gate, tuple(sorted(gate_arguments.items())))
+            if gate_key not in node.children:
+                node.children[gate_key] = _PrefixNode(gate, gate_arguments)
+            node = node.children[gate_key]
+        node.endings.append(index)
+
+    # Walk the tree depth first; states are never modified in place, so siblings can share a checkpoint
+    outcomes = [None] * len(compiled_experiments)
+    pending: List[Tuple[_PrefixNode, np.array, float]] = [(root, engine.initial_state(), 0)]
+    while pending:
+        node, rho, time = pending.pop()
+
+        for index in node.endings:
+            final_rho = engine.evolve(rho, engine.end_time(compiled_experiments[index]) - time)
+            outcomes[index] = extract(index, final_rho)
+
+        for child in node.children.values():
+            child_time = child.gate_arguments["time"]
+            child_rho = engine.apply_gate(engine.evolve(rho, child_time - time), child.gate, child.gate_arguments)
+            pending.append((child, child_rho, max(time, child_time)))
+
+    return outcomes
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains vectorized helpers for turning QuaC basis states into Qiskit classical
+register values, including the injection of measurement (readout) error.
+"""
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from quac_qiskit.models import QuacNoiseModel
+from quac_qiskit.exceptions import QuacOptionsError
+
+MAX_REGISTER_SLOTS = 64  # classical register values are packed into unsigned 64-bit integers
+
+
+def classical_register_values(states: np.array, qubit_measurements: Dict[int, List[int]],
+                              qubits: List[int]) -> np.array:
+    """Maps packed basis states to the integer value of the classical register they are measured into
+
+    :param states: a Numpy array of integer basis states in which qubits[0] is the most significant bit
+    :param qubit_measurements: a dictionary mapping measured qubits to the register slots they are
+        measured into
+    :param qubits: the qubits packed into each state, from most to least significant bit
+    :return: a Numpy array of unsigned 64-bit classical register values (slot 0 is the least significant
+        bit)
+    """
+    if any(register_slot >= MAX_REGISTER_SLOTS for slots in qubit_measurements.values() for register_slot in slots):
+        raise QuacOptionsError(f"At most {MAX_REGISTER_SLOTS} classical register slots are supported")
+
+    states = np.asarray(states, dtype=np.uint64)
+    registers = np.zeros_like(states)
+    n_bits = len(qubits)
+
+    for position, qubit in enumerate(qubits):
+        if qubit not in qubit_measurements:
+            continue
+
+        outcomes = (states >> np.uint64(n_bits - 1 - position)) & np.uint64(1)
+        for register_slot in qubit_measurements[qubit]:
+            # Later measurements into the same slot overwrite earlier ones
+            slot_shift = np.uint64(register_slot)
+            registers = (registers & ~(np.uint64(1) << slot_shift)) | (outcomes << slot_shift)
+
+    return registers
+
+
+def classical_register_table(qubit_measurements: Dict[int, List[int]], qubits: List[int]) -> np.array:
+    """Precomputes the classical register value of every basis state of the given qubits
+
+    :param qubit_measurements: a dictionary mapping measured qubits to the register slots they are
+        measured into
+    :param qubits: the qubits packed into each state, from most to least significant bit
+    :return: a Numpy array whose i-th entry is the classical register value of basis state i
+    """
+    return classical_register_values(np.arange(2 ** len(qubits)), qubit_measurements, qubits)
+
+
+def register_hex_keys(registers: np.array) -> List[str]:
+    """Converts integer classical register values to Qiskit-style hexadecimal keys
+
+    :param registers: a Numpy array of integer classical register values
+    :return: a list of hexadecimal strings parallel to registers
+    """
+    return [hex(int(register)) for register in registers]
+
+
+def apply_readout_error(states: np.array, qubits: List[int], noise_model: QuacNoiseModel,
+                        rng: Optional[np.random.Generator] = None) -> np.array:
+    """Applies measurement error to a batch of sampled basis states by XOR-ing a randomly drawn
+    flip mask into every state
+
+    :param states: a Numpy array of integer basis states in which qubits[0] is the most significant bit
+    :param qubits: the qubits packed into each state, from most to least significant bit
+    :param noise_model: a QuacNoiseModel object with measurement error defined
+    :param rng: an optional Numpy random generator (a fresh one is used if not provided)
+    :return: a Numpy array of basis states as read out by the noisy measurement
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    states = np.asarray(states, dtype=np.uint64)
+    flip_masks = np.zeros_like(states)
+    n_bits = len(qubits)
+
+    for position, qubit in enumerate(qubits):
+        shift = np.uint64(n_bits - 1 - position)
+        outcomes = ((states >> shift) & np.uint64(1)).astype(np.intp)
+
+        # Probability of reading out the opposite of each prepared outcome
+        flip_probs = np.array([noise_model.flip_prob(qubit, 0, 1), noise_model.flip_prob(qubit, 1, 0)])
+        flips = rng.random(len(states)) < flip_probs[outcomes]
+        flip_masks |= flips.astype(np.uint64) << shift
+
+    return states ^ flip_masks
+
+
+def marginalize_probabilities(bitstring_probs: np.array, measured_qubits: List[int], n_qubits: int) -> np.array:
+    """Sums a QuaC bitstring probability vector over all unmeasured qubits
+
+    :param bitstring_probs: a probability vector over all 2^n_qubits basis states (qubit 0 is the most
+        significant bit)
+    :param measured_qubits: the qubits to keep, from most to least significant bit of the result
+    :param n_qubits: the number of qubits the probability vector describes
+    :return: a Numpy probability vector over the 2^len(measured_qubits) states of the measured qubits
+    """
+    probs = np.asarray(bitstring_probs, dtype=float).reshape([2] * n_qubits)
+    kept_qubits = sorted(measured_qubits)
+    marginal_probs = probs.sum(axis=tuple(qubit for qubit in range(n_qubits) if qubit not in kept_qubits))
+
+    # Remaining axes are in ascending qubit order, so reorder them as requested
+    marginal_probs = np.transpose(marginal_probs, [kept_qubits.index(qubit) for qubit in measured_qubits])
+
+    return marginal_probs.reshape(-1)
+
+
+def marginalize_states(states: np.array, measured_qubits: List[int], n_qubits: int) -> np.array:
+    """Keeps only the bits of the measured qubits of sampled basis states
+
+    :param states: a Numpy array of integer basis states over n_qubits (qubit 0 is the most significant bit)
+    :param measured_qubits: the qubits to keep, from most to least significant bit of the result
+    :param n_qubits: the number of qubits the basis states describe
+    :return: a Numpy array of integer basis states over the measured qubits
+    """
+    states = np.asarray(states, dtype=np.uint64)
+    marginal_states = np.zeros_like(states)
+    for qubit in measured_qubits:
+        outcomes = (states >> np.uint64(n_qubits - 1 - qubit)) & np.uint64(1)
+        marginal_states = (marginal_states << np.uint64(1)) | outcomes
+
+    return marginal_states
+
+
+def combine_independent_probabilities(cluster_probs: List[np.array],
+                                      cluster_qubits: List[List[int]]) -> Tuple[np.array, List[int]]:
+    """Combines the probability vectors of independent groups of qubits into their joint distribution
+
+    :param cluster_probs: probability vectors over the qubits of each group (possibly preceded by
+        matching batch axes, e.g. for a time series)
+    :param cluster_qubits: the qubits of each group, from most to least significant bit
+    :return: a tuple of the joint probability vector(s) and the qubits it is over, in ascending order
+    """
+    batch_shape = np.shape(cluster_probs[0])[:-1]
+    joint_probs = np.ones(batch_shape + (1,))
+    joint_qubits = []
+    for probs, qubits in zip(cluster_probs, cluster_qubits):
+        joint_probs = (joint_probs[..., :, None] * np.asarray(probs)[..., None, :]).reshape(batch_shape + (-1,))
+        joint_qubits += qubits
+
+    # Put the qubits into ascending order, keeping batch axes in front
+    joint_probs = joint_probs.reshape(batch_shape + (2,) * len(joint_qubits))
+    axes = list(range(len(batch_shape))) + [len(batch_shape) + position for position in np.argsort(joint_qubits)]
+    return np.transpose(joint_probs, axes).reshape(batch_shape + (-1,)), sorted(joint_qubits)
+
+
+def apply_meas_matrices(probs: np.array, qubits: List[int], noise_model: QuacNoiseModel) -> np.array:
+    """Adjusts a probability vector for measurement error by applying each qubit's 2x2 measurement
+    matrix along its own axis
+
+    :param probs: a probability vector in which qubits[0] is the most significant bit
+    :param qubits: the qubits the probability vector describes, from most to least significant bit
+    :param noise_model: a QuacNoiseModel object with measurement error defined
+    :return: a Numpy probability vector adjusted for measurement error
+    """
+    probs = np.asarray(probs, dtype=float).reshape([2] * len(qubits))
+
+    for axis, qubit in enumerate(qubits):
+        meas_matrix = np.array([
+            [noise_model.flip_prob(qubit, 0, 0), noise_model.flip_prob(qubit, 1, 0)],
+            [noise_model.flip_prob(qubit, 0, 1), noise_model.flip_prob(qubit, 1, 1)]
+        ])
+        probs = np.moveaxis(np.tensordot(meas_matrix, probs, axes=([1], [axis])), 0, axis)
+
+    return probs.reshape(-1)
+
+
+def significant_outcomes(probs: np.array, prob_threshold: Optional[float] = None,
+                         top_k: Optional[int] = None) -> np.array:
+    """Selects the outcomes of a probability vector worth reporting
+
+    :param probs: a Numpy probability vector
+    :param prob_threshold: if given, only outcomes with probability strictly greater than this are kept
+    :param top_k: if given, at most this many of the most likely outcomes are kept
+    :return: a sorted Numpy array of the indices of the kept outcomes
+    """
+    kept_outcomes = np.arange(len(probs))
+
+    if prob_threshold is not None:
+        kept_outcomes = kept_outcomes[probs > prob_threshold]
+
+    if top_k is not None and top_k < len(kept_outcomes):
+        # Partial sort: only the top_k largest probabilities need to be found, not ordered
+        kept_outcomes = kept_outcomes[np.argpartition(-probs[kept_outcomes], top_k - 1)[:top_k]]
+
+    return np.sort(kept_outcomes)
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains helpers for fanning QuaC experiments out across a pool of worker processes
+or across MPI ranks. Pool workers are started fresh (spawned), so every worker initializes QuaC/PETSc
+exactly once, with the PETSc options of the run it was started for, and then simulates any number of
+experiments. Since PETSc reads its options when it is initialized, this is how per-run solver options
+reach QuaC without touching the environment of the parent process.
+"""
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+from qiskit.qobj.qasm_qobj import QasmQobjExperiment
+from quac_qiskit.exceptions import QuacOptionsError, QuacBackendError
+from .solvers import get_petsc_options, initialize_quac
+from .trajectories import sample_trajectories
+
+# Backend and run configuration shared by all tasks of a worker process
+_worker_backend = None
+_worker_run_config = None
+
+
+def _initialize_worker(backend, run_config: Dict, petsc_options: str) -> None:
+    """Initializes QuaC with the PETSc options of the run in a freshly started worker process, and
+    stores the backend and run configuration for its tasks
+
+    :param backend: the QuacSimulator the experiments are run on
+    :param run_config: injected parameters shared by all experiments
+    :param petsc_options: the PETSc options to initialize QuaC with
+    """
+    global _worker_backend, _worker_run_config
+    initialize_quac(petsc_options)
+    _worker_backend = backend
+    _worker_run_config = run_config
+
+
+def _simulate_in_worker(task: Tuple) -> Dict:
+    """Simulates a single experiment in a worker process
+
+    :param task: a tuple of a Qasm quantum object experiment to run and injected parameters specific to it
+    :return: the simulation outcome of the experiment
+    """
+    experiment, experiment_config = task
+    return _worker_backend._simulate_experiment(experiment, **dict(_worker_run_config, **experiment_config))
+
+
+def _sweep_in_worker(task: Tuple) -> Dict:
+    """Simulates a single compiled experiment with a single noise model in a worker process
+
+    :param task: a tuple of a CompiledExperiment object and a QuacNoiseModel object
+    :return: the simulation outcome of the experiment
+    """
+    compiled_experiment, noise_model = task
+    return _worker_backend._simulate_compiled(compiled_experiment, noise_model, **_worker_run_config)
+
+
+def _trajectories_in_worker(task: Tuple) -> Tuple:
+    """Samples a batch of quantum trajectories in a worker process
+
+    :param task: a tuple of arguments to sample_trajectories
+    :return: a tuple of a Numpy array of sampled basis states and the number of jumps that occurred
+    """
+    return sample_trajectories(*task)
+
+
+def get_worker_count(max_parallel_experiments: int, n_experiments: int) -> int:
+    """Determines how many worker processes to use for a batch of experiments
+
+    :param max_parallel_experiments: the requested maximum (0 means one per available CPU core)
+    :param n_experiments: the number of experiments to run
+    :return: the number of worker processes to use
+    """
+    if max_parallel_experiments == 0:
+        max_parallel_experiments = os.cpu_count() or 1
+    return max(1, min(max_parallel_experiments, n_experiments))
+
+
+def get_worker_petsc_options(**run_config) -> str:
+    """Determines the PETSc options that worker processes of a run initialize QuaC with
+
+    :param run_config: injected parameters
+    :return: a PETSc options string (empty if the run does not configure PETSc)
+    """
+    return get_petsc_options(**run_config) if run_config.get("engine", "quac") == "quac" else ""
+
+
+def simulate_in_process_pool(backend, experiments: List[QasmQobjExperiment], max_workers: int,
+                             experiment_configs: Optional[List[Dict]] = None, **run_config) -> List[Dict]:
+    """Simulates experiments across a pool of worker processes
+
+    :param backend: the QuacSimulator the experiments are run on
+    :param experiments: a list of Qasm quantum object experiments
+    :param max_workers: the number of worker processes
+    :param experiment_configs: an optional list of injected parameters specific to each experiment,
+        parallel to experiments
+    :param run_config: injected parameters shared by all experiments
+    :return: a list of simulation outcomes parallel to experiments
+    """
+    if experiment_configs is None:
+        experiment_configs = [{}] * len(experiments)
+
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_initialize_worker,
+                             initargs=(backend, run_config, get_worker_petsc_options(**run_config))) as executor:
+        return list(executor.map(_simulate_in_worker, zip(experiments, experiment_configs)))
+
+
+def sweep_in_process_pool(backend, tasks: List[Tuple], max_workers: int, **run_config) -> List[Dict]:
+    """Simulates (compiled experiment, noise model) pairs of a noise model sweep across a pool of
+    worker processes
+
+    :param backend: the QuacSimulator the experiments are run on
+    :param tasks: a list of tuples of CompiledExperiment and QuacNoiseModel objects
+    :param max_workers: the number of worker processes
+    :param run_config: injected parameters shared by all experiments
+    :return: a list of simulation outcomes parallel to tasks
+    """
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_initialize_worker,
+                             initargs=(backend, run_config, get_worker_petsc_options(**run_config))) as executor:
+        return list(executor.map(_sweep_in_worker, tasks, chunksize=max(1, len(tasks) // (4 * max_workers))))
+
+
+def trajectories_in_process_pool(tasks: List[Tuple], max_workers: int) -> List[Tuple]:
+    """Samples batches of quantum trajectories across a pool of worker processes
+
+    :param tasks: a list of tuples of arguments to sample_trajectories
+    :param max_workers: the number of worker processes
+    :return: a list of tuples of sampled basis states and jump counts parallel to tasks
+    """
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return list(executor.map(_trajectories_in_worker, tasks))
+
+
+def get_mpi_comm():
+    """Looks up the MPI communicator spanning all ranks of the job
+
+    :return: mpi4py's MPI.COMM_WORLD
+    """
+    try:
+        from mpi4py import MPI
+    except ImportError as error:
+        raise QuacOptionsError("MPI execution requires mpi4py to be installed") from error
+
+    return MPI.COMM_WORLD
+
+
+def simulate_across_mpi_ranks(backend, experiments: List[QasmQobjExperiment], **run_config) -> List[Dict]:
+    """Simulates experiments spread round-robin across MPI ranks. Every rank must run the same job
+    (e.g. the same script launched with mpirun); outcomes are gathered so that every rank, including
+    rank 0, ends up with the outcomes of all experiments
+
+    :param backend: the QuacSimulator the experiments are run on
+    :param experiments: a list of Qasm quantum object experiments
+    :param run_config: injected parameters shared by all experiments
+    :return: a list of simulation outcomes parallel to experiments
+    """
+    comm = get_mpi_comm()
+    rank = comm.Get_rank()
+    size = comm.Get_size()
+
+    # Simulate this rank's share, holding on to failures so no rank is left waiting in the gather
+    rank_outcomes = []
+    rank_error = None
+    try:
+        for index in range(rank, len(experiments), size):
+            rank_outcomes.append((index, backend._simulate_experiment(experiments[index], **run_config)))
+    except Exception as error:  # pylint: disable=broad-except
+        rank_error = f"rank {rank}: {error!r}"
+
+    outcomes = [None] * len(experiments)
+    for gathered_outcomes, gathered_error in comm.allgather((rank_outcomes, rank_error)):
+        if gathered_error is not None:
+            raise QuacBackendError(f"MPI experiment simulation failed on {gathered_error}")
+        for index, outcome in gathered_outcomes:
+            outcomes[index] = outcome
+
+    return outcomes
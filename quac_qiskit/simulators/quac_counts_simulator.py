@@ -4,20 +4,23 @@
 a specified number of times. This simulator is subject to stochastic noise. For comparisons and
 benchmarking, the density backend is recommended.
 """
-import time
+from typing import Dict, Tuple
 import numpy as np
-from collections import defaultdict
-from qiskit.result import Result
-from qiskit.qobj.qasm_qobj import QasmQobj
+from qiskit.qobj.qasm_qobj import QasmQobj, QasmQobjExperiment
 from qiskit.providers.models.backendproperties import BackendProperties
+from qiskit.result import Result
+from quac_qiskit.models import PackedMemory
 from quac_qiskit.simulators import QuacSimulator
-from ..stat import choose_index
+from quac_qiskit.exceptions import QuacOptionsError
+from ..stat import sample_indices
+from .measurement import classical_register_table, register_hex_keys, apply_readout_error
 
 
 class QuacCountsSimulator(QuacSimulator):
     """Class for simulating a Qiskit-defined quantum experiment a number of times and returning
     a dictionary of the frequencies of each resulting pure state
     """
+    engines = ["quac", "numpy", "trajectories"]  # trajectories sample shots directly
 
     def name(self) -> str:
         """Returns a name for identifying this specific density backend
@@ -35,75 +38,76 @@ class QuacCountsSimulator(QuacSimulator):
         return self._properties
 
     def _run_job(self, job_id: str, qobj: QasmQobj, **run_config) -> Result:
-        """Specifies how to run a quantum object job on this backend. This is the method that
-        changes between types of QuaC backends.
+        """Runs a quantum object job, handing the shot count and simulator seed to the trajectory engine,
+        which samples shots while simulating
 
         :param job_id: a uuid4 string to uniquely identify this job
         :param qobj: an assembled quantum object of experiments
         :param run_config: injected parameters
         :return: a Qiskit Result object
         """
-        qobj_start = time.perf_counter()
-        results = list()
-
-        # Update noise model if injected
-        job_noise_model = self._quac_noise_model
-        if run_config.get("quac_noise_model"):
-            job_noise_model = run_config.get("quac_noise_model")
-
-        for experiment in qobj.experiments:
-            exp_start = time.perf_counter()
-            final_quac_instance, qubit_measurements = super()._run_experiment(experiment, **run_config)
-
-            # Create a frequency defaultdict for multinomial experiment tallying
-            frequencies = defaultdict(lambda: 0)
-
-            # Get probabilities of all states occurring and try to adjust them by measurement errors
-            bitstring_probs = np.array(final_quac_instance.get_bitstring_probs())
-
-            for _ in range(0, qobj.config.shots):
-                # Run multinomial experiment and filter out unmeasured qubits from results
-                outcome_state = bin(choose_index(bitstring_probs))[2:]
-                padded_outcome_state = list(outcome_state.zfill(qobj.config.n_qubits))
-                classical_register = ["0"] * qobj.config.memory_slots
-
-                for qubit, outcome in enumerate(padded_outcome_state):
-                    if job_noise_model.has_meas():
-                        # Alter outcome if measurement error is desired
-                        flipped_outcome = str(int(outcome) ^ 1)
-                        flip_prob = job_noise_model.flip_prob(qubit, int(outcome), int(flipped_outcome))
-                        if choose_index([flip_prob, 1 - flip_prob]) == 0:
-                            outcome = flipped_outcome
-
-                    # Only measure specified qubits into the classical register
-                    if qubit in qubit_measurements:
-                        for register_slot in qubit_measurements[qubit]:
-                            classical_register[register_slot] = outcome
-
-                classical_register.reverse()  # convert to Qiskit MSB format
-                classical_register_hex = hex(int(''.join(classical_register), 2))
-
-                frequencies[classical_register_hex] += 1
-
-            results.append({
-                "name": experiment.header.name,
-                "shots": qobj.config.shots,
-                "data": {"counts": dict(frequencies)},
-                "status": "DONE",
-                "success": True,
-                "time_taken": time.perf_counter() - exp_start,
-                "header": experiment.header.to_dict()
-            })
-
-        job_result = {
-            "backend_name": self.name(),
-            "backend_version": self.configuration().backend_version,
-            "qobj_id": qobj.qobj_id,
-            "job_id": job_id,
-            "results": results,
-            "success": True,
-            "time_taken": time.perf_counter() - qobj_start,
-            "header": qobj.header.to_dict()
-        }
-
-        return Result.from_dict(job_result)
+        if run_config.get("engine") == "trajectories":
+            run_config = dict(run_config, shots=qobj.config.shots,
+                              seed_simulator=getattr(qobj.config, "seed_simulator", None))
+
+        return super()._run_job(job_id, qobj, **run_config)
+
+    def _check_run_config(self, **run_config) -> None:
+        """Validates injected parameters before any experiment is simulated
+
+        :param run_config: injected parameters
+        """
+        super()._check_run_config(**run_config)
+
+        trajectories = run_config.get("trajectories")
+        max_parallel_trajectories = run_config.get("max_parallel_trajectories", 1)
+        if run_config.get("engine", "quac") != "trajectories" and \
+                (trajectories is not None or "max_parallel_trajectories" in run_config):
+            raise QuacOptionsError("Trajectory options require the trajectories engine")
+
+        if trajectories is not None and (int(trajectories) != trajectories or trajectories < 1):
+            raise QuacOptionsError("Number of trajectories must be a positive integer")
+
+        if int(max_parallel_trajectories) != max_parallel_trajectories or max_parallel_trajectories < 0:
+            raise QuacOptionsError("Maximum number of parallel trajectory batches must be a non-negative integer")
+        if max_parallel_trajectories != 1 and run_config.get("max_parallel_experiments", 1) != 1:
+            # Worker processes of experiments would otherwise start pools of their own
+            raise QuacOptionsError("Trajectories cannot be spread across worker processes when experiments are")
+
+    def _experiment_data(self, experiment: QasmQobjExperiment, outcome: Dict, qobj: QasmQobj,
+                         rng: np.random.Generator, **run_config) -> Tuple[Dict, Dict]:
+        """Samples shots from the simulated probabilities of an experiment and tallies them into counts
+
+        :param experiment: the Qasm quantum object experiment that was simulated
+        :param outcome: the simulation outcome of the experiment
+        :param qobj: the quantum object the experiment belongs to
+        :param rng: a Numpy random generator shared by all experiments of the job
+        :param run_config: injected parameters
+        :return: a tuple of experiment data and experiment metadata dictionaries
+        """
+        job_noise_model = self._get_noise_model(**run_config)
+        qubit_measurements = outcome["qubit_measurements"]
+        measured_qubits = outcome["measured_qubits"]
+
+        if "samples" in outcome:
+            # The trajectory engine already sampled every shot
+            outcome_states = outcome["samples"]
+        else:
+            # Run multinomial experiment for all shots at once
+            outcome_states = sample_indices(outcome["probabilities"], qobj.config.shots, rng)
+
+        if job_noise_model.has_meas():
+            # Alter outcomes if measurement error is desired
+            outcome_states = apply_readout_error(outcome_states, measured_qubits, job_noise_model, rng)
+
+        # Map outcomes to classical registers and tally each distinct register once
+        registers = classical_register_table(qubit_measurements, measured_qubits)[outcome_states]
+        distinct_registers, register_counts = np.unique(registers, return_counts=True)
+        frequencies = dict(zip(register_hex_keys(distinct_registers), register_counts.tolist()))
+
+        experiment_data = {"counts": frequencies}
+        if getattr(qobj.config, "memory", False) or run_config.get("memory", False):
+            # Keep per-shot registers packed; hexadecimal strings are produced on access
+            experiment_data["memory"] = PackedMemory(registers, qobj.config.memory_slots)
+
+        return experiment_data, {}
@@ -4,14 +4,14 @@
 simulations of a Qiskit-defined quantum circuit. Functionality is located in the
 QuacDensitySimulator class.
 """
-import time
+from typing import Dict, Optional, Tuple
 import numpy as np
-from scipy import sparse
-from collections import defaultdict
-from qiskit.result import Result
-from qiskit.qobj.qasm_qobj import QasmQobj
+from qiskit.qobj.qasm_qobj import QasmQobj, QasmQobjExperiment
 from qiskit.providers.models.backendproperties import BackendProperties
 from quac_qiskit.simulators import QuacSimulator
+from quac_qiskit.exceptions import QuacOptionsError
+from .measurement import classical_register_table, register_hex_keys, apply_meas_matrices, \
+    significant_outcomes
 
 
 class QuacDensitySimulator(QuacSimulator):
@@ -34,74 +34,112 @@ class QuacDensitySimulator(QuacSimulator):
         """
         return self._properties
 
-    def _run_job(self, job_id: str, qobj: QasmQobj, **run_config) -> Result:
-        """Specifies how to run a quantum object job on this backend. This is the method that
-        changes between types of QuaC backends.
+    def _check_run_config(self, **run_config) -> None:
+        """Validates injected parameters before any experiment is simulated
 
-        :param job_id: a uuid4 string to uniquely identify this job
-        :param qobj: an assembled quantum object of experiments
         :param run_config: injected parameters
-        :return: a Qiskit Result object
         """
-        qobj_start = time.perf_counter()
-        results = list()
-
-        # Update noise model if injected
-        job_noise_model = self._quac_noise_model
-        if run_config.get("quac_noise_model"):
-            job_noise_model = run_config.get("quac_noise_model")
-
-        for experiment in qobj.experiments:
-            exp_start = time.perf_counter()
-            final_quac_instance, qubit_measurements = super()._run_experiment(experiment, **run_config)
-
-            # Create a frequency defaultdict for multinomial experiment tallying
-            frequencies = defaultdict(lambda: 0)
-
-            # Get probabilities of all states occurring and try to adjust them by measurement errors
-            bitstring_probs = sparse.csr_matrix(final_quac_instance.get_bitstring_probs()).transpose()
+        super()._check_run_config(**run_config)
+
+        # Check options for trimming insignificant outcomes
+        prob_threshold = run_config.get("prob_threshold")
+        top_k = run_config.get("top_k")
+        if prob_threshold is not None and not 0 <= prob_threshold <= 1:
+            raise QuacOptionsError("Probability threshold must be between 0 and 1")
+        if top_k is not None and (int(top_k) != top_k or top_k < 1):
+            raise QuacOptionsError("Number of top outcomes must be a positive integer")
+
+        # Check time-series snapshot options
+        snapshot_times = run_config.get("snapshot_times")
+        if snapshot_times:
+            if run_config.get("engine", "quac") != "numpy":
+                raise QuacOptionsError("Snapshots require the numpy engine (QuaC runs cannot be paused)")
+            if run_config.get("share_prefixes"):
+                raise QuacOptionsError("Snapshots cannot be combined with sharing prefixes")
+            if min(snapshot_times) < 0:
+                raise QuacOptionsError("Snapshot times must not be negative")
+
+        # Check which kind of data should be returned
+        if run_config.get("result_type", "counts") not in ["counts", "probabilities", "density_matrix"]:
+            raise QuacOptionsError("Result type must be counts, probabilities, or density_matrix")
+        if run_config.get("result_type") == "density_matrix" and run_config.get("engine", "quac") != "numpy":
+            raise QuacOptionsError("The density_matrix result type requires the numpy engine "
+                                   "(QuaC only exposes bitstring probabilities)")
+        if run_config.get("result_type") == "density_matrix" and snapshot_times:
+            raise QuacOptionsError("Snapshots cannot be combined with the density_matrix result type")
+
+    def _experiment_data(self, experiment: QasmQobjExperiment, outcome: Dict, qobj: QasmQobj,
+                         rng: np.random.Generator, **run_config) -> Tuple[Dict, Dict]:
+        """Turns the simulated probabilities of an experiment into probabilities over classical registers
+
+        :param experiment: the Qasm quantum object experiment that was simulated
+        :param outcome: the simulation outcome of the experiment
+        :param qobj: the quantum object the experiment belongs to
+        :param rng: a Numpy random generator shared by all experiments of the job (unused)
+        :param run_config: injected parameters
+        :return: a tuple of experiment data and experiment metadata dictionaries
+        """
+        if "density_matrix" in outcome:
+            return {"density_matrix": outcome["density_matrix"]}, {}
+
+        job_noise_model = self._get_noise_model(**run_config)
+        qubit_measurements = outcome["qubit_measurements"]
+        measured_qubits = outcome["measured_qubits"]
+
+        # Try to adjust probabilities of measured states by measurement errors
+        bitstring_probs = outcome["probabilities"]
+        if job_noise_model.has_meas():
+            # If measurement error simulation is turned on, adjust probabilities accordingly
+            bitstring_probs = apply_meas_matrices(bitstring_probs, measured_qubits, job_noise_model)
+
+        register_table = classical_register_table(qubit_measurements, measured_qubits)
+        if run_config.get("result_type") == "probabilities":
+            # Return a probability vector indexed by classical register value
+            experiment_data = {"probabilities": np.bincount(register_table.astype(np.intp),
+                                                            weights=bitstring_probs,
+                                                            minlength=2 ** qobj.config.memory_slots)}
+            experiment_metadata = {}
+        else:
+            experiment_data, experiment_metadata = self._counts_data(register_table, bitstring_probs,
+                                                                     run_config.get("prob_threshold"),
+                                                                     run_config.get("top_k"))
+
+        if "snapshots" in outcome:
+            # Return a (time x classical register value) array of probabilities
+            snapshot_probs = outcome["snapshots"]
             if job_noise_model.has_meas():
-                # If measurement error simulation is turned on, adjust probabilities accordingly
-                for expanded_qubit_meas_mat in job_noise_model.meas():
-                    bitstring_probs = np.dot(expanded_qubit_meas_mat, bitstring_probs)
-
-            # Switch probability list least significant bit convention and add to dictionary
-            for decimal_state in range(bitstring_probs.shape[0]):
-                binary_state = bin(decimal_state)[2:]
-                state_prob = bitstring_probs.toarray()[decimal_state][0]
-                padded_outcome_state = list(binary_state.zfill(qobj.config.n_qubits))
-                classical_register = ["0"] * qobj.config.memory_slots
-
-                for qubit, outcome in enumerate(padded_outcome_state):
-                    # Only measure specified qubits into the classical register
-                    if qubit in qubit_measurements:
-                        for register_slot in qubit_measurements[qubit]:
-                            classical_register[register_slot] = outcome
-
-                classical_register.reverse()  # convert to Qiskit MSB format
-                classical_register_hex = hex(int(''.join(classical_register), 2))
-
-                frequencies[classical_register_hex] += state_prob
-
-            results.append({
-                "name": experiment.header.name,
-                "shots": qobj.config.shots,
-                "data": {"counts": dict(frequencies)},
-                "status": "DONE",
-                "success": True,
-                "time_taken": time.perf_counter() - exp_start,
-                "header": experiment.header.to_dict()
-            })
-
-        job_result = {
-            "backend_name": self.name(),
-            "backend_version": self.configuration().backend_version,
-            "qobj_id": qobj.qobj_id,
-            "job_id": job_id,
-            "results": results,
-            "success": True,
-            "time_taken": time.perf_counter() - qobj_start,
-            "header": qobj.header.to_dict()
-        }
-
-        return Result.from_dict(job_result)
+                snapshot_probs = [apply_meas_matrices(probs, measured_qubits, job_noise_model)
+                                  for probs in snapshot_probs]
+            experiment_data["snapshot_probabilities"] = np.array([
+                np.bincount(register_table.astype(np.intp), weights=probs, minlength=2 ** qobj.config.memory_slots)
+                for probs in snapshot_probs
+            ])
+            experiment_metadata["snapshot_times"] = list(run_config["snapshot_times"])
+
+        return experiment_data, experiment_metadata
+
+    @staticmethod
+    def _counts_data(register_table: np.array, bitstring_probs: np.array, prob_threshold: Optional[float],
+                     top_k: Optional[int]) -> Tuple[Dict, Dict]:
+        """Accumulates the probabilities of measured states into a Qiskit-style counts dictionary
+
+        :param register_table: the classical register value of every measured state
+        :param bitstring_probs: the probability of every measured state
+        :param prob_threshold: if given, only outcomes more likely than this are reported
+        :param top_k: if given, only this many of the most likely outcomes are reported
+        :return: a tuple of experiment data and experiment metadata dictionaries
+        """
+        # Map every measured state to its classical register and accumulate probabilities in one pass
+        registers, register_indices = np.unique(register_table, return_inverse=True)
+        register_probs = np.bincount(register_indices, weights=bitstring_probs, minlength=len(registers))
+
+        experiment_metadata = {}
+        if prob_threshold is not None or top_k is not None:
+            # Only report significant outcomes and keep track of the probability left out
+            kept_outcomes = significant_outcomes(register_probs, prob_threshold, top_k)
+            experiment_metadata["discarded_probability"] = float(register_probs.sum() -
+                                                                 register_probs[kept_outcomes].sum())
+            registers = registers[kept_outcomes]
+            register_probs = register_probs[kept_outcomes]
+
+        return {"counts": dict(zip(register_hex_keys(registers), register_probs.tolist()))}, experiment_metadata
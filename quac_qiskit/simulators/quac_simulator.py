@@ -7,25 +7,42 @@ constructor.
 """
 from typing import Optional, Tuple, Dict, List, Union
 from abc import abstractmethod
-from collections import defaultdict
+from collections import OrderedDict
 import math
-import warnings
+import time
 import uuid
+import numpy as np
 import quac
+from qiskit import assemble, QuantumCircuit
 from qiskit.qobj.qasm_qobj import QasmQobj
 from qiskit.qobj.qasm_qobj import QasmQobjExperiment
 from qiskit.providers.basebackend import BaseBackend
 from qiskit.providers.models.backendconfiguration import BackendConfiguration, QasmBackendConfiguration
 from qiskit.providers.models.backendproperties import BackendProperties
 from qiskit.result import Result
-from quac_qiskit.models import QuacJob, QuacNoiseModel
+from quac_qiskit.models import QuacJob, QuacNoiseModel, QuacResult
 from quac_qiskit.exceptions import QuacOptionsError, QuacBackendError
-from .schedule import list_schedule_experiment
+from .measurement import marginalize_probabilities, marginalize_states, combine_independent_probabilities, \
+    apply_meas_matrices, classical_register_table
+from .parallel import get_worker_count, get_mpi_comm, simulate_in_process_pool, simulate_across_mpi_ranks, \
+    sweep_in_process_pool, trajectories_in_process_pool
+from .cache import LRUCache, ResultCache, properties_key, instructions_key, compiled_experiment_key, result_key
+from .translate import CompiledExperiment, compile_experiment, prune_idle_qubits, split_independent_clusters, \
+    build_quac_circuit
+from .fusion import fuse_gates
+from .gates import has_gate_matrix
+from .statevector import is_coherent, run_statevector, statevector_probs
+from .lindblad import LindbladEngine, simulate_prefix_tree
+from .solvers import get_solver, check_solver_options, get_petsc_options, solver_header, initialize_quac
+from .trajectories import sample_trajectories, split_shots, batch_trajectories
 
 
 class QuacSimulator(BaseBackend):
     """General class for simulating a Qiskit-defined quantum experiment in QuaC
     """
+    max_pooled_instances = 8  # number of distinct (qubit count, noise model) setups kept for reuse
+    max_compiled_experiments = 256  # number of scheduled and translated experiments kept for reuse
+    engines = ["quac", "numpy"]  # simulation engines this type of backend supports
 
     def __init__(self, hardware_conf: Union[BackendConfiguration, QasmBackendConfiguration],
                  hardware_props: Optional[BackendProperties] = None,
@@ -40,8 +57,33 @@ class QuacSimulator(BaseBackend):
         self._quac_noise_model = quac_noise_model
         if not quac_noise_model:
             self._quac_noise_model = QuacNoiseModel.get_noiseless_model(hardware_conf.n_qubits)
+        self._instance_pool = OrderedDict()
+        self._compiled_cache = LRUCache(self.max_compiled_experiments)
+        self._properties_key = properties_key(hardware_props)
         super().__init__(self._configuration, "QuacProvider")  # QuaC is the provider
 
+    def __getstate__(self) -> Dict:
+        """Pickles the backend (e.g. for worker processes) without its pool of QuaC instances
+
+        :return: the backend state
+        """
+        state = self.__dict__.copy()
+        state["_instance_pool"] = OrderedDict()
+        return state
+
+    def compiled_cache_stats(self) -> Dict[str, int]:
+        """Reports how often scheduled and translated experiments were reused
+
+        :return: a dictionary with the number of hits, misses, current entries, and maximum entries
+        """
+        return self._compiled_cache.stats()
+
+    def clear_compiled_cache(self) -> None:
+        """Forgets all scheduled and translated experiments (e.g. after changing backend properties)
+        """
+        self._compiled_cache.clear()
+        self._properties_key = properties_key(self._properties)
+
     def properties(self) -> BackendProperties:
         """Allows access to hardware backend properties
 
@@ -62,6 +104,71 @@ class QuacSimulator(BaseBackend):
             were added
             3. simulation_length: the total number of nanoseconds to run the simulator
             4. time_step: length between discrete time steps in QuaC simulation (nanoseconds)
+            5. memory: a boolean specifying whether the counts backend should also return per-shot
+            classical registers (this is also read from the assembled qobj)
+            6. prob_threshold: the density backend only reports outcomes more likely than this
+            7. top_k: the density backend only reports this many of the most likely outcomes
+            8. result_type: what the density backend returns for each experiment; counts (default), a
+            probabilities vector indexed by classical register value, or the final density_matrix of all
+            qubits (density_matrix requires the numpy engine, since QuaC only exposes bitstring probabilities)
+            9. max_parallel_experiments: the number of worker processes experiments are spread across
+            (default 1 runs them serially in this process, 0 uses one worker per CPU core)
+            10. mpi: a boolean specifying whether experiments should be spread across the ranks of an MPI
+            job in which every rank runs the same script (requires mpi4py and the numpy engine, since QuaC
+            places its objects on a communicator shared by all ranks)
+            11. reuse_instances: a boolean specifying whether QuaC instances (qubits and Lindblad noise
+            terms) should be kept and reused by later experiments with the same qubit count and noise
+            model; only the circuit and the initial density matrix are reset between experiments
+            12. result_cache: a ResultCache object in which simulated probabilities are looked up and
+            stored, so repeated runs of identical experiments and noise models are not simulated again
+            13. engine: quac (default) to simulate with QuaC, or numpy to simulate the same Lindblad master
+            equation with the NumPy engine, whose states can be checkpointed
+            14. share_prefixes: a boolean specifying whether gate prefixes shared by several experiments
+            (e.g. T1 or T2 calibration families) should be simulated only once (requires the numpy engine)
+            15. snapshot_times: times (in nanoseconds) at which the density backend additionally records
+            the probabilities of all classical register values during a single run (requires the numpy engine)
+            16. reuse_propagators: a boolean specifying whether periodic stretches of identical gate layers
+            (e.g. identity gate padding) should be simulated by powering the superoperator of one period
+            (requires the numpy engine; only used for up to LindbladEngine.max_propagator_qubits qubits and
+            for stretches long enough to pay for building the superoperator, roughly 4^n repetitions)
+            17. closed_form_idle: a boolean specifying whether the numpy engine should evolve qubits without
+            ZZ coupling with their exact amplitude damping and dephasing channels instead of time stepping
+            (default True; numpy engine only, QuaC always integrates every qubit)
+            18. atol and rtol: absolute and relative tolerances that switch the numpy engine to adaptive
+            (Dormand-Prince 5(4)) time stepping, starting from time_step (for QuaC, they are passed on as
+            PETSc tolerances). The numpy engine reports integrator steps taken and rejected in the
+            experiment metadata, and separately the propagators it built (matrix exponentials and
+            period superoperators) and applied
+            19. solver: the integrator to use; rk4 or dopri5 for either engine, bdf or cn (implicit, for
+            stiff systems) for QuaC, or expm (exact propagation, for few qubits) for the numpy engine.
+            QuaC runs with solver options are carried out in freshly started worker processes that
+            initialize QuaC with them, and petsc_options can pass further PETSc TS options
+            (e.g. "-ts_max_snes_failures 10") to QuaC. The solver configuration is recorded in the result header
+            20. fuse_gates: a boolean specifying whether runs of single-qubit gates on the same qubit should
+            be merged into u3 gates and blocks of two-qubit gates on the same qubits rebuilt from at most
+            one cnot or cz gate and u3 gates (or cancelled), so fewer gate events interrupt integration
+            21. fusion_window: the largest idle time (in nanoseconds) between the end of a gate and the start
+            of the next one for them to be fused; the default of 0 fuses gates that directly follow each
+            other in the schedule (or simultaneous gates with custom gate_times), while larger windows also
+            fuse across idle time. Fused gates are applied at the time of their last gate
+            22. prune_idle_qubits: a boolean specifying whether only the qubits an experiment acts on,
+            measures, or ZZ couples to these should be simulated, relabeled compactly (default True;
+            the density_matrix result type always covers all qubits)
+            23. split_clusters: a boolean specifying whether groups of qubits that are never connected by
+            two-qubit gates or ZZ coupling should be simulated separately and their distributions
+            combined as a product (default True; not used for the density_matrix result type or with
+            share_prefixes)
+            24. statevector: a boolean specifying whether experiments with noise models without T1, T2, and
+            ZZ coupling (i.e. noiseless or with measurement error only) should be simulated exactly as
+            state vectors instead of density matrices (default True; not used for the density_matrix
+            result type or for experiments with gates only QuaC supports, such as czx)
+            25. engine: trajectories (counts backend only) to sample shots from quantum trajectories
+            (Monte Carlo wave functions) that unravel the same T1, T2, and ZZ noise, which needs 2^n rather
+            than 4^n memory per trajectory; trajectories sets their number (default: one per shot, never
+            more than shots), max_parallel_trajectories spreads them across worker processes (0 means one
+            per available CPU core; not combined with max_parallel_experiments), and seed_simulator makes
+            them reproducible, with a separate random stream for every experiment. Jumps are reported in
+            the experiment metadata
         :return: a submitted QuacJob running the experiments in qobj
         """
         job = QuacJob(self, str(uuid.uuid4()), self._run_job, qobj, **run_config)
@@ -69,166 +176,750 @@ class QuacSimulator(BaseBackend):
 
         return job
 
-    @abstractmethod
+    def run_sweep(self, circuits: Union[QuantumCircuit, List[QuantumCircuit], QasmQobj],
+                  noise_models: Union[List[QuacNoiseModel], np.array], **run_config) -> np.array:
+        """Simulates every circuit with every noise model of a sweep. Circuits are assembled, scheduled,
+        and translated into QuaC gates only once, no matter how many noise models are swept over
+
+        :param circuits: transpiled QuantumCircuit objects or an already assembled quantum object
+        :param noise_models: a list of QuacNoiseModel objects or a 2D Numpy array whose rows were
+            generated via QuacNoiseModel.to_array()
+        :param run_config: injected parameters as accepted by run (gate_times, simulation_length, dt,
+            reuse_instances, solver options, max_parallel_experiments to spread the sweep across
+            worker processes, and a result_cache that is looked up and filled in this process)
+        :return: a Numpy array of shape (number of noise models, number of experiments,
+            2^memory_slots) holding the probability of every classical register value
+        """
+        qobj = circuits if isinstance(circuits, QasmQobj) else assemble(circuits, backend=self, shots=1)
+        if isinstance(noise_models, np.ndarray):
+            noise_models = [QuacNoiseModel.from_array(noise_model_array, self.configuration().n_qubits)
+                            for noise_model_array in np.atleast_2d(noise_models)]
+
+        run_config.pop("result_type", None)  # sweeps always yield probabilities
+        self._check_run_config(**run_config)
+
+        # The cache is only consulted here, since worker processes would get a cold copy of it
+        result_cache = run_config.pop("result_cache", None)
+
+        # Translate every experiment once and pair it with every noise model
+        compiled_experiments = [self._compile_experiment(experiment, **run_config)
+                                for experiment in qobj.experiments]
+        tasks = [(compiled_experiment, noise_model) for noise_model in noise_models
+                 for compiled_experiment in compiled_experiments]
+
+        outcomes = [None] * len(tasks)
+        if result_cache is not None:
+            cache_keys = [self._result_key(experiment, **dict(run_config, quac_noise_model=noise_model))
+                          for noise_model in noise_models for experiment in qobj.experiments]
+            outcomes = [result_cache.get(cache_key) for cache_key in cache_keys]
+
+        # Only simulate tasks that are not cached yet
+        missing_indices = [index for index, outcome in enumerate(outcomes) if outcome is None]
+        missing_tasks = [tasks[index] for index in missing_indices]
+        max_workers = get_worker_count(run_config.get("max_parallel_experiments", 1), len(missing_tasks))
+        if missing_tasks and (max_workers > 1 or self._needs_fresh_petsc(**run_config)):
+            missing_outcomes = sweep_in_process_pool(self, missing_tasks, max_workers, **run_config)
+        else:
+            missing_outcomes = [self._simulate_compiled(compiled_experiment, noise_model, **run_config)
+                                for compiled_experiment, noise_model in missing_tasks]
+
+        for index, outcome in zip(missing_indices, missing_outcomes):
+            if result_cache is not None:
+                result_cache.put(cache_keys[index], outcome)
+            outcomes[index] = outcome
+
+        # Apply measurement error and map measured states to classical register values
+        register_probs = np.zeros((len(noise_models), len(compiled_experiments), 2 ** qobj.config.memory_slots))
+        for task_index, ((compiled_experiment, noise_model), outcome) in enumerate(zip(tasks, outcomes)):
+            bitstring_probs = outcome["probabilities"]
+            if noise_model.has_meas():
+                bitstring_probs = apply_meas_matrices(bitstring_probs, outcome["measured_qubits"], noise_model)
+
+            register_table = classical_register_table(outcome["qubit_measurements"], outcome["measured_qubits"])
+            model_index, exp_index = divmod(task_index, len(compiled_experiments))
+            register_probs[model_index, exp_index] = np.bincount(register_table.astype(np.intp),
+                                                                 weights=bitstring_probs,
+                                                                 minlength=register_probs.shape[2])
+
+        return register_probs
+
     def _run_job(self, job_id: str, qobj: QasmQobj, **run_config) -> Result:
-        """Specifies how to run a quantum object job on this backend. This is the method that
-        changes between types of QuaC backends.
+        """Specifies how to run a quantum object job on this backend. Experiments are simulated
+        (possibly in parallel) and their outcomes are then turned into results by the backend type
 
         :param job_id: a uuid4 string to uniquely identify this job
         :param qobj: an assembled quantum object of experiments
         :param run_config: injected parameters
         :return: a Qiskit Result object
         """
+        qobj_start = time.perf_counter()
+        self._check_run_config(**run_config)
+
+        outcomes = self._simulate_experiments(qobj.experiments, **run_config)
+
+        # Sample all experiments from one generator so seeded jobs are reproducible
+        rng = np.random.default_rng(getattr(qobj.config, "seed_simulator", None))
+
+        results = list()
+        for experiment, outcome in zip(qobj.experiments, outcomes):
+            exp_start = time.perf_counter()
+            experiment_data, experiment_metadata = self._experiment_data(experiment, outcome, qobj, rng,
+                                                                         **run_config)
+            experiment_metadata = dict(outcome.get("metadata", {}), **experiment_metadata)
+
+            results.append({
+                "name": experiment.header.name,
+                "shots": qobj.config.shots,
+                "data": experiment_data,
+                "status": "DONE",
+                "success": True,
+                "time_taken": outcome["time_taken"] + time.perf_counter() - exp_start,
+                "header": experiment.header.to_dict(),
+                "metadata": experiment_metadata
+            })
+
+        job_result = {
+            "backend_name": self.name(),
+            "backend_version": self.configuration().backend_version,
+            "qobj_id": qobj.qobj_id,
+            "job_id": job_id,
+            "results": results,
+            "success": True,
+            "time_taken": time.perf_counter() - qobj_start,
+            "header": dict(qobj.header.to_dict(), solver=solver_header(**run_config))
+        }
+
+        return QuacResult.from_dict(job_result)
+
+    def _check_run_config(self, **run_config) -> None:
+        """Validates injected parameters before any experiment is simulated
+
+        :param run_config: injected parameters
+        """
+        if run_config.get("engine", "quac") not in self.engines:
+            raise QuacOptionsError(f"Engine must be one of {', '.join(self.engines)}")
+        if run_config.get("share_prefixes") and run_config.get("engine", "quac") != "numpy":
+            raise QuacOptionsError("Sharing prefixes requires the numpy engine (QuaC states cannot be checkpointed)")
+        if run_config.get("reuse_propagators") and run_config.get("engine", "quac") != "numpy":
+            raise QuacOptionsError("Reusing propagators requires the numpy engine")
+        if run_config.get("mpi") and run_config.get("engine", "quac") != "numpy":
+            raise QuacOptionsError("MPI execution requires the numpy engine (QuaC simulations are collective over "
+                                   "PETSC_COMM_WORLD, so ranks cannot run different experiments)")
+
+        check_solver_options(**run_config)
+
+        if run_config.get("fusion_window", 0) < 0:
+            raise QuacOptionsError("Fusion window must not be negative")
+
+        result_cache = run_config.get("result_cache")
+        if result_cache is not None and not isinstance(result_cache, ResultCache):
+            raise QuacOptionsError("Result cache must be a ResultCache object")
+
+        max_parallel_experiments = run_config.get("max_parallel_experiments", 1)
+        if int(max_parallel_experiments) != max_parallel_experiments or max_parallel_experiments < 0:
+            raise QuacOptionsError("Maximum number of parallel experiments must be a non-negative integer")
+
+    @abstractmethod
+    def _experiment_data(self, experiment: QasmQobjExperiment, outcome: Dict, qobj: QasmQobj,
+                         rng: np.random.Generator, **run_config) -> Tuple[Dict, Dict]:
+        """Specifies how to turn the simulation outcome of an experiment into result data. This is the
+        method that changes between types of QuaC backends.
+
+        :param experiment: the Qasm quantum object experiment that was simulated
+        :param outcome: the simulation outcome of the experiment (see _simulate_experiment)
+        :param qobj: the quantum object the experiment belongs to
+        :param rng: a Numpy random generator shared by all experiments of the job
+        :param run_config: injected parameters
+        :return: a tuple of experiment data and experiment metadata dictionaries
+        """
         pass
 
-    def _run_experiment(self, qexp: QasmQobjExperiment, **run_config) -> Tuple[quac.Instance, Dict[int, List[int]]]:
-        """Runs quantum experiments/circuits encoded in Qiskit QASM quantum objects
-        Note: Pulse quantum objects not supported
+    def _get_noise_model(self, **run_config) -> QuacNoiseModel:
+        """Returns the noise model experiments should be run with
+
+        :param run_config: injected parameters, possibly including a quac_noise_model override
+        :return: a QuacNoiseModel object
+        """
+        if run_config.get("quac_noise_model"):
+            return run_config.get("quac_noise_model")
+        return self._quac_noise_model
+
+    def _simulate_experiments(self, experiments: List[QasmQobjExperiment], **run_config) -> List[Dict]:
+        """Simulates a list of experiments. Structurally identical experiments (same instructions and
+        measurement map, regardless of name) are only simulated once and share their outcome
+
+        :param experiments: a list of Qasm quantum object experiments
+        :param run_config: injected parameters
+        :return: a list of simulation outcomes parallel to experiments
+        """
+        if run_config.get("engine") == "trajectories":
+            # Trajectory outcomes are samples, so every experiment (duplicates included) draws its
+            # trajectories from a random stream of its own, spawned from the job seed
+            run_config.pop("result_cache", None)
+            seed_sequences = np.random.SeedSequence(run_config.get("seed_simulator")).spawn(len(experiments))
+            return self._dispatch_experiments(experiments, [{"seed_sequence": seed_sequence}
+                                                            for seed_sequence in seed_sequences], **run_config)
+
+        unique_experiments = []
+        unique_indices = {}
+        experiment_indices = []
+        for experiment in experiments:
+            experiment_key = instructions_key(experiment)
+            if experiment_key not in unique_indices:
+                unique_indices[experiment_key] = len(unique_experiments)
+                unique_experiments.append(experiment)
+            experiment_indices.append(unique_indices[experiment_key])
+
+        unique_outcomes = self._simulate_unique_experiments(unique_experiments, **run_config)
+
+        # Duplicates get their own copy of the shared outcome (counts are still sampled independently)
+        return [dict(unique_outcomes[index]) for index in experiment_indices]
+
+    def _simulate_unique_experiments(self, experiments: List[QasmQobjExperiment], **run_config) -> List[Dict]:
+        """Simulates a list of experiments, looking up previously simulated ones in the result cache if
+        one is given
+
+        :param experiments: a list of Qasm quantum object experiments
+        :param run_config: injected parameters
+        :return: a list of simulation outcomes parallel to experiments
+        """
+        result_cache = run_config.pop("result_cache", None)
+        if result_cache is None or run_config.get("result_type") == "density_matrix" \
+                or run_config.get("snapshot_times"):
+            return self._dispatch_experiments(experiments, **run_config)
+
+        # Ranks may see different cache contents (e.g. files written by other processes), so with MPI
+        # only rank 0 uses the cache and every rank splits up the experiments it is missing
+        comm = get_mpi_comm() if run_config.get("mpi") else None
+        is_root = comm is None or comm.Get_rank() == 0
+
+        lookup_start = time.perf_counter()
+        cache_keys = [self._result_key(experiment, **run_config) for experiment in experiments]
+        outcomes = [result_cache.get(cache_key) for cache_key in cache_keys] if is_root else None
+        if comm is not None:
+            outcomes = comm.bcast(outcomes, root=0)
+        lookup_time = (time.perf_counter() - lookup_start) / len(experiments)
+        outcomes = [None if outcome is None else dict(outcome, time_taken=lookup_time) for outcome in outcomes]
+
+        # Only simulate experiments that are not cached yet
+        missing_indices = [index for index, outcome in enumerate(outcomes) if outcome is None]
+        missing_outcomes = self._dispatch_experiments([experiments[index] for index in missing_indices], **run_config)
+        for index, outcome in zip(missing_indices, missing_outcomes):
+            if is_root:
+                result_cache.put(cache_keys[index], outcome)
+            outcomes[index] = outcome
+
+        return outcomes
+
+    def _dispatch_experiments(self, experiments: List[QasmQobjExperiment],
+                              experiment_configs: Optional[List[Dict]] = None, **run_config) -> List[Dict]:
+        """Simulates a list of experiments, fanning them out across worker processes or MPI ranks if
+        requested
+
+        :param experiments: a list of Qasm quantum object experiments
+        :param experiment_configs: an optional list of injected parameters specific to each experiment,
+            parallel to experiments (only used by the trajectory engine, which runs neither on MPI ranks
+            nor with shared prefixes)
+        :param run_config: injected parameters
+        :return: a list of simulation outcomes parallel to experiments
+        """
+        if not experiments:
+            return []
+
+        if experiment_configs is None:
+            experiment_configs = [{}] * len(experiments)
+
+        if run_config.get("share_prefixes"):
+            return self._simulate_prefix_tree(experiments, **run_config)
+
+        if run_config.get("mpi"):
+            return simulate_across_mpi_ranks(self, experiments, **run_config)
+
+        max_workers = get_worker_count(run_config.get("max_parallel_experiments", 1), len(experiments))
+        if max_workers > 1 or self._needs_fresh_petsc(**run_config):
+            return simulate_in_process_pool(self, experiments, max_workers, experiment_configs, **run_config)
+
+        return [self._simulate_experiment(experiment, **dict(run_config, **experiment_config))
+                for experiment, experiment_config in zip(experiments, experiment_configs)]
+
+    def _result_key(self, qexp: QasmQobjExperiment, **run_config) -> str:
+        """Computes the result cache key of an experiment from everything that determines the simulated
+        probabilities (measurement error is applied afterwards, so it is left out)
+
+        :param qexp: a Qasm quantum object experiment
+        :param run_config: injected parameters
+        :return: a hexadecimal digest string
+        """
+        gate_times = run_config.get("gate_times")
+        fusion_window = run_config.get("fusion_window", 0) if run_config.get("fuse_gates") else None
+        return result_key(instructions_key(qexp), list(gate_times) if gate_times else None, fusion_window,
+                          run_config.get("simulation_length"), run_config.get("dt") or 10,
+                          run_config.get("engine", "quac"), get_solver(**run_config), run_config.get("atol"),
+                          run_config.get("rtol"), run_config.get("petsc_options"),
+                          run_config.get("closed_form_idle", True), run_config.get("statevector", True),
+                          run_config.get("prune_idle_qubits", True), run_config.get("split_clusters", True),
+                          self._properties_key, self._get_noise_model(**run_config).key(include_meas=False))
+
+    def _simulate_experiment(self, qexp: QasmQobjExperiment, **run_config) -> Dict:
+        """Simulates an experiment and extracts everything needed to build its result as plain
+        (picklable) data
 
         :param qexp: a Qasm quantum object experiment to run
-        :param run_config: a dictionary containing all injected parameters, including a list of
-            floating point gate times, a dictionary of relevant Lindblad noise parameters, and
-            the duration of time to run the simulation
-        :return: a QuaC instance that has run the experiment
+        :param run_config: injected parameters
+        :return: a dictionary holding the qubit measurements, the measured qubits, the probability
+            vector over measured qubits (or the density matrix if requested), and the time taken
+        """
+        exp_start = time.perf_counter()
+        compiled_experiment = self._compile_experiment(qexp, **run_config)
+        outcome = self._simulate_compiled(compiled_experiment, self._get_noise_model(**run_config), **run_config)
+
+        outcome["time_taken"] = time.perf_counter() - exp_start
+        return outcome
+
+    def _compile_experiment(self, qexp: QasmQobjExperiment, **run_config) -> CompiledExperiment:
+        """Schedules an experiment and translates it into QuaC gates, reusing the outcome for
+        structurally identical experiments
+
+        :param qexp: a Qasm quantum object experiment to compile
+        :param run_config: injected parameters, possibly including gate times, a simulation length, and
+            gate fusion options
+        :return: a CompiledExperiment object
         """
-        # Gather parameters
         gate_times = run_config.get("gate_times")
         simulation_length = run_config.get("simulation_length")
-        dt = run_config.get("dt")
+        fusion_window = run_config.get("fusion_window", 0) if run_config.get("fuse_gates") else None
 
-        # Override noise model if necessary
-        exp_noise_model = self._quac_noise_model
-        if run_config.get("quac_noise_model"):
-            exp_noise_model = run_config.get("quac_noise_model")
+        cache_key = compiled_experiment_key(qexp, gate_times, simulation_length, self._properties_key, fusion_window)
+        compiled_experiment = self._compiled_cache.get(cache_key)
+        if compiled_experiment is None:
+            compiled_experiment = compile_experiment(qexp, self._properties, gate_times, simulation_length)
+            if fusion_window is not None:
+                compiled_experiment = fuse_gates(compiled_experiment, fusion_window)
+            self._compiled_cache.put(cache_key, compiled_experiment)
 
-        # Schedule experiment
-        instruction_time_order = list_schedule_experiment(qexp, self._properties)
+        return compiled_experiment
 
-        # Sanitize parameters
+    def _simulate_compiled(self, compiled_experiment: CompiledExperiment, noise_model: QuacNoiseModel,
+                           **run_config) -> Dict:
+        """Simulates a compiled experiment with a given noise model and extracts its outcome
+
+        :param compiled_experiment: a CompiledExperiment object
+        :param noise_model: the noise model to simulate the experiment with
+        :param run_config: injected parameters
+        :return: a dictionary holding the qubit measurements, the measured qubits, the probability
+            vector over measured qubits (or the density matrix if requested), and the time taken
+        """
+        if run_config.get("split_clusters", True) and run_config.get("result_type") != "density_matrix" \
+                and run_config.get("engine") != "trajectories":
+            zz_pairs = noise_model.zz() if noise_model.has_zz() else None
+            clusters = split_independent_clusters(compiled_experiment, zz_pairs)
+            if len(clusters) > 1:
+                return self._simulate_clusters(compiled_experiment, noise_model, clusters, **run_config)
+
+        pruned_experiment, pruned_noise_model, kept_qubits = self._prune_experiment(compiled_experiment, noise_model,
+                                                                                    **run_config)
+        if pruned_experiment is not compiled_experiment:
+            outcome = self._simulate_compiled(pruned_experiment, pruned_noise_model,
+                                              **dict(run_config, prune_idle_qubits=False))
+            return self._restore_qubit_labels(outcome, compiled_experiment, kept_qubits)
+
+        # QuaC supports a few gates whose matrices are not known here, so those experiments stay with QuaC
+        if run_config.get("statevector", True) and is_coherent(noise_model) and \
+                run_config.get("result_type") != "density_matrix" and \
+                all(has_gate_matrix(gate, gate_arguments) for gate, gate_arguments in compiled_experiment.gates):
+            return self._simulate_statevector(compiled_experiment, **run_config)
+
+        if run_config.get("engine") == "trajectories":
+            return self._simulate_trajectories(compiled_experiment, noise_model, **run_config)
+
+        exp_start = time.perf_counter()
+
+        if run_config.get("engine", "quac") == "numpy":
+            engine = self._lindblad_engine(compiled_experiment.n_qubits, noise_model, **run_config)
+            snapshot_times = run_config.get("snapshot_times")
+            if not snapshot_times:
+                outcome = self._density_matrix_outcome(compiled_experiment, engine.run(compiled_experiment),
+                                                       **run_config)
+            else:
+                if max(snapshot_times) > engine.end_time(compiled_experiment):
+                    raise QuacOptionsError("Snapshot times must not exceed the simulation length")
+
+                # Record probabilities of the measured qubits along the way of a single run
+                final_rho, snapshots = engine.run_with_snapshots(compiled_experiment, snapshot_times)
+                outcome = self._density_matrix_outcome(compiled_experiment, final_rho, **run_config)
+                outcome["snapshots"] = np.array([
+                    marginalize_probabilities(snapshot, outcome["measured_qubits"], compiled_experiment.n_qubits)
+                    for snapshot in snapshots
+                ])
+
+            # Report the integrator's work so that step sizes and tolerances can be tuned
+            outcome["metadata"] = {"steps_taken": engine.steps_taken, "steps_rejected": engine.steps_rejected,
+                                   "propagator_builds": engine.propagator_builds,
+                                   "propagator_applications": engine.propagator_applications}
+            outcome["time_taken"] = time.perf_counter() - exp_start
+            return outcome
+
+        final_quac_instance = self._run_compiled(compiled_experiment, noise_model, **run_config)
+        qubit_measurements = compiled_experiment.qubit_measurements
+        measured_qubits = sorted(qubit_measurements)
+
+        outcome = {
+            "qubit_measurements": qubit_measurements,
+            "measured_qubits": measured_qubits,
+            # Only the measured qubits matter to either backend
+            "probabilities": marginalize_probabilities(final_quac_instance.get_bitstring_probs(),
+                                                       measured_qubits, compiled_experiment.n_qubits)
+        }
+
+        if run_config.get("reuse_instances"):
+            self._checkin_instance(compiled_experiment.n_qubits, noise_model, final_quac_instance)
+
+        outcome["time_taken"] = time.perf_counter() - exp_start
+        return outcome
+
+    @staticmethod
+    def _simulate_statevector(compiled_experiment: CompiledExperiment, **run_config) -> Dict:
+        """Simulates a compiled experiment exactly as a state vector, which is only valid for noise
+        models without T1, T2, and ZZ coupling (measurement error is applied later on)
+
+        :param compiled_experiment: a CompiledExperiment object
+        :param run_config: injected parameters, possibly including snapshot times
+        :return: a dictionary holding the qubit measurements, the measured qubits, the probability
+            vector over measured qubits, and the time taken
+        """
+        exp_start = time.perf_counter()
+
+        snapshot_times = run_config.get("snapshot_times")
+        if snapshot_times and max(snapshot_times) > max(compiled_experiment.simulation_length,
+                                                         run_config.get("dt") or 10):
+            raise QuacOptionsError("Snapshot times must not exceed the simulation length")
+
+        psi, snapshots = run_statevector(compiled_experiment, snapshot_times)
+        measured_qubits = sorted(compiled_experiment.qubit_measurements)
+        outcome = {
+            "qubit_measurements": compiled_experiment.qubit_measurements,
+            "measured_qubits": measured_qubits,
+            "probabilities": marginalize_probabilities(statevector_probs(psi), measured_qubits,
+                                                       compiled_experiment.n_qubits),
+            "metadata": {"simulation_method": "statevector"}
+        }
+
+        if snapshot_times:
+            outcome["snapshots"] = np.array([
+                marginalize_probabilities(snapshot, measured_qubits, compiled_experiment.n_qubits)
+                for snapshot in snapshots
+            ])
+
+        outcome["time_taken"] = time.perf_counter() - exp_start
+        return outcome
+
+    @staticmethod
+    def _simulate_trajectories(compiled_experiment: CompiledExperiment, noise_model: QuacNoiseModel,
+                               **run_config) -> Dict:
+        """Samples measurements of a compiled experiment from quantum trajectories, spread across worker
+        processes if requested (measurement error is applied later on)
+
+        :param compiled_experiment: a CompiledExperiment object
+        :param noise_model: the noise model to simulate the experiment with
+        :param run_config: injected parameters, possibly including the number of shots and trajectories,
+            a simulator seed or the Numpy seed sequence of the experiment, and the maximum number of
+            parallel trajectory batches
+        :return: a dictionary holding the qubit measurements, the measured qubits, the sampled states and
+            their empirical probability vector over measured qubits, and the time taken
+        """
+        exp_start = time.perf_counter()
+
+        shots = run_config.get("shots") or 1024
+        n_trajectories = min(run_config.get("trajectories") or shots, shots)
+        shots_per_trajectory = split_shots(shots, n_trajectories)
+
+        # Jobs hand each experiment a stream of its own; otherwise the simulator seed is used as is
+        seed_sequence = run_config.get("seed_sequence")
+        if seed_sequence is None:
+            seed_sequence = np.random.SeedSequence(run_config.get("seed_simulator"))
+
+        dt = run_config.get("dt") or 10
+        n_batches = get_worker_count(run_config.get("max_parallel_trajectories", 1), n_trajectories)
+        tasks = [(compiled_experiment, noise_model, batch_shots, batch_seed_sequence, dt)
+                 for batch_shots, batch_seed_sequence in batch_trajectories(shots_per_trajectory, seed_sequence,
+                                                                             n_batches)]
+        if n_batches > 1:
+            batch_outcomes = trajectories_in_process_pool(tasks, n_batches)
+        else:
+            batch_outcomes = [sample_trajectories(*task) for task in tasks]
+
+        measured_qubits = sorted(compiled_experiment.qubit_measurements)
+        samples = marginalize_states(np.concatenate([batch_samples for batch_samples, _ in batch_outcomes]),
+                                     measured_qubits, compiled_experiment.n_qubits)
+        outcome = {
+            "qubit_measurements": compiled_experiment.qubit_measurements,
+            "measured_qubits": measured_qubits,
+            "samples": samples,
+            "probabilities": np.bincount(samples.astype(np.intp), minlength=2 ** len(measured_qubits)) / shots,
+            "metadata": {"simulation_method": "trajectories", "trajectories": n_trajectories,
+                         "jumps": sum(jumps for _, jumps in batch_outcomes)}
+        }
+
+        outcome["time_taken"] = time.perf_counter() - exp_start
+        return outcome
+
+    def _simulate_clusters(self, compiled_experiment: CompiledExperiment, noise_model: QuacNoiseModel,
+                           clusters: List[Tuple[CompiledExperiment, List[int]]], **run_config) -> Dict:
+        """Simulates independent clusters of qubits of an experiment separately and combines their
+        outcomes into the outcome of the whole experiment
+
+        :param compiled_experiment: the CompiledExperiment object the clusters were split from
+        :param noise_model: the noise model to simulate the experiment with
+        :param clusters: a list of tuples of a CompiledExperiment object per cluster and the original
+            indices of its qubits (see split_independent_clusters)
+        :param run_config: injected parameters
+        :return: a dictionary holding the qubit measurements, the measured qubits, the probability
+            vector over measured qubits, and the time taken
+        """
+        cluster_config = dict(run_config, split_clusters=False, prune_idle_qubits=False)
+        cluster_outcomes = []
+        for cluster_experiment, cluster_qubits in clusters:
+            cluster_outcome = self._simulate_compiled(cluster_experiment, noise_model.restrict(cluster_qubits),
+                                                      **cluster_config)
+            cluster_outcomes.append(self._restore_qubit_labels(cluster_outcome, compiled_experiment, cluster_qubits))
+
+        measured_qubits = [cluster_outcome["measured_qubits"] for cluster_outcome in cluster_outcomes]
+        probabilities, joint_measured_qubits = combine_independent_probabilities(
+            [cluster_outcome["probabilities"] for cluster_outcome in cluster_outcomes], measured_qubits)
+
+        outcome = {
+            "qubit_measurements": compiled_experiment.qubit_measurements,
+            "measured_qubits": joint_measured_qubits,
+            "probabilities": probabilities,
+            "time_taken": sum(cluster_outcome["time_taken"] for cluster_outcome in cluster_outcomes)
+        }
+
+        if "snapshots" in cluster_outcomes[0]:
+            outcome["snapshots"] = combine_independent_probabilities(
+                [cluster_outcome["snapshots"] for cluster_outcome in cluster_outcomes], measured_qubits)[0]
+
+        # Add up the integrators' work over all clusters
+        metadata = {"clusters": len(clusters)}
+        for cluster_outcome in cluster_outcomes:
+            for name, value in cluster_outcome.get("metadata", {}).items():
+                metadata[name] = metadata.get(name, 0) + value if isinstance(value, (int, float)) else value
+        outcome["metadata"] = metadata
+
+        return outcome
+
+    def _simulate_prefix_tree(self, experiments: List[QasmQobjExperiment], **run_config) -> List[Dict]:
+        """Simulates a list of experiments with the NumPy engine, simulating gate prefixes shared by
+        several experiments (e.g. calibration circuit families) only once
+
+        :param experiments: a list of Qasm quantum object experiments
+        :param run_config: injected parameters
+        :return: a list of simulation outcomes parallel to experiments
+        """
+        tree_start = time.perf_counter()
+        noise_model = self._get_noise_model(**run_config)
+        compiled_experiments = [self._compile_experiment(experiment, **run_config) for experiment in experiments]
+
+        pruned_experiments = [self._prune_experiment(compiled, noise_model, **run_config)
+                              for compiled in compiled_experiments]
+
+        # Experiments on different sets of qubits cannot share any state
+        outcomes = [None] * len(experiments)
+        for kept_qubits in sorted(set(tuple(pruned[2]) for pruned in pruned_experiments)):
+            indices = [index for index, pruned in enumerate(pruned_experiments) if tuple(pruned[2]) == kept_qubits]
+            group = [pruned_experiments[index][0] for index in indices]
+            group_outcomes = simulate_prefix_tree(
+                self._lindblad_engine(len(kept_qubits), pruned_experiments[indices[0]][1], **run_config), group,
+                lambda index, rho: self._density_matrix_outcome(group[index], rho, **run_config))
+
+            for index, outcome in zip(indices, group_outcomes):
+                outcomes[index] = self._restore_qubit_labels(outcome, compiled_experiments[index], list(kept_qubits))
+
+        # Shared work cannot be attributed to single experiments, so split the time evenly
+        time_taken = (time.perf_counter() - tree_start) / len(experiments)
+        for outcome in outcomes:
+            outcome["time_taken"] = time_taken
+
+        return outcomes
+
+    @staticmethod
+    def _prune_experiment(compiled_experiment: CompiledExperiment, noise_model: QuacNoiseModel,
+                          **run_config) -> Tuple[CompiledExperiment, QuacNoiseModel, List[int]]:
+        """Restricts an experiment and its noise model to the qubits that affect its outcome, unless
+        pruning is turned off or the full density matrix is requested
+
+        :param compiled_experiment: a CompiledExperiment object
+        :param noise_model: the noise model to simulate the experiment with
+        :param run_config: injected parameters
+        :return: a tuple of the experiment and noise model to simulate (the given objects if nothing
+            was pruned) and the original indices of the simulated qubits
+        """
+        all_qubits = list(range(compiled_experiment.n_qubits))
+        if not run_config.get("prune_idle_qubits", True) or run_config.get("result_type") == "density_matrix":
+            return compiled_experiment, noise_model, all_qubits
+
+        zz_pairs = noise_model.zz() if noise_model.has_zz() else None
+        pruned_experiment, kept_qubits = prune_idle_qubits(compiled_experiment, zz_pairs)
+        if kept_qubits == all_qubits:
+            return compiled_experiment, noise_model, all_qubits
+
+        return pruned_experiment, noise_model.restrict(kept_qubits), kept_qubits
+
+    @staticmethod
+    def _restore_qubit_labels(outcome: Dict, compiled_experiment: CompiledExperiment, kept_qubits: List[int]) -> Dict:
+        """Maps the outcome of a pruned experiment back to the qubits of the original experiment. Pruning
+        keeps qubits in ascending order, so probability vectors over measured qubits are unaffected
+
+        :param outcome: the outcome of the pruned experiment
+        :param compiled_experiment: the original CompiledExperiment object
+        :param kept_qubits: the original indices of the simulated qubits
+        :return: the outcome in terms of the original qubits
+        """
+        return dict(outcome, qubit_measurements=compiled_experiment.qubit_measurements,
+                    measured_qubits=[kept_qubits[qubit] for qubit in outcome["measured_qubits"]])
+
+    @staticmethod
+    def _lindblad_engine(n_qubits: int, noise_model: QuacNoiseModel, **run_config) -> LindbladEngine:
+        """Sets up the NumPy Lindblad engine for a number of qubits and a noise model
+
+        :param n_qubits: the number of qubits to simulate
+        :param noise_model: the noise model to simulate
+        :param run_config: injected parameters, possibly including the time step, whether to reuse
+            propagators of periodic stretches, whether to evolve uncoupled qubits in closed form, and
+            the solver and its tolerances
+        :return: a LindbladEngine object
+        """
+        dt = run_config.get("dt")
         if not dt:
             dt = 10  # default time step value (ns)
 
-        if gate_times:
-            if len(gate_times) < len(qexp.instructions):
-                raise QuacOptionsError("Not enough gate times (did you set times after transpilation?)")
-            elif len(gate_times) > len(qexp.instructions):
-                raise QuacOptionsError("Too many gate times")
+        return LindbladEngine(n_qubits, noise_model, dt, reuse_propagators=run_config.get("reuse_propagators", False),
+                              closed_form_idle=run_config.get("closed_form_idle", True),
+                              solver=get_solver(**run_config), atol=run_config.get("atol"),
+                              rtol=run_config.get("rtol"))
 
-        if not simulation_length and not gate_times:
-            simulation_length = instruction_time_order[-1][1]  # note that measurement is instantaneous
-        elif not simulation_length and gate_times:
-            simulation_length = gate_times[-1]
+    @staticmethod
+    def _needs_fresh_petsc(**run_config) -> bool:
+        """Determines whether QuaC has to be run in freshly started worker processes because the run
+        configures PETSc, which only reads its options when it is initialized
 
-        if simulation_length < instruction_time_order[-1][1]:
-            raise QuacOptionsError("Simulation length not long enough to accommodate circuit")
+        :param run_config: injected parameters
+        :return: True if QuaC simulations of this run must not happen in this process
+        """
+        return run_config.get("engine", "quac") == "quac" and bool(get_petsc_options(**run_config))
+
+    @staticmethod
+    def _density_matrix_outcome(compiled_experiment: CompiledExperiment, rho: np.array, **run_config) -> Dict:
+        """Extracts the outcome of an experiment from its final density matrix
+
+        :param compiled_experiment: the CompiledExperiment object that was simulated
+        :param rho: the final density matrix of all simulated qubits
+        :param run_config: injected parameters
+        :return: a dictionary holding the qubit measurements, the measured qubits, and the probability
+            vector over measured qubits (or the density matrix if requested)
+        """
+        measured_qubits = sorted(compiled_experiment.qubit_measurements)
+        outcome = {
+            "qubit_measurements": compiled_experiment.qubit_measurements,
+            "measured_qubits": measured_qubits
+        }
+
+        if run_config.get("result_type") == "density_matrix":
+            outcome["density_matrix"] = rho
+        else:
+            outcome["probabilities"] = marginalize_probabilities(LindbladEngine.bitstring_probs(rho), measured_qubits,
+                                                                 compiled_experiment.n_qubits)
+
+        return outcome
+
+    def _checkout_instance(self, n_qubits: int, noise_model: QuacNoiseModel, reuse: bool) -> quac.Instance:
+        """Provides a QuaC instance with qubits and Lindblad noise terms already set up, taking a
+        prepared one from the instance pool if possible
+
+        :param n_qubits: the number of qubits to simulate
+        :param noise_model: the noise model to simulate
+        :param reuse: whether to look for a prepared instance in the pool
+        :return: a QuaC instance ready for a density matrix and a circuit
+        """
+        pool_key = (n_qubits, noise_model.key(include_meas=False))
+        if reuse and self._instance_pool.get(pool_key):
+            self._instance_pool.move_to_end(pool_key)
+            return self._instance_pool[pool_key].pop()
 
         # Create a new instance of the QuaC simulator
+        initialize_quac()
         quac_simulator = quac.Instance()
 
-        # Build the circuit in QuaC
-        quac_circuit = quac.Circuit()
-        quac_circuit.initialize(len(qexp.instructions))
-
-        # Keep track of when to schedule gates and which qubits are measured
-        qubit_measurements = defaultdict(lambda: [])
-
-        # Add instructions
-        instruction_counter = 0
-        for instruction, gate_application_time in instruction_time_order:
-            # print(f"Applying gate {instruction.name} on {instruction.qubits} at time {gate_application_time} ns.")
-            # Take care of custom timing
-            if gate_times:
-                gate_application_time = gate_times[instruction_counter]
-                instruction_counter += 1
-
-            # Take care of applying instruction
-            if instruction.name == "measure":
-                # Keep track of qubits to measure
-                qubit_measurements[instruction.qubits[0]].append(instruction.memory[0])
-                continue
-            elif instruction.name == "barrier":
-                # Ignore barrier construct when building QuaC circuit
-                continue
-            elif instruction.name == "cx":
-                quac_circuit.add_gate(gate="cnot",
-                                      qubit1=instruction.qubits[0],
-                                      qubit2=instruction.qubits[1],
-                                      time=gate_application_time)
-            elif instruction.name == "cz":
-                quac_circuit.add_gate(gate="cz",
-                                      qubit1=instruction.qubits[0],
-                                      qubit2=instruction.qubits[1],
-                                      time=gate_application_time)
-            elif instruction.name == "u1":
-                quac_circuit.add_gate(gate="u1",
-                                      qubit1=instruction.qubits[0],
-                                      time=gate_application_time,
-                                      lam=instruction.params[0])
-            elif instruction.name == "u2":
-                quac_circuit.add_gate(gate="u2",
-                                      qubit1=instruction.qubits[0],
-                                      time=gate_application_time,
-                                      phi=instruction.params[0],
-                                      lam=instruction.params[1])
-            elif instruction.name == "u3":
-                quac_circuit.add_gate(gate="u3",
-                                      qubit1=instruction.qubits[0],
-                                      time=gate_application_time,
-                                      theta=instruction.params[0],
-                                      phi=instruction.params[1],
-                                      lam=instruction.params[2])
-            elif instruction.name == "rx" or instruction.name == "ry" or instruction.name == "rz":
-                quac_circuit.add_gate(gate=instruction.name,
-                                      qubit1=instruction.qubits[0],
-                                      time=gate_application_time,
-                                      theta=instruction.params[0])
-            elif instruction.name == "id":
-                quac_circuit.add_gate(gate="i",
-                                      qubit1=instruction.qubits[0],
-                                      time=gate_application_time)
-            else:
-                # TODO: other two-qubit gates besides CNOT will throw an error here
-                quac_circuit.add_gate(gate=instruction.name,
-                                      qubit1=instruction.qubits[0],
-                                      time=gate_application_time)
-
-            # Just in case the user does not know to only measure at the end
-            if instruction.name != "measure" and instruction.name != "barrier":
-                for qubit in instruction.qubits:
-                    if qubit in qubit_measurements:
-                        warnings.warn(
-                            """Only measurement at the end of the circuit is supported.
-                            Your intermediate measurements will be ignored, and these qubits
-                            will instead be measured at the end of the circuit."""
-                        )
-
-        # Check to make sure some qubits are measured
-        if len(qubit_measurements) == 0:
-            raise QuacBackendError("No qubits measured!")
-
         # Create qubits to simulate
-        quac_simulator.num_qubits = qexp.config.n_qubits
+        quac_simulator.num_qubits = n_qubits
         quac_simulator.create_qubits()
 
         # Add Lindblad emission and dephasing noise terms
         for qubit in range(quac_simulator.num_qubits):
             # NOTE: QuaC expects 1/T1 and 1/2T2* instead of T1 and T2
-            gamma = 1 / exp_noise_model.t1(qubit)
-            gamma2 = 2 / exp_noise_model.t2(qubit) - 1 / exp_noise_model.t1(qubit)
+            gamma = 1 / noise_model.t1(qubit)
+            gamma2 = 2 / noise_model.t2(qubit) - 1 / noise_model.t1(qubit)
             quac_simulator.add_lindblad_emission(qubit, gamma)
             quac_simulator.add_lindblad_dephasing(qubit, gamma2)
 
         # Add ZZ coupling terms, if present
         # Note: zz coupling terms should be expressed in frequency, not angular frequency!
-        if exp_noise_model.has_zz():
-            for pair in exp_noise_model.zz():
+        if noise_model.has_zz():
+            for pair in noise_model.zz():
                 qubit1, qubit2 = pair
-                zeta = exp_noise_model.zz(qubit1, qubit2)
+                zeta = noise_model.zz(qubit1, qubit2)
                 quac_simulator.add_ham_zz_coupling(qubit1=qubit1, qubit2=qubit2, zeta=zeta * 2 * math.pi)
 
-        # Run the experiment
+        return quac_simulator
+
+    def _checkin_instance(self, n_qubits: int, noise_model: QuacNoiseModel, quac_simulator: quac.Instance) -> None:
+        """Returns a QuaC instance to the instance pool once its results have been extracted
+
+        :param n_qubits: the number of qubits the instance simulates
+        :param noise_model: the noise model the instance was set up with
+        :param quac_simulator: the QuaC instance
+        """
+        pool_key = (n_qubits, noise_model.key(include_meas=False))
+        self._instance_pool.setdefault(pool_key, []).append(quac_simulator)
+        self._instance_pool.move_to_end(pool_key)
+
+        while len(self._instance_pool) > self.max_pooled_instances:
+            self._instance_pool.popitem(last=False)  # drop the least recently used setup
+
+    def _run_experiment(self, qexp: QasmQobjExperiment, **run_config) -> Tuple[quac.Instance, Dict[int, List[int]]]:
+        """Runs quantum experiments/circuits encoded in Qiskit QASM quantum objects
+        Note: Pulse quantum objects not supported
+
+        :param qexp: a Qasm quantum object experiment to run
+        :param run_config: a dictionary containing all injected parameters, including a list of
+            floating point gate times, a dictionary of relevant Lindblad noise parameters, and
+            the duration of time to run the simulation
+        :return: a QuaC instance that has run the experiment
+        """
+        compiled_experiment = self._compile_experiment(qexp, **run_config)
+        quac_simulator = self._run_compiled(compiled_experiment, self._get_noise_model(**run_config), **run_config)
+
+        return quac_simulator, compiled_experiment.qubit_measurements
+
+    def _run_compiled(self, compiled_experiment: CompiledExperiment, noise_model: QuacNoiseModel,
+                      **run_config) -> quac.Instance:
+        """Runs a compiled experiment in QuaC
+
+        :param compiled_experiment: a CompiledExperiment object
+        :param noise_model: the noise model to simulate the experiment with
+        :param run_config: injected parameters, possibly including the time step
+        :return: a QuaC instance that has run the experiment
+        """
+        dt = run_config.get("dt")
+        if not dt:
+            dt = 10  # default time step value (ns)
+
+        # Set up qubits and noise terms, reusing a prepared instance if requested
+        quac_simulator = self._checkout_instance(compiled_experiment.n_qubits, noise_model,
+                                                 run_config.get("reuse_instances", False))
+
+        # Run the experiment from a fresh initial state
         quac_simulator.create_density_matrix()
-        quac_simulator.start_circuit_at(quac_circuit)
-        quac_simulator.run(max(simulation_length, dt), dt=dt)
+        quac_simulator.start_circuit_at(build_quac_circuit(compiled_experiment))
+        quac_simulator.run(max(compiled_experiment.simulation_length, dt), dt=dt)
 
-        return quac_simulator, dict(qubit_measurements)
+        return quac_simulator
@@ -8,6 +8,22 @@ from qiskit.circuit.instruction import QasmQobjInstruction
 from qiskit.qobj.qasm_qobj import QasmQobjExperiment
 
 
+def gate_length(instruction: QasmQobjInstruction, hardware_props: BackendProperties) -> float:
+    """Looks up how long an instruction takes when scheduled
+
+    :param instruction: the instruction to look up
+    :param hardware_props: hardware properties (T1, T2, etc.)
+    :return: the length of the instruction in nanoseconds
+    """
+    if instruction.name == 'u1':
+        return 10
+
+    try:
+        return hardware_props.gate_length(gate=instruction.name, qubits=instruction.qubits) * 1e9
+    except (BackendPropertyError, AttributeError):
+        return 0  # TODO: should measure have a time?
+
+
 def list_schedule_experiment(qexp: QasmQobjExperiment,
                              hardware_props: BackendProperties) -> List[Tuple[QasmQobjInstruction, float]]:
     """List schedule experiment to minimize run time
@@ -23,19 +39,12 @@ def list_schedule_experiment(qexp: QasmQobjExperiment,
     # Schedule gate times
     for index, instruction in enumerate(qexp.instructions):
         instruction.id = index
-        try:
-            gate_length = hardware_props.gate_length(gate=instruction.name, qubits=instruction.qubits) * 1e9
-        except (BackendPropertyError, AttributeError):
-            gate_length = 0  # TODO: should measure have a time?
-
+        instruction_length = gate_length(instruction, hardware_props)
         gate_application_time = max([scheduling_times[qubit] for qubit in instruction.qubits])
 
-        if instruction.name == 'u1':
-            gate_length = 10
-
         for qubit in instruction.qubits:
             scheduling_times[qubit] = gate_application_time
-            scheduling_times[qubit] += gate_length
+            scheduling_times[qubit] += instruction_length
 
         instruction_time_order.append((instruction, gate_application_time))
 
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains the ODE integrators that can be selected per run with the solver option,
+along with their translation into PETSc TS options for QuaC. PETSc reads its options once, when QuaC
+is initialized, so QuaC is initialized lazily and QuaC runs with solver options are carried out in
+freshly started worker processes that are handed the options explicitly.
+"""
+from typing import Dict, Optional
+import os
+import quac
+from quac_qiskit.exceptions import QuacOptionsError
+
+# Selectable integrators: the engines supporting each and, for QuaC, the PETSc TS options selecting it
+SOLVERS = {
+    "rk4": {"engines": ["quac", "numpy"], "petsc_options": "-ts_type rk -ts_rk_type 4 -ts_adapt_type none"},
+    "dopri5": {"engines": ["quac", "numpy"], "petsc_options": "-ts_type rk -ts_rk_type 5dp -ts_adapt_type basic"},
+    "bdf": {"engines": ["quac"], "petsc_options": "-ts_type bdf -ts_adapt_type basic"},
+    "cn": {"engines": ["quac"], "petsc_options": "-ts_type cn"},
+    "expm": {"engines": ["numpy"], "petsc_options": None}
+}
+
+# Whether QuaC/PETSc has been initialized in this process
+_quac_initialized = False
+
+
+def initialize_quac(petsc_options: str = "") -> None:
+    """Initializes QuaC/PETSc in this process, unless it already is. PETSc reads the PETSC_OPTIONS
+    environment variable at this point, so the given options are appended to it first; they apply to
+    every QuaC simulation of this process
+
+    :param petsc_options: PETSc options to initialize QuaC with (only honored by the first call)
+    """
+    global _quac_initialized
+    if _quac_initialized:
+        return
+
+    if petsc_options:
+        os.environ["PETSC_OPTIONS"] = f"{os.environ.get('PETSC_OPTIONS', '')} {petsc_options}".strip()
+    quac.initialize()  # QuaC must only be initialized once
+    _quac_initialized = True
+
+
+def get_solver(**run_config) -> Optional[str]:
+    """Determines the integrator a run asks for
+
+    :param run_config: injected parameters, possibly including solver, atol, and rtol
+    :return: the name of the integrator, or None if the engine's default should be used (fixed-step
+        RK4 for the numpy engine)
+    """
+    if run_config.get("solver"):
+        return run_config["solver"]
+
+    # Tolerances only make sense for an adaptive integrator
+    if run_config.get("atol") is not None or run_config.get("rtol") is not None:
+        return "dopri5"
+    return None
+
+
+def check_solver_options(**run_config) -> None:
+    """Validates the integrator options of a run
+
+    :param run_config: injected parameters
+    """
+    engine = run_config.get("engine", "quac")
+    solver = get_solver(**run_config)
+
+    if solver is not None and solver not in SOLVERS:
+        raise QuacOptionsError(f"Solver must be one of {', '.join(SOLVERS)}")
+    if solver is not None and engine not in SOLVERS[solver]["engines"]:
+        raise QuacOptionsError(f"Solver {solver} is not available for the {engine} engine")
+
+    for tolerance in ["atol", "rtol"]:
+        if run_config.get(tolerance) is not None and run_config.get(tolerance) <= 0:
+            raise QuacOptionsError("Integration tolerances must be positive")
+
+    if run_config.get("petsc_options") is not None and not isinstance(run_config.get("petsc_options"), str):
+        raise QuacOptionsError("PETSc options must be given as a string")
+
+
+def get_petsc_options(**run_config) -> str:
+    """Translates the integrator options of a QuaC run into PETSc TS options
+
+    :param run_config: injected parameters
+    :return: a PETSc options string (empty if QuaC's defaults should be used)
+    """
+    petsc_options = []
+    solver = get_solver(**run_config)
+    if solver is not None and SOLVERS[solver]["petsc_options"]:
+        petsc_options.append(SOLVERS[solver]["petsc_options"])
+
+    if run_config.get("atol") is not None:
+        petsc_options.append(f"-ts_atol {run_config['atol']}")
+    if run_config.get("rtol") is not None:
+        petsc_options.append(f"-ts_rtol {run_config['rtol']}")
+    if run_config.get("petsc_options"):
+        petsc_options.append(run_config["petsc_options"])
+
+    return " ".join(petsc_options)
+
+
+def solver_header(**run_config) -> Dict:
+    """Describes the integrator configuration of a run for the result header, so runs can be compared
+
+    :param run_config: injected parameters
+    :return: a dictionary of the engine, solver, time step, tolerances, and (for QuaC) PETSc options
+    """
+    engine = run_config.get("engine", "quac")
+    header = {
+        "engine": engine,
+        "solver": get_solver(**run_config) or {"numpy": "rk4", "trajectories": "waiting_time"}.get(engine, "default"),
+        "dt": run_config.get("dt") or 10,
+        "atol": run_config.get("atol"),
+        "rtol": run_config.get("rtol")
+    }
+
+    if engine == "quac":
+        header["petsc_options"] = get_petsc_options(**run_config)
+
+    return header
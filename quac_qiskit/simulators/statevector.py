@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains an exact state vector simulation of compiled experiments. Without T1, T2,
+and ZZ coupling, nothing happens between gates, so a circuit's final state is pure and follows from
+its gates alone. Measurement error is applied to the resulting probabilities afterwards, as for any
+other simulation, so noiseless and readout-only noise models need 2^n rather than 4^n memory.
+"""
+from typing import List, Optional, Tuple
+import numpy as np
+from quac_qiskit.models import QuacNoiseModel
+from .gates import apply_gate_to_statevector
+from .translate import CompiledExperiment
+
+
+def is_coherent(noise_model: QuacNoiseModel) -> bool:
+    """Checks whether a noise model leaves states pure between gates (measurement error is allowed)
+
+    :param noise_model: a QuacNoiseModel object
+    :return: True if the noise model defines no T1, T2, or ZZ coupling
+    """
+    return not (noise_model.has_t1() or noise_model.has_t2() or noise_model.has_zz())
+
+
+def run_statevector(compiled_experiment: CompiledExperiment,
+                    snapshot_times: Optional[List[float]] = None) -> Tuple[np.array, np.array]:
+    """Applies the gates of a compiled experiment to the all-zero state vector, recording basis state
+    probabilities at the requested times along the way. Gates scheduled exactly at a snapshot time
+    are applied before the snapshot is taken
+
+    :param compiled_experiment: a CompiledExperiment object
+    :param snapshot_times: times (in nanoseconds) at which to record probabilities
+    :return: a tuple of the final state vector (qubit 0 is the most significant bit) and a Numpy array
+        of shape (len(snapshot_times), 2^n_qubits) of probabilities in the order of snapshot_times
+    """
+    snapshot_times = [] if snapshot_times is None else snapshot_times
+    snapshot_order = np.argsort(snapshot_times, kind="stable")
+    snapshots = np.zeros((len(snapshot_times), 2 ** compiled_experiment.n_qubits))
+    next_snapshot = 0
+
+    psi = np.zeros([2] * compiled_experiment.n_qubits, dtype=complex)
+    psi[(0,) * compiled_experiment.n_qubits] = 1
+
+    for gate, gate_arguments in compiled_experiment.gates:
+        while next_snapshot < len(snapshot_order) and \
+                snapshot_times[snapshot_order[next_snapshot]] < gate_arguments["time"]:
+            snapshots[snapshot_order[next_snapshot]] = statevector_probs(psi)
+            next_snapshot += 1
+
+        psi = apply_gate_to_statevector(psi, gate, gate_arguments)
+
+    for snapshot_index in snapshot_order[next_snapshot:]:
+        snapshots[snapshot_index] = statevector_probs(psi)
+
+    return psi.reshape(-1), snapshots
+
+
+def statevector_probs(psi: np.array) -> np.array:
+    """Reads the basis state probabilities off a state vector
+
+    :param psi: a state vector (or state vector tensor)
+    :return: a Numpy probability vector (qubit 0 is the most significant bit)
+    """
+    return np.abs(np.reshape(psi, -1)) ** 2
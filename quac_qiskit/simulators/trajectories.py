@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains a quantum trajectory (Monte Carlo wave function) engine that unravels the
+Lindblad master equation QuaC solves into stochastic pure state trajectories. The jump operators
+are the same as QuaC's (emission at 1/T1 and number-operator dephasing at 2/T2 - 1/T1), and since
+both they and the ZZ coupling Hamiltonian are diagonal in the number basis, so is the effective
+Hamiltonian between jumps. Jump times can therefore be drawn exactly (waiting-time method) instead
+of stepping through time, and every trajectory only takes 2^n rather than 4^n amplitudes.
+"""
+from typing import List, Optional, Tuple
+import math
+import numpy as np
+from quac_qiskit.exceptions import QuacOptionsError
+from quac_qiskit.models import QuacNoiseModel
+from .gates import apply_gate_to_statevector
+from .lindblad import qubit_occupations
+from .translate import CompiledExperiment
+
+
+class TrajectoryEngine:
+    """Class for sampling measurement outcomes of a fixed set of qubits under a fixed noise model from
+    quantum trajectories
+    """
+    max_batch_amplitudes = 2 ** 22  # amplitudes of all trajectories evolved at once (64 MiB)
+    bisection_steps = 60  # halvings of the search interval when locating a jump time
+
+    def __init__(self, n_qubits: int, noise_model: QuacNoiseModel, dt: float = 10,
+                 rng: Optional[np.random.Generator] = None):
+        """Initialize a trajectory engine
+
+        :param n_qubits: the number of qubits to simulate
+        :param noise_model: the noise model to simulate
+        :param dt: the minimum simulation length (in nanoseconds), as for the other engines
+        :param rng: an optional Numpy random generator (a fresh one is used if not provided)
+        """
+        self.n_qubits = n_qubits
+        self.dt = dt
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.jumps = 0
+
+        # NOTE: rates follow the QuaC setup (1/T1 for emission and 2/T2 - 1/T1 for dephasing)
+        self.emission_rates = np.array([1 / noise_model.t1(qubit) for qubit in range(n_qubits)])
+        self.dephasing_rates = np.array([2 / noise_model.t2(qubit) - 1 / noise_model.t1(qubit)
+                                         for qubit in range(n_qubits)])
+        if np.any(self.dephasing_rates < 0):
+            raise QuacOptionsError("Trajectories require T2 <= 2 * T1 for every qubit")
+
+        # Diagonal of the effective Hamiltonian: ZZ energies and half the total jump rate of each state
+        self.occupations = qubit_occupations(n_qubits)
+        energies = np.zeros(2 ** n_qubits)
+        if noise_model.has_zz():
+            for qubit1, qubit2 in noise_model.zz():
+                if qubit1 < n_qubits and qubit2 < n_qubits:
+                    zeta = noise_model.zz(qubit1, qubit2) * 2 * math.pi
+                    energies += zeta * self.occupations[:, qubit1] * self.occupations[:, qubit2]
+        self.decay_rates = self.occupations @ (self.emission_rates + self.dephasing_rates)
+        self.generator = -1j * energies - 0.5 * self.decay_rates
+
+    def run(self, compiled_experiment: CompiledExperiment, shots_per_trajectory: np.array) -> np.array:
+        """Simulates a trajectory per entry of shots_per_trajectory and samples that many measurements
+        of all qubits at its end
+
+        :param compiled_experiment: a CompiledExperiment object
+        :param shots_per_trajectory: a Numpy array of the number of shots to sample from each trajectory
+        :return: a Numpy array of sampled basis states (qubit 0 is the most significant bit)
+        """
+        batch_size = max(1, self.max_batch_amplitudes // 2 ** self.n_qubits)
+
+        samples = []
+        for batch_start in range(0, len(shots_per_trajectory), batch_size):
+            batch_shots = shots_per_trajectory[batch_start:batch_start + batch_size]
+            psi = self.run_batch(compiled_experiment, len(batch_shots))
+            samples.append(self.sample(psi, batch_shots))
+
+        return np.concatenate(samples) if samples else np.zeros(0, dtype=np.int64)
+
+    def run_batch(self, compiled_experiment: CompiledExperiment, batch_size: int) -> np.array:
+        """Evolves a batch of trajectories from the ground state through a compiled experiment
+
+        :param compiled_experiment: a CompiledExperiment object
+        :param batch_size: the number of trajectories
+        :return: a Numpy array of shape (batch_size, 2^n_qubits) of (unnormalized) final state vectors
+        """
+        dimension = 2 ** self.n_qubits
+        psi = np.zeros((batch_size, dimension), dtype=complex)
+        psi[:, 0] = 1
+
+        # A trajectory jumps once its squared norm decays to its threshold
+        thresholds = self.rng.random(batch_size)
+
+        time = 0
+        for gate, gate_arguments in compiled_experiment.gates:
+            if gate_arguments["time"] > time:
+                psi = self.evolve(psi, thresholds, gate_arguments["time"] - time)
+                time = gate_arguments["time"]
+
+            psi = apply_gate_to_statevector(psi.reshape((batch_size,) + (2,) * self.n_qubits), gate, gate_arguments,
+                                            batch_dims=1).reshape(batch_size, dimension)
+
+        end_time = max(compiled_experiment.simulation_length, self.dt)
+        return self.evolve(psi, thresholds, end_time - time)
+
+    def evolve(self, psi: np.array, thresholds: np.array, duration: float) -> np.array:
+        """Evolves a batch of trajectories, carrying out every quantum jump that occurs along the way
+
+        :param psi: a Numpy array of shape (batch size, 2^n_qubits) of state vectors
+        :param thresholds: the squared norms at which each trajectory jumps next (updated in place)
+        :param duration: the length of time (in nanoseconds) to evolve for
+        :return: a new Numpy array of state vectors
+        """
+        if duration <= 0 or not np.any(self.generator):
+            return psi
+
+        psi = psi.copy()
+        remaining_times = np.full(len(psi), float(duration))
+        pending = np.arange(len(psi))
+        while len(pending):
+            populations = np.abs(psi[pending]) ** 2
+            final_norms = (populations * np.exp(-np.outer(remaining_times[pending], self.decay_rates))).sum(axis=1)
+
+            # Trajectories that stay above their threshold do not jump before the end
+            no_jump = final_norms > thresholds[pending]
+            finished = pending[no_jump]
+            psi[finished] = self.evolve_no_jump(psi[finished], remaining_times[finished])
+
+            pending = pending[~no_jump]
+            if not len(pending):
+                break
+
+            jump_times = self.jump_times(populations[~no_jump], thresholds[pending], remaining_times[pending])
+            psi[pending] = self.jump(self.evolve_no_jump(psi[pending], jump_times))
+            thresholds[pending] = self.rng.random(len(pending))
+            remaining_times[pending] -= jump_times
+
+        return psi
+
+    def evolve_no_jump(self, psi: np.array, durations: np.array) -> np.array:
+        """Evolves state vectors with the (diagonal, non-Hermitian) effective Hamiltonian
+
+        :param psi: a Numpy array of shape (batch size, 2^n_qubits) of state vectors
+        :param durations: the length of time (in nanoseconds) to evolve each state vector for
+        :return: a new Numpy array of (unnormalized) state vectors
+        """
+        return psi * np.exp(np.outer(durations, self.generator))
+
+    def jump_times(self, populations: np.array, thresholds: np.array, max_times: np.array) -> np.array:
+        """Locates the times at which the squared norms of trajectories decay to their thresholds
+
+        :param populations: a Numpy array of shape (batch size, 2^n_qubits) of basis state populations
+        :param thresholds: the squared norm at which each trajectory jumps
+        :param max_times: upper bounds of the jump times (the norms are below threshold there)
+        :return: a Numpy array of jump times (in nanoseconds)
+        """
+        lower_times = np.zeros(len(thresholds))
+        upper_times = np.array(max_times, dtype=float)
+        for _ in range(self.bisection_steps):
+            middle_times = (lower_times + upper_times) / 2
+            norms = (populations * np.exp(-np.outer(middle_times, self.decay_rates))).sum(axis=1)
+            above = norms > thresholds
+            lower_times = np.where(above, middle_times, lower_times)
+            upper_times = np.where(above, upper_times, middle_times)
+
+        return upper_times
+
+    def jump(self, psi: np.array) -> np.array:
+        """Applies a randomly chosen jump operator to each state vector, choosing each emission and
+        dephasing jump with probability proportional to its rate times the population it acts on
+
+        :param psi: a Numpy array of shape (batch size, 2^n_qubits) of state vectors
+        :return: a new Numpy array of normalized state vectors
+        """
+        excited_populations = (np.abs(psi) ** 2) @ self.occupations
+        channel_weights = np.cumsum(np.hstack([excited_populations * self.emission_rates,
+                                               excited_populations * self.dephasing_rates]), axis=1)
+        channels = (channel_weights < self.rng.random((len(psi), 1)) * channel_weights[:, -1:]).sum(axis=1)
+        channels = np.minimum(channels, 2 * self.n_qubits - 1)
+
+        psi = psi.copy()
+        for qubit in range(self.n_qubits):
+            shape = (-1, 2 ** qubit, 2, 2 ** (self.n_qubits - qubit - 1))
+
+            # Emission moves the excited component of the qubit down to the ground state
+            emitted = channels == qubit
+            emitted_psi = psi[emitted].reshape(shape)
+            emitted_psi[:, :, 0, :] = emitted_psi[:, :, 1, :]
+            emitted_psi[:, :, 1, :] = 0
+            psi[emitted] = emitted_psi.reshape(-1, 2 ** self.n_qubits)
+
+            # Dephasing projects the qubit onto its excited state
+            dephased = channels == self.n_qubits + qubit
+            dephased_psi = psi[dephased].reshape(shape)
+            dephased_psi[:, :, 0, :] = 0
+            psi[dephased] = dephased_psi.reshape(-1, 2 ** self.n_qubits)
+
+        self.jumps += len(psi)
+        return psi / np.linalg.norm(psi, axis=1, keepdims=True)
+
+    def sample(self, psi: np.array, shots_per_trajectory: np.array) -> np.array:
+        """Samples measurements of all qubits from each trajectory's final state
+
+        :param psi: a Numpy array of shape (batch size, 2^n_qubits) of state vectors
+        :param shots_per_trajectory: the number of shots to sample from each state vector
+        :return: a Numpy array of sampled basis states, grouped by trajectory
+        """
+        samples = []
+        for state_vector, shots in zip(psi, shots_per_trajectory):
+            cumulative_dist = np.cumsum(np.abs(state_vector) ** 2)
+            chosen = np.searchsorted(cumulative_dist, self.rng.random(shots) * cumulative_dist[-1], side='right')
+            samples.append(np.minimum(chosen, len(cumulative_dist) - 1))
+
+        return np.concatenate(samples).astype(np.int64)
+
+
+def split_shots(shots: int, n_trajectories: int) -> np.array:
+    """Spreads shots as evenly as possible across trajectories
+
+    :param shots: the total number of shots
+    :param n_trajectories: the number of trajectories
+    :return: a Numpy array of the number of shots sampled from each trajectory
+    """
+    shots_per_trajectory = np.full(n_trajectories, shots // n_trajectories, dtype=np.int64)
+    shots_per_trajectory[:shots % n_trajectories] += 1
+    return shots_per_trajectory
+
+
+def sample_trajectories(compiled_experiment: CompiledExperiment, noise_model: QuacNoiseModel,
+                        shots_per_trajectory: np.array, seed_sequence: np.random.SeedSequence,
+                        dt: float = 10) -> Tuple[np.array, int]:
+    """Samples measurements of all qubits of a compiled experiment from quantum trajectories (this is
+    the unit of work handed to worker processes)
+
+    :param compiled_experiment: a CompiledExperiment object
+    :param noise_model: the noise model to simulate
+    :param shots_per_trajectory: a Numpy array of the number of shots to sample from each trajectory
+    :param seed_sequence: a Numpy seed sequence for the random numbers of these trajectories
+    :param dt: the minimum simulation length (in nanoseconds)
+    :return: a tuple of a Numpy array of sampled basis states and the number of jumps that occurred
+    """
+    engine = TrajectoryEngine(compiled_experiment.n_qubits, noise_model, dt, np.random.default_rng(seed_sequence))
+    samples = engine.run(compiled_experiment, shots_per_trajectory)
+    return samples, engine.jumps
+
+
+def batch_trajectories(shots_per_trajectory: np.array, seed_sequence: np.random.SeedSequence,
+                       n_batches: int) -> List[Tuple[np.array, np.random.SeedSequence]]:
+    """Divides trajectories into batches with independent random streams, e.g. for worker processes
+
+    :param shots_per_trajectory: a Numpy array of the number of shots to sample from each trajectory
+    :param seed_sequence: the Numpy seed sequence of all trajectories
+    :param n_batches: the number of batches
+    :return: a list of tuples of the shots per trajectory of a batch and its seed sequence
+    """
+    return list(zip(np.array_split(shots_per_trajectory, n_batches), seed_sequence.spawn(n_batches)))
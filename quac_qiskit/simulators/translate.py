@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains the translation of Qiskit Qasm quantum object experiments into timed QuaC
+gates. Translation only depends on the experiment and its timing, not on the noise model, so a
+compiled experiment can be simulated any number of times.
+"""
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import warnings
+import quac
+from qiskit.qobj.qasm_qobj import QasmQobjExperiment
+from qiskit.providers.models.backendproperties import BackendProperties
+from quac_qiskit.exceptions import QuacOptionsError, QuacBackendError
+from .schedule import list_schedule_experiment, gate_length
+
+
+class CompiledExperiment(NamedTuple):
+    """A scheduled experiment translated into QuaC gates, ready to be simulated with any noise model
+    """
+    gates: Tuple[Tuple[str, Dict], ...]  # QuaC gate names and keyword arguments for quac.Circuit.add_gate
+    qubit_measurements: Dict[int, List[int]]  # measured qubits and the register slots they are measured into
+    simulation_length: float  # total number of nanoseconds to run the simulator
+    n_qubits: int  # number of qubits simulated
+    gate_lengths: Optional[Tuple[float, ...]] = None  # scheduled nanoseconds of each gate (None for custom times)
+
+
+def translate_instruction(name: str, qubits: List[int], params: List[float], time: float) -> Tuple[str, Dict]:
+    """Translates a single Qiskit instruction into a QuaC gate
+
+    :param name: the Qiskit name of the instruction
+    :param qubits: the qubits the instruction acts on
+    :param params: the parameters of the instruction
+    :param time: the time (in nanoseconds) at which the gate is applied
+    :return: a tuple of the QuaC gate name and keyword arguments for quac.Circuit.add_gate
+    """
+    if name == "cx":
+        return "cnot", {"qubit1": qubits[0], "qubit2": qubits[1], "time": time}
+    elif name == "cz":
+        return "cz", {"qubit1": qubits[0], "qubit2": qubits[1], "time": time}
+    elif name == "u1":
+        return "u1", {"qubit1": qubits[0], "time": time, "lam": params[0]}
+    elif name == "u2":
+        return "u2", {"qubit1": qubits[0], "time": time, "phi": params[0], "lam": params[1]}
+    elif name == "u3":
+        return "u3", {"qubit1": qubits[0], "time": time, "theta": params[0], "phi": params[1], "lam": params[2]}
+    elif name == "rx" or name == "ry" or name == "rz":
+        return name, {"qubit1": qubits[0], "time": time, "theta": params[0]}
+    elif name == "id":
+        return "i", {"qubit1": qubits[0], "time": time}
+
+    # TODO: other two-qubit gates besides CNOT will throw an error here
+    return name, {"qubit1": qubits[0], "time": time}
+
+
+def compile_experiment(qexp: QasmQobjExperiment, hardware_props: Optional[BackendProperties],
+                       gate_times: Optional[List[float]] = None,
+                       simulation_length: Optional[float] = None) -> CompiledExperiment:
+    """Schedules an experiment and translates its instructions into QuaC gates
+
+    :param qexp: a Qasm quantum object experiment to compile
+    :param hardware_props: hardware properties used to schedule gates
+    :param gate_times: an optional list of times (in nanoseconds) at which to apply each gate
+    :param simulation_length: an optional total number of nanoseconds to run the simulator
+    :return: a CompiledExperiment object
+    """
+    # Schedule experiment
+    instruction_time_order = list_schedule_experiment(qexp, hardware_props)
+
+    # Sanitize parameters
+    if gate_times:
+        if len(gate_times) < len(qexp.instructions):
+            raise QuacOptionsError("Not enough gate times (did you set times after transpilation?)")
+        elif len(gate_times) > len(qexp.instructions):
+            raise QuacOptionsError("Too many gate times")
+
+    if not simulation_length and not gate_times:
+        simulation_length = instruction_time_order[-1][1]  # note that measurement is instantaneous
+    elif not simulation_length and gate_times:
+        simulation_length = gate_times[-1]
+
+    if simulation_length < instruction_time_order[-1][1]:
+        raise QuacOptionsError("Simulation length not long enough to accommodate circuit")
+
+    # Keep track of gates, how long they are scheduled for, and which qubits are measured
+    gates = []
+    gate_lengths = []
+    qubit_measurements = {}
+
+    # Add instructions
+    instruction_counter = 0
+    for instruction, gate_application_time in instruction_time_order:
+        # Take care of custom timing
+        if gate_times:
+            gate_application_time = gate_times[instruction_counter]
+            instruction_counter += 1
+
+        # Take care of applying instruction
+        if instruction.name == "measure":
+            # Keep track of qubits to measure
+            qubit_measurements.setdefault(instruction.qubits[0], []).append(instruction.memory[0])
+            continue
+        elif instruction.name == "barrier":
+            # Ignore barrier construct when building QuaC circuit
+            continue
+
+        gates.append(translate_instruction(instruction.name, instruction.qubits,
+                                           getattr(instruction, "params", []), gate_application_time))
+        gate_lengths.append(gate_length(instruction, hardware_props))
+
+        # Just in case the user does not know to only measure at the end
+        for qubit in instruction.qubits:
+            if qubit in qubit_measurements:
+                warnings.warn(
+                    """Only measurement at the end of the circuit is supported.
+                    Your intermediate measurements will be ignored, and these qubits
+                    will instead be measured at the end of the circuit."""
+                )
+
+    # Check to make sure some qubits are measured
+    if len(qubit_measurements) == 0:
+        raise QuacBackendError("No qubits measured!")
+
+    # Custom gate times do not follow the schedule, so the scheduled lengths do not apply to them
+    return CompiledExperiment(tuple(gates), qubit_measurements, simulation_length, qexp.config.n_qubits,
+                              None if gate_times else tuple(gate_lengths))
+
+
+def _restrict_experiment(compiled_experiment: CompiledExperiment, qubits: List[int]) -> CompiledExperiment:
+    """Restricts an experiment to the gates and measurements on some of its qubits, which are relabeled
+    0, 1, ... in the order given (gates must not connect them to other qubits)
+
+    :param compiled_experiment: a CompiledExperiment object
+    :param qubits: a list of qubit indices to keep
+    :return: a CompiledExperiment object over len(qubits) qubits
+    """
+    new_labels = {qubit: new_qubit for new_qubit, qubit in enumerate(qubits)}
+
+    gates = []
+    gate_lengths = []
+    for index, (gate, gate_arguments) in enumerate(compiled_experiment.gates):
+        if gate_arguments["qubit1"] not in new_labels:
+            continue
+        gate_arguments = dict(gate_arguments, qubit1=new_labels[gate_arguments["qubit1"]])
+        if "qubit2" in gate_arguments:
+            gate_arguments["qubit2"] = new_labels[gate_arguments["qubit2"]]
+        gates.append((gate, gate_arguments))
+        if compiled_experiment.gate_lengths is not None:
+            gate_lengths.append(compiled_experiment.gate_lengths[index])
+
+    qubit_measurements = {new_labels[qubit]: slots for qubit, slots in compiled_experiment.qubit_measurements.items()
+                          if qubit in new_labels}
+    return CompiledExperiment(tuple(gates), qubit_measurements, compiled_experiment.simulation_length, len(qubits),
+                              None if compiled_experiment.gate_lengths is None else tuple(gate_lengths))
+
+
+def prune_idle_qubits(compiled_experiment: CompiledExperiment,
+                      zz_pairs: Optional[List[Tuple[int, int]]] = None) -> Tuple[CompiledExperiment, List[int]]:
+    """Removes the qubits an experiment leaves alone and relabels the others compactly. A qubit is kept
+    if a gate acts on it, if it is measured, or if it is ZZ coupled to such a qubit; all other qubits
+    stay in their ground state and do not affect the outcome
+
+    :param compiled_experiment: a CompiledExperiment object
+    :param zz_pairs: the pairs of qubits with ZZ coupling in the noise model, if any
+    :return: a tuple of a CompiledExperiment object over the kept qubits, relabeled 0, 1, ... in
+        ascending order, and the original indices of the kept qubits
+    """
+    touched_qubits = set(compiled_experiment.qubit_measurements)
+    for _, gate_arguments in compiled_experiment.gates:
+        touched_qubits.add(gate_arguments["qubit1"])
+        if "qubit2" in gate_arguments:
+            touched_qubits.add(gate_arguments["qubit2"])
+
+    kept_qubits = set(touched_qubits)
+    for qubit1, qubit2 in zz_pairs or []:
+        if qubit1 in touched_qubits or qubit2 in touched_qubits:
+            kept_qubits.update([qubit1, qubit2])
+
+    kept_qubits = sorted(qubit for qubit in kept_qubits if qubit < compiled_experiment.n_qubits)
+    return _restrict_experiment(compiled_experiment, kept_qubits), kept_qubits
+
+
+def split_independent_clusters(compiled_experiment: CompiledExperiment,
+                               zz_pairs: Optional[List[Tuple[int, int]]] = None
+                               ) -> List[Tuple[CompiledExperiment, List[int]]]:
+    """Splits an experiment into clusters of qubits that never interact, i.e. the connected components
+    of the graph whose edges are two-qubit gates and ZZ couplings. Clusters evolve independently, so
+    the distribution over all measured qubits is the product of the clusters' distributions. Clusters
+    without measured qubits do not affect it and are left out
+
+    :param compiled_experiment: a CompiledExperiment object
+    :param zz_pairs: the pairs of qubits with ZZ coupling in the noise model, if any
+    :return: a list of tuples of a CompiledExperiment object per measured cluster, relabeled 0, 1, ...
+        in ascending order, and the original indices of its qubits
+    """
+    # Union-find over qubits
+    parents = list(range(compiled_experiment.n_qubits))
+
+    def find(qubit: int) -> int:
+        while parents[qubit] != qubit:
+            parents[qubit] = parents[parents[qubit]]
+            qubit = parents[qubit]
+        return qubit
+
+    edges = [(gate_arguments["qubit1"], gate_arguments["qubit2"])
+             for _, gate_arguments in compiled_experiment.gates if "qubit2" in gate_arguments]
+    edges += [pair for pair in zz_pairs or [] if max(pair) < compiled_experiment.n_qubits]
+    for qubit1, qubit2 in edges:
+        parents[find(qubit1)] = find(qubit2)
+
+    clusters = {}
+    for qubit in range(compiled_experiment.n_qubits):
+        clusters.setdefault(find(qubit), []).append(qubit)
+
+    measured_clusters = []
+    for cluster_qubits in sorted(clusters.values()):
+        if not any(qubit in compiled_experiment.qubit_measurements for qubit in cluster_qubits):
+            continue
+
+        measured_clusters.append((_restrict_experiment(compiled_experiment, cluster_qubits), cluster_qubits))
+
+    return measured_clusters
+
+
+def build_quac_circuit(compiled_experiment: CompiledExperiment) -> quac.Circuit:
+    """Builds a QuaC circuit from a compiled experiment
+
+    :param compiled_experiment: a CompiledExperiment object
+    :return: a QuaC circuit holding all gates of the experiment
+    """
+    quac_circuit = quac.Circuit()
+    quac_circuit.initialize(len(compiled_experiment.gates))
+
+    for gate, gate_arguments in compiled_experiment.gates:
+        quac_circuit.add_gate(gate=gate, **gate_arguments)
+
+    return quac_circuit
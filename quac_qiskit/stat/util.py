@@ -2,7 +2,7 @@
 
 """This module contains probability-related utility functions for the QuaC-Qiskit plugin.
 """
-from typing import List, Union
+from typing import List, Optional, Union
 import random
 import numpy as np
 
@@ -27,3 +27,23 @@ def choose_index(prob_dist: Union[List[float], np.array]) -> int:
 
     # return -1  #  TODO: update when bitstring bug is fixed
     return 0
+
+
+def sample_indices(prob_dist: Union[List[float], np.array], shots: int,
+                   rng: Optional[np.random.Generator] = None) -> np.array:
+    """Chooses shots indices i from a list l with probability l[i] in a single batch. This is the
+    vectorized counterpart of choose_index
+
+    :param prob_dist: a list of floating point probabilities
+    :param shots: the number of indices to choose
+    :param rng: an optional Numpy random generator (a fresh one is used if not provided)
+    :return: a Numpy array of shots chosen indices
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    # Clip tiny negative probabilities left over by the solver so the cumulative sum stays sorted
+    cumulative_dist = np.cumsum(np.clip(np.asarray(prob_dist, dtype=float), 0, None))
+    chosen = np.searchsorted(cumulative_dist, rng.random(shots) * cumulative_dist[-1], side='right')
+
+    return np.minimum(chosen, len(cumulative_dist) - 1)
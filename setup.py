@@ -18,6 +18,7 @@ setuptools.setup(
     packages=['quac_qiskit', 'quac_qiskit.simulators', 'quac_qiskit.optimization', 'quac_qiskit.models',
               'quac_qiskit.stat', 'quac_qiskit.format'],
     install_requires=requirements,
+    extras_require={"mpi": ["mpi4py>=3.0.0"]},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
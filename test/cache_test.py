@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains test cases for ensuring caching of compiled experiments and simulation results
+is working properly in the library.
+"""
+import os
+import tempfile
+import types
+import unittest
+from unittest import mock
+import numpy as np
+from qiskit import QuantumCircuit, execute
+from quac_qiskit import Quac
+from quac_qiskit.models import QuacNoiseModel
+from quac_qiskit.simulators import LRUCache, ResultCache
+from quac_qiskit.simulators.cache import instructions_key
+
+
+class CacheTestCase(unittest.TestCase):
+    """Tests that repeated simulations reuse scheduled and translated experiments and simulated results
+    """
+
+    def setUp(self):
+        # Set up QuaC simulator
+        self.quac_sim = Quac.get_backend("fake_yorktown_density_simulator", t1=True, t2=True, meas=False, zz=False)
+
+    def test_lru_cache(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)  # "b" is now least recently used
+        cache.put("c", 3)
+
+        self.assertNotIn("b", cache)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "size": 2, "max_size": 2})
+
+    def test_compiled_cache(self):
+        circuit = QuantumCircuit(2)
+        circuit.x(0)
+        circuit.cx(0, 1)
+        circuit.measure_all()
+
+        self.quac_sim.clear_compiled_cache()
+        for t1 in [1000, 2000, 3000]:
+            noise_model = QuacNoiseModel([t1 for _ in range(5)], [2 * t1 for _ in range(5)])
+            execute(circuit, self.quac_sim, optimization_level=0, quac_noise_model=noise_model).result()
+
+        self.assertEqual(self.quac_sim.compiled_cache_stats()["misses"], 1)
+        self.assertEqual(self.quac_sim.compiled_cache_stats()["hits"], 2)
+
+    def test_result_cache(self):
+        circuit = QuantumCircuit(2)
+        circuit.x(0)
+        circuit.cx(0, 1)
+        circuit.measure_all()
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            result_cache = ResultCache(cache_dir)
+            first_counts = execute(circuit, self.quac_sim, optimization_level=0,
+                                   result_cache=result_cache).result().get_counts()
+            second_counts = execute(circuit, self.quac_sim, optimization_level=0,
+                                    result_cache=result_cache).result().get_counts()
+            self.assertEqual(first_counts, second_counts)
+            self.assertEqual(result_cache.stats()["memory_hits"], 1)
+
+            # A fresh cache on the same directory finds the outcome on disk
+            disk_cache = ResultCache(cache_dir)
+            third_counts = execute(circuit, self.quac_sim, optimization_level=0,
+                                   result_cache=disk_cache).result().get_counts()
+            self.assertEqual(first_counts, third_counts)
+            self.assertEqual(disk_cache.stats()["disk_hits"], 1)
+
+            # The counts backend samples from the cached probabilities
+            counts_sim = Quac.get_backend("fake_yorktown_counts_simulator", t1=True, t2=True, meas=False, zz=False)
+            execute(circuit, counts_sim, optimization_level=0, result_cache=result_cache).result()
+            self.assertEqual(result_cache.stats()["memory_hits"], 2)
+
+    def test_result_cache_options(self):
+        circuit = QuantumCircuit(2)
+        circuit.x(0)
+        circuit.cx(0, 1)
+        circuit.measure_all()
+
+        # Options that change the simulated probabilities get entries of their own
+        result_cache = ResultCache()
+        for closed_form_idle in [True, False, True]:
+            execute(circuit, self.quac_sim, optimization_level=0, engine="numpy", closed_form_idle=closed_form_idle,
+                    result_cache=result_cache).result()
+        self.assertEqual(result_cache.stats()["misses"], 2)
+        self.assertEqual(result_cache.stats()["memory_hits"], 1)
+
+    def test_sweep_result_cache(self):
+        circuit = QuantumCircuit(2)
+        circuit.x(0)
+        circuit.cx(0, 1)
+        circuit.measure_all()
+        noise_models = [QuacNoiseModel([t1 for _ in range(5)], [2 * t1 for _ in range(5)]) for t1 in [1000, 2000]]
+
+        # Outcomes simulated in worker processes are stored in this process's cache
+        result_cache = ResultCache()
+        first_probs = self.quac_sim.run_sweep(circuit, noise_models, result_cache=result_cache,
+                                              max_parallel_experiments=2)
+        self.assertEqual(result_cache.stats()["memory_size"], 2)
+
+        second_probs = self.quac_sim.run_sweep(circuit, noise_models, result_cache=result_cache,
+                                               max_parallel_experiments=2)
+        self.assertEqual(result_cache.stats()["memory_hits"], 2)
+        self.assertTrue(np.allclose(first_probs, second_probs))
+
+    def test_disk_size_tracking(self):
+        outcome = {"qubit_measurements": {0: [0]}, "measured_qubits": [0], "probabilities": np.array([0.25, 0.75])}
+        with tempfile.TemporaryDirectory() as cache_dir:
+            result_cache = ResultCache(cache_dir, max_disk_bytes=2 ** 20)
+
+            # Writes below the size limit neither list nor scan the directory
+            with mock.patch("os.listdir", wraps=os.listdir) as listdir:
+                for index in range(20):
+                    result_cache.put(str(index), outcome)
+                    result_cache.put(str(index), outcome)  # overwriting does not count twice
+                self.assertEqual(result_cache.stats()["disk_bytes"], sum(
+                    os.path.getsize(os.path.join(cache_dir, name)) for name in os.listdir(cache_dir)))
+            self.assertEqual(listdir.call_count, 1)
+
+            # Reopening the directory picks up its size, and going over the limit evicts old files
+            file_bytes = result_cache.stats()["disk_bytes"] // 20
+            small_cache = ResultCache(cache_dir, max_disk_bytes=5 * file_bytes)
+            self.assertEqual(small_cache.stats()["disk_bytes"], 20 * file_bytes)
+            small_cache.put("new", outcome)
+            self.assertLessEqual(small_cache.stats()["disk_bytes"], 5 * file_bytes)
+            self.assertEqual(len(os.listdir(cache_dir)), small_cache.stats()["disk_bytes"] // file_bytes)
+
+    def test_instructions_key_params(self):
+        instruction = types.SimpleNamespace(name="unitary", qubits=[0], params=[np.eye(2), "label", 0.5])
+        qexp = types.SimpleNamespace(config=types.SimpleNamespace(n_qubits=1), instructions=[instruction])
+
+        key = instructions_key(qexp)
+        self.assertEqual(hash(key), hash(instructions_key(qexp)))
+        self.assertEqual(key[1][0][2][1:], ("'label'", 0.5))
+
+    def test_duplicate_experiments(self):
+        circuits = []
+        for name in ["first", "second"]:
+            circuit = QuantumCircuit(2, name=name)
+            circuit.h(0)
+            circuit.cx(0, 1)
+            circuit.measure_all()
+            circuits.append(circuit)
+
+        density_result = execute(circuits, self.quac_sim, optimization_level=0).result()
+        self.assertEqual(density_result.get_counts("first"), density_result.get_counts("second"))
+
+        # Duplicates share a distribution but are sampled independently
+        counts_sim = Quac.get_backend("fake_yorktown_counts_simulator", t1=True, t2=True, meas=False, zz=False)
+        counts_result = execute(circuits, counts_sim, optimization_level=0, shots=10000).result()
+        self.assertEqual(sum(counts_result.get_counts("first").values()), 10000)
+        self.assertEqual(sum(counts_result.get_counts("second").values()), 10000)
+        self.assertNotEqual(counts_result.get_counts("first"), counts_result.get_counts("second"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains test cases for ensuring gate fusion reduces gate events without changing
+simulation outcomes
+"""
+import unittest
+from unittest import mock
+import numpy as np
+from qiskit import QuantumCircuit, assemble, execute, transpile
+from quac_qiskit import Quac
+from quac_qiskit.simulators import CompiledExperiment, compile_experiment, fuse_gates, build_quac_circuit
+
+
+class FusionTestCase(unittest.TestCase):
+    """Tests single-qubit gate fusion and two-qubit gate consolidation
+    """
+
+    def setUp(self):
+        # Set up QuaC simulator
+        self.quac_sim = Quac.get_backend("fake_yorktown_density_simulator", t1=True, t2=True, meas=False, zz=True)
+
+    def test_fused_gate_count(self):
+        compiled_experiment = CompiledExperiment((
+            ("h", {"qubit1": 0, "time": 10}),
+            ("t", {"qubit1": 0, "time": 10}),
+            ("cnot", {"qubit1": 0, "qubit2": 1, "time": 20}),
+            ("cnot", {"qubit1": 0, "qubit2": 1, "time": 20}),
+            ("x", {"qubit1": 1, "time": 30}),
+            ("x", {"qubit1": 1, "time": 30}),
+            ("cz", {"qubit1": 0, "qubit2": 1, "time": 40})
+        ), {0: [0], 1: [1]}, 50, 2)
+
+        fused_experiment = fuse_gates(compiled_experiment)
+        self.assertEqual([gate for gate, _ in fused_experiment.gates], ["u3", "cz"])
+
+        # Gates further apart than the fusion window are left alone
+        self.assertEqual(len(fuse_gates(compiled_experiment._replace(gates=(
+            ("h", {"qubit1": 0, "time": 10}),
+            ("h", {"qubit1": 0, "time": 20})
+        ))).gates), 2)
+
+    def test_consolidated_blocks(self):
+        # H on the target before and after a CNOT is a CZ
+        compiled_experiment = CompiledExperiment((
+            ("h", {"qubit1": 1, "time": 10}),
+            ("cnot", {"qubit1": 0, "qubit2": 1, "time": 10}),
+            ("h", {"qubit1": 1, "time": 10})
+        ), {0: [0], 1: [1]}, 50, 2)
+        self.assertEqual(fuse_gates(compiled_experiment).gates, (("cz", {"qubit1": 0, "qubit2": 1, "time": 10}),))
+
+        # Entangling blocks that need more than one CNOT are left alone
+        swap_gates = (
+            ("cnot", {"qubit1": 0, "qubit2": 1, "time": 10}),
+            ("cnot", {"qubit1": 1, "qubit2": 0, "time": 10}),
+            ("cnot", {"qubit1": 0, "qubit2": 1, "time": 10})
+        )
+        self.assertEqual(fuse_gates(compiled_experiment._replace(gates=swap_gates)).gates, swap_gates)
+
+        # Gates without a known matrix pass through and end runs and blocks on their qubits
+        fused_experiment = fuse_gates(compiled_experiment._replace(gates=(
+            ("h", {"qubit1": 1, "time": 10}),
+            ("czx", {"qubit1": 1, "time": 10}),
+            ("h", {"qubit1": 1, "time": 10}),
+            ("cnot", {"qubit1": 0, "qubit2": 1, "time": 10})
+        )))
+        self.assertEqual([gate for gate, _ in fused_experiment.gates], ["h", "czx", "h", "cnot"])
+
+    def test_quac_circuit_gates(self):
+        compiled_experiment = CompiledExperiment((
+            ("u3", {"qubit1": 0, "time": 10, "theta": 0.3, "phi": 0.2, "lam": 0.1}),
+            ("h", {"qubit1": 0, "time": 10}),
+            ("h", {"qubit1": 1, "time": 10}),
+            ("cnot", {"qubit1": 0, "qubit2": 1, "time": 10}),
+            ("h", {"qubit1": 1, "time": 10}),
+            ("rz", {"qubit1": 1, "time": 10, "theta": 0.4}),
+            ("czx", {"qubit1": 1, "time": 20})
+        ), {0: [0], 1: [1]}, 50, 2)
+
+        with mock.patch("quac_qiskit.simulators.translate.quac.Circuit") as quac_circuit:
+            build_quac_circuit(fuse_gates(compiled_experiment))
+
+        # QuaC receives only gates it supports, with the keyword arguments it expects
+        gate_calls = [call.kwargs for call in quac_circuit.return_value.add_gate.call_args_list]
+        quac_circuit.return_value.initialize.assert_called_once_with(len(gate_calls))
+        self.assertEqual(gate_calls[-1], {"gate": "czx", "qubit1": 1, "time": 20})
+        for gate_call in gate_calls[:-1]:
+            if gate_call["gate"] == "u3":
+                self.assertEqual(set(gate_call), {"gate", "qubit1", "time", "theta", "phi", "lam"})
+                self.assertTrue(all(isinstance(gate_call[param], float) for param in ["theta", "phi", "lam"]))
+            else:
+                self.assertIn(gate_call["gate"], ["cnot", "cz"])
+                self.assertEqual(set(gate_call), {"gate", "qubit1", "qubit2", "time"})
+            self.assertEqual(gate_call["time"], 10)
+        self.assertLess(len(gate_calls), len(compiled_experiment.gates))
+
+    def test_scheduled_fusion(self):
+        circuit = QuantumCircuit(2, 2)
+        circuit.h(0)
+        circuit.t(0)
+        circuit.s(0)
+        circuit.h(0)
+        circuit.cx(0, 1)
+        circuit.h(1)
+        circuit.t(1)
+        circuit.measure([0, 1], [0, 1])
+
+        # The scheduler places gates back to back, which is enough to fuse them by default
+        qobj = assemble(transpile(circuit, self.quac_sim, optimization_level=0), backend=self.quac_sim)
+        compiled_experiment = compile_experiment(qobj.experiments[0], self.quac_sim.properties())
+        fused_experiment = fuse_gates(compiled_experiment)
+        self.assertLess(len(fused_experiment.gates), len(compiled_experiment.gates))
+        self.assertEqual(len(fused_experiment.gate_lengths), len(fused_experiment.gates))
+
+        # Fused gates only move by the lengths of the gates merged into them
+        unfused_probs = execute(circuit, self.quac_sim, optimization_level=0, engine="numpy",
+                                result_type="probabilities").result().data(0)["probabilities"]
+        fused_probs = execute(circuit, self.quac_sim, optimization_level=0, engine="numpy", fuse_gates=True,
+                              result_type="probabilities").result().data(0)["probabilities"]
+        self.assertTrue(np.allclose(unfused_probs, fused_probs, atol=1e-2))
+
+    def test_exact_fusion(self):
+        circuit = QuantumCircuit(2, 2)
+        circuit.u3(0.3, 0.2, 0.1, 0)
+        circuit.u2(0.4, 0.5, 0)
+        circuit.cx(0, 1)
+        circuit.cx(0, 1)
+        circuit.cx(1, 0)
+        circuit.u3(1.2, 0.1, 0.3, 1)
+        circuit.measure([0, 1], [0, 1])
+        gate_times = [100, 100, 500, 500, 500, 900, 1000, 1000]
+
+        unfused_probs = execute(circuit, self.quac_sim, optimization_level=0, engine="numpy", gate_times=gate_times,
+                                result_type="probabilities").result().data(0)["probabilities"]
+        fused_probs = execute(circuit, self.quac_sim, optimization_level=0, engine="numpy", gate_times=gate_times,
+                              fuse_gates=True, result_type="probabilities").result().data(0)["probabilities"]
+
+        self.assertTrue(np.allclose(unfused_probs, fused_probs))
+
+
+if __name__ == '__main__':
+    unittest.main()
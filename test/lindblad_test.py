@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains test cases for ensuring the NumPy Lindblad engine is working properly in the
+library.
+"""
+import random
+import time
+import unittest
+import numpy as np
+from qiskit import QuantumCircuit, execute, transpile
+from qiskit.circuit.random import random_circuit
+from qiskit.ignis.characterization import t1_circuits
+from qiskit.test.mock import FakeYorktown
+from quac_qiskit import Quac
+from quac_qiskit.format import counts_to_list
+from quac_qiskit.models import QuacNoiseModel
+from quac_qiskit.simulators import CompiledExperiment, LindbladEngine
+
+
+class LindbladTestCase(unittest.TestCase):
+    """Tests the NumPy engine against QuaC and prefix sharing against independent simulations
+    """
+
+    def setUp(self):
+        # Set up QuaC simulator
+        self.quac_sim = Quac.get_backend("fake_yorktown_density_simulator", t1=True, t2=True, meas=False, zz=True)
+
+    def test_engine_matches_quac(self):
+        for _ in range(5):
+            circuit = transpile(random_circuit(3, 3, measure=False), self.quac_sim)
+            circuit.measure_all()
+
+            quac_probs = counts_to_list(execute(circuit, self.quac_sim, optimization_level=0).result().get_counts())
+            numpy_probs = counts_to_list(execute(circuit, self.quac_sim, optimization_level=0,
+                                                 engine="numpy").result().get_counts())
+            self.assertLess(np.abs(np.array(quac_probs) - np.array(numpy_probs)).max(), 1e-3)
+
+    def test_prefix_sharing(self):
+        cal_circs, _ = t1_circuits(np.linspace(10, 900, 10, dtype='int'),
+                                   FakeYorktown().properties().gate_length('id', [0]) * 1e9,
+                                   [0, 1, 2, 3, 4])
+        t1_noise_model = QuacNoiseModel([1000 * (1 + random.random()) for _ in range(5)],
+                                        [float('inf') for _ in range(5)])
+
+        independent_result = execute(cal_circs, self.quac_sim, quac_noise_model=t1_noise_model,
+                                     engine="numpy").result()
+        shared_result = execute(cal_circs, self.quac_sim, quac_noise_model=t1_noise_model,
+                                engine="numpy", share_prefixes=True).result()
+
+        for circuit in cal_circs:
+            independent_probs = counts_to_list(independent_result.get_counts(circuit))
+            shared_probs = counts_to_list(shared_result.get_counts(circuit))
+            self.assertTrue(np.allclose(independent_probs, shared_probs))
+
+    def test_closed_form_idle(self):
+        circuit = QuantumCircuit(2, 2)
+        circuit.x(0)
+        circuit.h(1)
+        circuit.barrier()
+        circuit.h(1)
+        circuit.measure([0, 1], [0, 1])
+
+        noise_model = QuacNoiseModel([1000, 1500, 1000, 1000, 1000], [1200, 800, 1000, 1000, 1000])
+        stepped_probs = execute(circuit, self.quac_sim, quac_noise_model=noise_model, engine="numpy", dt=1,
+                                simulation_length=20000, closed_form_idle=False,
+                                result_type="probabilities").result().data(0)["probabilities"]
+        exact_probs = execute(circuit, self.quac_sim, quac_noise_model=noise_model, engine="numpy",
+                              simulation_length=20000, result_type="probabilities").result().data(0)["probabilities"]
+
+        self.assertTrue(np.allclose(stepped_probs, exact_probs, atol=1e-8))
+
+    def test_adaptive_stepping(self):
+        circuit = transpile(random_circuit(3, 3, measure=False), self.quac_sim)
+        circuit.measure_all()
+
+        stepped_result = execute(circuit, self.quac_sim, optimization_level=0, engine="numpy", dt=1,
+                                 result_type="probabilities").result()
+        adaptive_result = execute(circuit, self.quac_sim, optimization_level=0, engine="numpy", atol=1e-9,
+                                  rtol=1e-9, result_type="probabilities").result()
+
+        self.assertTrue(np.allclose(stepped_result.data(0)["probabilities"],
+                                    adaptive_result.data(0)["probabilities"], atol=1e-6))
+        self.assertIn("steps_taken", adaptive_result.results[0].metadata)
+        self.assertIn("steps_rejected", adaptive_result.results[0].metadata)
+
+    def test_exponential_solver(self):
+        circuit = transpile(random_circuit(3, 3, measure=False), self.quac_sim)
+        circuit.measure_all()
+
+        stepped_result = execute(circuit, self.quac_sim, optimization_level=0, engine="numpy", dt=1,
+                                 result_type="probabilities").result()
+        exact_result = execute(circuit, self.quac_sim, optimization_level=0, engine="numpy", solver="expm",
+                               result_type="probabilities").result()
+
+        self.assertTrue(np.allclose(stepped_result.data(0)["probabilities"],
+                                    exact_result.data(0)["probabilities"], atol=1e-6))
+        self.assertEqual(exact_result.header.to_dict()["solver"]["solver"], "expm")
+
+    def test_propagator_reuse(self):
+        cal_circs, _ = t1_circuits(np.linspace(10, 900, 10, dtype='int'),
+                                   FakeYorktown().properties().gate_length('id', [0]) * 1e9,
+                                   [0, 1])
+
+        # Without ZZ coupling, every qubit is simulated on its own and long stretches pay off
+        noise_model = QuacNoiseModel([1000, 1500, 1000, 1000, 1000], [1200, 800, 1000, 1000, 1000])
+        stepped_result = execute(cal_circs, self.quac_sim, quac_noise_model=noise_model, engine="numpy").result()
+        powered_result = execute(cal_circs, self.quac_sim, quac_noise_model=noise_model, engine="numpy",
+                                 reuse_propagators=True).result()
+
+        for circuit in cal_circs:
+            stepped_probs = counts_to_list(stepped_result.get_counts(circuit))
+            powered_probs = counts_to_list(powered_result.get_counts(circuit))
+            self.assertTrue(np.allclose(stepped_probs, powered_probs))
+
+        # Propagators are reported apart from integrator steps
+        self.assertEqual(stepped_result.results[-1].metadata["propagator_builds"], 0)
+        self.assertGreaterEqual(powered_result.results[-1].metadata["propagator_builds"], 1)
+        self.assertGreaterEqual(powered_result.results[-1].metadata["propagator_applications"], 1)
+
+    def test_propagator_reuse_is_not_slower(self):
+        for n_qubits, repeats in [(5, 8), (4, 30), (3, 8), (1, 300)]:
+            # Idle gates on a chain of ZZ coupled qubits
+            gates = [("x", {"qubit1": 0, "time": 1})] + [("i", {"qubit1": qubit, "time": 1 + 35.5 * layer})
+                                                         for layer in range(1, repeats + 1)
+                                                         for qubit in range(n_qubits)]
+            compiled_experiment = CompiledExperiment(tuple(gates), {0: [0]}, 40 * (repeats + 1), n_qubits)
+            noise_model = QuacNoiseModel([1000] * n_qubits, [1500] * n_qubits,
+                                         zz={(qubit, qubit + 1): 1e-3 for qubit in range(n_qubits - 1)} or None)
+
+            timings = []
+            final_states = []
+            for reuse_propagators in [False, True]:
+                engine = LindbladEngine(n_qubits, noise_model, reuse_propagators=reuse_propagators)
+                start = time.perf_counter()
+                final_states.append(engine.run(compiled_experiment))
+                timings.append(time.perf_counter() - start)
+
+            # Short stretches on several qubits are integrated directly rather than propagated
+            self.assertTrue(np.allclose(final_states[0], final_states[1]))
+            self.assertLessEqual(timings[1], 1.5 * timings[0] + 0.01)
+
+    def test_snapshots(self):
+        circuit = QuantumCircuit(1, 1)
+        circuit.x(0)
+        circuit.measure(0, 0)
+
+        true_t1 = [1000 * (1 + random.random()) for _ in range(5)]
+        t1_noise_model = QuacNoiseModel(true_t1, [float('inf') for _ in range(5)])
+        snapshot_times = np.linspace(100, 900, 9)
+
+        result = execute(circuit, self.quac_sim, quac_noise_model=t1_noise_model, engine="numpy",
+                         simulation_length=900, snapshot_times=snapshot_times).result()
+        snapshots = result.data(0)["snapshot_probabilities"]
+
+        # The excited population decays from the moment the gate is applied (the scheduler starts at 1 ns)
+        gate_time = 1
+        self.assertEqual(snapshots.shape[0], len(snapshot_times))
+        self.assertTrue(np.allclose(snapshots[:, 1], np.exp(-(snapshot_times - gate_time) / true_t1[0]), atol=1e-6))
+
+
+if __name__ == '__main__':
+    unittest.main()
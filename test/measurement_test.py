@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains test cases for ensuring measurement post-processing is working properly
+in the library.
+"""
+import unittest
+import numpy as np
+from quac_qiskit.models import QuacNoiseModel
+from quac_qiskit.exceptions import QuacOptionsError
+from quac_qiskit.simulators import classical_register_values, classical_register_table, \
+    apply_readout_error, marginalize_probabilities, apply_meas_matrices, significant_outcomes
+
+
+class MeasurementTestCase(unittest.TestCase):
+    """Tests vectorized measurement helpers against straightforward per-state computations
+    """
+
+    def setUp(self):
+        self.rng = np.random.default_rng(1234)
+        self.meas_mats = []
+        for _ in range(4):
+            stay_zero, stay_one = self.rng.random(2)
+            self.meas_mats.append(np.array([
+                [stay_zero, 1 - stay_one],
+                [1 - stay_zero, stay_one]
+            ]))
+        self.noise_model = QuacNoiseModel([float('inf')] * 4, [float('inf')] * 4, self.meas_mats)
+
+    def test_classical_register_values(self):
+        # Qubit 0 is measured into slot 1 and qubit 2 into slot 0
+        registers = classical_register_values(np.arange(8), {0: [1], 2: [0]}, [0, 1, 2])
+        self.assertEqual(registers.tolist(), [0, 1, 0, 1, 2, 3, 2, 3])
+
+        # Tables are built over the measured qubits only, and one qubit may fill several slots
+        register_table = classical_register_table({1: [0, 2], 3: [1]}, [1, 3])
+        self.assertEqual(register_table.tolist(), [0, 2, 5, 7])
+
+    def test_wide_classical_registers(self):
+        # Slots 62 and 63 fill the top bits of an unsigned 64-bit register without wrapping around
+        registers = classical_register_values(np.arange(4), {0: [63], 1: [62]}, [0, 1])
+        self.assertEqual(registers.dtype, np.uint64)
+        self.assertEqual([int(register) for register in registers], [0, 2 ** 62, 2 ** 63, 2 ** 63 + 2 ** 62])
+
+        with self.assertRaises(QuacOptionsError):
+            classical_register_values(np.arange(2), {0: [64]}, [0])
+
+    def test_marginalize_probabilities(self):
+        probs = self.rng.random(16)
+        probs /= probs.sum()
+
+        expected_probs = np.zeros(4)
+        for state, prob in enumerate(probs):
+            bits = [(state >> (3 - qubit)) & 1 for qubit in range(4)]
+            expected_probs[2 * bits[1] + bits[3]] += prob
+
+        self.assertTrue(np.allclose(marginalize_probabilities(probs, [1, 3], 4), expected_probs))
+        self.assertTrue(np.allclose(marginalize_probabilities(probs, [3, 1], 4),
+                                    expected_probs.reshape(2, 2).T.reshape(-1)))
+
+    def test_apply_meas_matrices(self):
+        probs = self.rng.random(16)
+        probs /= probs.sum()
+
+        full_meas_matrix = np.array([[1]])
+        for meas_matrix in self.meas_mats:
+            full_meas_matrix = np.kron(full_meas_matrix, meas_matrix)
+
+        self.assertTrue(np.allclose(apply_meas_matrices(probs, [0, 1, 2, 3], self.noise_model),
+                                    full_meas_matrix.dot(probs)))
+
+    def test_apply_readout_error(self):
+        shots = 100000
+        states = np.array([0] * shots + [2] * shots)  # qubit 0 is the most significant bit
+        noisy_states = apply_readout_error(states, [0, 1], self.noise_model, self.rng)
+
+        self.assertAlmostEqual((noisy_states[:shots] & 2 > 0).mean(), self.meas_mats[0][1][0], 2)
+        self.assertAlmostEqual((noisy_states[shots:] & 2 == 0).mean(), self.meas_mats[0][0][1], 2)
+        self.assertAlmostEqual((noisy_states & 1 > 0).mean(), self.meas_mats[1][1][0], 2)
+
+    def test_significant_outcomes(self):
+        probs = np.array([0.1, 0, 0.4, 0.2, 0.3])
+
+        self.assertEqual(significant_outcomes(probs).tolist(), [0, 1, 2, 3, 4])
+        self.assertEqual(significant_outcomes(probs, prob_threshold=0).tolist(), [0, 2, 3, 4])
+        self.assertEqual(significant_outcomes(probs, prob_threshold=0.15).tolist(), [2, 3, 4])
+        self.assertEqual(significant_outcomes(probs, top_k=2).tolist(), [2, 4])
+        self.assertEqual(significant_outcomes(probs, prob_threshold=0.25, top_k=3).tolist(), [2, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains test cases for ensuring per-shot memory is working properly in the library.
+"""
+import json
+import unittest
+import numpy as np
+from qiskit import execute, QuantumCircuit
+from qiskit.result import Result
+from quac_qiskit import Quac
+from quac_qiskit.models import PackedMemory
+from quac_qiskit.exceptions import QuacOptionsError
+
+
+class MemoryTestCase(unittest.TestCase):
+    """Tests per-shot memory output of the counts backend
+    """
+
+    def setUp(self):
+        # Set up QuaC simulator
+        self.quac_sim = Quac.get_backend("fake_yorktown_counts_simulator")
+
+    def test_packed_memory(self):
+        memory = PackedMemory(np.array([0, 3, 255, 3]), 8)
+
+        self.assertEqual(memory.registers.dtype, np.uint8)
+        self.assertEqual(len(memory), 4)
+        self.assertEqual(memory[1], "0x3")
+        self.assertEqual(memory[1:3].to_list(), ["0x3", "0xff"])
+        self.assertEqual(memory, ["0x0", "0x3", "0xff", "0x3"])
+
+        self.assertEqual(PackedMemory.register_dtype(9), np.uint16)
+        self.assertEqual(PackedMemory.register_dtype(32), np.uint32)
+        self.assertEqual(PackedMemory.register_dtype(33), np.uint64)
+        self.assertEqual(PackedMemory.register_dtype(63), np.uint64)
+        self.assertEqual(PackedMemory.register_dtype(64), np.uint64)
+        with self.assertRaises(QuacOptionsError):
+            PackedMemory.register_dtype(65)
+
+        wide_memory = PackedMemory(np.array([2 ** 63 + 1], dtype=np.uint64), 64)
+        self.assertEqual(wide_memory[0], hex(2 ** 63 + 1))
+
+    def test_counts_memory(self):
+        test_circuit = QuantumCircuit(2)
+        test_circuit.h(0)
+        test_circuit.cx(0, 1)
+        test_circuit.measure_all()
+
+        result = execute(test_circuit, self.quac_sim, shots=1000, memory=True).result()
+        memory = result.get_memory(test_circuit)
+        counts = result.get_counts(test_circuit)
+
+        self.assertEqual(len(memory), 1000)
+        self.assertEqual(set(memory), set(counts.keys()))
+        for outcome, frequency in counts.items():
+            self.assertEqual(memory.count(outcome), frequency)
+
+    def test_memory_serialization(self):
+        test_circuit = QuantumCircuit(2)
+        test_circuit.h(0)
+        test_circuit.cx(0, 1)
+        test_circuit.measure_all()
+
+        result = execute(test_circuit, self.quac_sim, shots=100, memory=True).result()
+        self.assertIsInstance(result.data(0)["memory"], PackedMemory)
+
+        result_dict = json.loads(json.dumps(result.to_dict()))
+        self.assertEqual(result_dict["results"][0]["data"]["memory"], result.data(0)["memory"].to_list())
+        self.assertIsInstance(result.data(0)["memory"], PackedMemory)
+
+        loaded_result = Result.from_dict(result_dict)
+        self.assertEqual(loaded_result.get_memory(0), result.get_memory(0))
+        self.assertEqual(loaded_result.get_counts(0), result.get_counts(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -116,6 +116,108 @@ class NoiseModelTestCase(unittest.TestCase):
         max_diff = max([(meas_matrices[ind] - meas_mats[ind]).max() for ind in qubits])
         self.assertLess(max_diff, 1e-10)
 
+    def test_flip_prob(self):
+        meas_noise_model = QuacNoiseModel(
+            [float('inf')],
+            [float('inf')],
+            [np.array([[0.9, 0.3], [0.1, 0.7]])]
+        )
+
+        self.assertEqual(meas_noise_model.flip_prob(0, 0, 1), 0.1)
+        self.assertEqual(meas_noise_model.flip_prob(0, 1, 0), 0.3)
+        self.assertEqual(meas_noise_model.flip_prob(0, 1, 1), 0.7)
+
+    def test_noise_model_key(self):
+        meas_noise_model = QuacNoiseModel([1000, 2000], [3000, 4000], [np.eye(2), np.eye(2)], {(0, 1): 1e-5})
+        other_meas_noise_model = QuacNoiseModel([1000, 2000], [3000, 4000],
+                                                [np.array([[0.9, 0.3], [0.1, 0.7]]), np.eye(2)], {(0, 1): 1e-5})
+
+        self.assertNotEqual(meas_noise_model.key(), other_meas_noise_model.key())
+        self.assertEqual(meas_noise_model.key(include_meas=False), other_meas_noise_model.key(include_meas=False))
+        self.assertIsInstance(hash(meas_noise_model.key()), int)
+
+    def test_noise_model_restriction(self):
+        noise_model = QuacNoiseModel([1000, 2000, 3000], [1500, 2500, 3500], None, {(0, 1): 1e-5, (0, 2): 2e-5})
+        restricted_noise_model = noise_model.restrict([0, 2])
+
+        self.assertEqual(restricted_noise_model.t1(1), 3000)
+        self.assertEqual(restricted_noise_model.t2(1), 3500)
+        self.assertEqual(restricted_noise_model.zz(), [(0, 1)])
+        self.assertEqual(restricted_noise_model.zz(0, 1), 2e-5)
+
+    def test_idle_qubit_pruning(self):
+        quac_sim = Quac.get_backend("fake_melbourne_density_simulator", t1=True, t2=True, meas=True, zz=False)
+        circuit = QuantumCircuit(2, 2)
+        circuit.h(0)
+        circuit.cx(0, 1)
+        circuit.measure([0, 1], [0, 1])
+
+        # Only the two entangled qubits are simulated, so this runs on a 14-qubit backend
+        probs = execute(circuit, quac_sim, optimization_level=0,
+                        result_type="probabilities").result().data(0)["probabilities"]
+        self.assertAlmostEqual(float(np.sum(probs)), 1)
+        self.assertGreater(probs[0] + probs[3], 0.8)
+
+    def test_independent_clusters(self):
+        quac_sim = Quac.get_backend("fake_yorktown_density_simulator", t1=True, t2=True, meas=False, zz=False)
+        circuit = QuantumCircuit(5, 5)
+        circuit.x(0)
+        circuit.h(1)
+        circuit.cx(1, 2)
+        circuit.h(3)
+        circuit.ry(0.4, 4)
+        circuit.measure([4, 0, 2, 1, 3], [0, 1, 2, 3, 4])
+
+        # Four independent clusters are simulated separately and combined as a product
+        split_result = execute(circuit, quac_sim, optimization_level=0, result_type="probabilities").result()
+        joint_probs = execute(circuit, quac_sim, optimization_level=0, split_clusters=False,
+                              result_type="probabilities").result().data(0)["probabilities"]
+
+        self.assertEqual(split_result.results[0].metadata["clusters"], 4)
+        self.assertTrue(np.allclose(split_result.data(0)["probabilities"], joint_probs))
+
+    def test_counts_meas_recovery(self):
+        qubits = list(range(5))
+        counts_sim = Quac.get_backend("fake_yorktown_counts_simulator", t1=False, t2=False, meas=False, zz=False)
+
+        meas_mats = []
+        for _ in qubits:
+            stay_zero = random.random()
+            stay_one = random.random()
+            meas_mats.append(
+                np.array([
+                    [stay_zero, 1 - stay_one],
+                    [1 - stay_zero, stay_one]
+                ])
+            )
+
+        meas_noise_model = QuacNoiseModel(
+            [float('inf') for _ in qubits],
+            [float('inf') for _ in qubits],
+            meas_mats
+        )
+
+        empty_circ = QuantumCircuit(len(qubits))
+        for i in qubits:
+            empty_circ.id(i)
+        empty_circ.measure_all()
+        empty_circ.name = f"cal_{''.join(['0' for _ in qubits])}"
+
+        full_circ = QuantumCircuit(len(qubits))
+        for i in qubits:
+            full_circ.x(i)
+        full_circ.measure_all()
+        full_circ.name = f"cal_{''.join(['1' for _ in qubits])}"
+
+        # Sampled readout errors should converge to the measurement matrices
+        meas_result = execute([empty_circ, full_circ], counts_sim, shots=100000,
+                              quac_noise_model=meas_noise_model).result()
+        meas_fit = TensoredMeasFitter(meas_result, [[i] for i in qubits])
+        meas_matrices = meas_fit.cal_matrices
+
+        max_diff = max([abs(meas_matrices[ind] - meas_mats[ind]).max() for ind in qubits])
+        self.assertLess(max_diff, 1e-2)
+
     def test_zz_recovery(self):
         qubits = list(range(5))
         num_of_gates = np.arange(0, 600, 30)
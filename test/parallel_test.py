@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains test cases for ensuring parallel experiment execution is working properly
+in the library.
+"""
+import types
+import unittest
+from unittest import mock
+import numpy as np
+from qiskit import execute, transpile
+from qiskit.circuit.random import random_circuit
+from quac_qiskit import Quac
+from quac_qiskit.exceptions import QuacOptionsError, QuacBackendError
+from quac_qiskit.format import counts_to_list
+from quac_qiskit.models import QuacNoiseModel
+from quac_qiskit.simulators import ResultCache
+from quac_qiskit.simulators.parallel import simulate_across_mpi_ranks
+
+
+class FakeRankBackend:
+    """Stands in for a backend on one MPI rank, recording which experiments it simulates
+    """
+
+    def __init__(self, failing_experiment=None):
+        self.simulated = []
+        self.failing_experiment = failing_experiment
+
+    def _simulate_experiment(self, experiment, **run_config):
+        if experiment == self.failing_experiment:
+            raise ValueError(f"cannot simulate {experiment}")
+        self.simulated.append(experiment)
+        return {"experiment": experiment}
+
+
+class FakeComm:
+    """Stands in for MPI.COMM_WORLD as seen from one rank, with the payloads of all other ranks given
+    """
+
+    def __init__(self, rank, size, peer_payloads=None, root_payload=None):
+        self.rank = rank
+        self.size = size
+        self.peer_payloads = peer_payloads or {}
+        self.root_payload = root_payload
+
+    def Get_rank(self):  # pylint: disable=invalid-name
+        return self.rank
+
+    def Get_size(self):  # pylint: disable=invalid-name
+        return self.size
+
+    def allgather(self, payload):
+        return [payload if rank == self.rank else self.peer_payloads[rank] for rank in range(self.size)]
+
+    def bcast(self, payload, root=0):
+        return payload if self.rank == root else self.root_payload
+
+
+def fake_mpi4py(comm):
+    """Builds a stand-in mpi4py module whose COMM_WORLD is comm
+    """
+    return {"mpi4py": types.SimpleNamespace(MPI=types.SimpleNamespace(COMM_WORLD=comm))}
+
+
+class ParallelTestCase(unittest.TestCase):
+    """Tests that experiments simulated in worker processes match serially simulated ones
+    """
+
+    def setUp(self):
+        # Set up QuaC simulator
+        self.quac_sim = Quac.get_backend("fake_yorktown_density_simulator", t1=True, t2=True, meas=True, zz=False)
+
+    def test_parallel_experiments(self):
+        circuits = []
+        for _ in range(6):
+            circuit = transpile(random_circuit(3, 3, measure=False), self.quac_sim)
+            circuit.measure_all()
+            circuits.append(circuit)
+
+        serial_result = execute(circuits, self.quac_sim, optimization_level=0).result()
+        parallel_result = execute(circuits, self.quac_sim, optimization_level=0,
+                                  max_parallel_experiments=3).result()
+
+        self.assertEqual(len(parallel_result.results), len(circuits))
+        for circuit in circuits:
+            serial_probs = counts_to_list(serial_result.get_counts(circuit))
+            parallel_probs = counts_to_list(parallel_result.get_counts(circuit))
+            self.assertTrue(np.allclose(serial_probs, parallel_probs))
+
+    def test_single_rank_mpi(self):
+        backend = FakeRankBackend()
+        with mock.patch.dict("sys.modules", fake_mpi4py(FakeComm(0, 1))):
+            outcomes = simulate_across_mpi_ranks(backend, ["a", "b", "c"])
+
+        self.assertEqual(backend.simulated, ["a", "b", "c"])
+        self.assertEqual([outcome["experiment"] for outcome in outcomes], ["a", "b", "c"])
+
+    def test_mpi_round_robin(self):
+        experiments = [f"exp{index}" for index in range(7)]
+        peer_payloads = {
+            0: ([(index, {"experiment": experiments[index]}) for index in [0, 3, 6]], None),
+            2: ([(index, {"experiment": experiments[index]}) for index in [2, 5]], None)
+        }
+
+        # Rank 1 of 3 simulates every third experiment starting at 1, and outcomes come back in order
+        backend = FakeRankBackend()
+        with mock.patch.dict("sys.modules", fake_mpi4py(FakeComm(1, 3, peer_payloads))):
+            outcomes = simulate_across_mpi_ranks(backend, experiments)
+
+        self.assertEqual(backend.simulated, ["exp1", "exp4"])
+        self.assertEqual([outcome["experiment"] for outcome in outcomes], experiments)
+
+    def test_mpi_error_propagation(self):
+        # A failure on another rank is raised on this rank too
+        peer_payloads = {1: ([], "rank 1: ValueError('cannot simulate b')")}
+        with mock.patch.dict("sys.modules", fake_mpi4py(FakeComm(0, 2, peer_payloads))):
+            with self.assertRaises(QuacBackendError):
+                simulate_across_mpi_ranks(FakeRankBackend(), ["a", "b"])
+
+        # A local failure is gathered and raised rather than leaving other ranks waiting
+        with mock.patch.dict("sys.modules", fake_mpi4py(FakeComm(0, 1))):
+            with self.assertRaises(QuacBackendError):
+                simulate_across_mpi_ranks(FakeRankBackend(failing_experiment="b"), ["a", "b"])
+
+    def test_mpi_result_cache(self):
+        cached_outcome = {"qubit_measurements": {0: [0]}, "measured_qubits": [0], "probabilities": np.array([1.0, 0.0])}
+
+        def dispatch(experiments, **_):
+            return [dict(cached_outcome, experiment=experiment) for experiment in experiments]
+
+        for rank, root_payload, simulated_experiments in [(0, None, ["b"]), (1, [None, None], ["a", "b"])]:
+            result_cache = ResultCache()
+            result_cache.put("a", cached_outcome)
+
+            # Every rank follows the lookup of rank 0, even if its own cache differs
+            with mock.patch.dict("sys.modules", fake_mpi4py(FakeComm(rank, 2, root_payload=root_payload))), \
+                    mock.patch.object(self.quac_sim, "_result_key", side_effect=lambda experiment, **_: experiment), \
+                    mock.patch.object(self.quac_sim, "_dispatch_experiments", side_effect=dispatch) as dispatcher:
+                outcomes = self.quac_sim._simulate_unique_experiments(["a", "b"], engine="numpy", mpi=True,
+                                                                      result_cache=result_cache)
+
+            self.assertEqual(dispatcher.call_args[0][0], simulated_experiments)
+            self.assertEqual(outcomes[1]["experiment"], "b")
+
+            # Only rank 0 writes to the cache
+            self.assertEqual(result_cache.get("b") is not None, rank == 0)
+
+    def test_mpi_requires_numpy_engine(self):
+        circuit = transpile(random_circuit(2, 2, measure=False), self.quac_sim)
+        circuit.measure_all()
+
+        with self.assertRaises(QuacOptionsError):
+            execute(circuit, self.quac_sim, optimization_level=0, mpi=True).result()
+
+    def test_reused_instances(self):
+        circuits = []
+        for _ in range(4):
+            circuit = transpile(random_circuit(3, 3, measure=False), self.quac_sim)
+            circuit.measure_all()
+            circuits.append(circuit)
+
+        fresh_result = execute(circuits, self.quac_sim, optimization_level=0).result()
+        reused_result = execute(circuits, self.quac_sim, optimization_level=0, reuse_instances=True).result()
+
+        for circuit in circuits:
+            fresh_probs = counts_to_list(fresh_result.get_counts(circuit))
+            reused_probs = counts_to_list(reused_result.get_counts(circuit))
+            self.assertTrue(np.allclose(fresh_probs, reused_probs))
+
+    def test_noise_model_sweep(self):
+        circuits = []
+        for _ in range(3):
+            circuit = transpile(random_circuit(3, 3, measure=False), self.quac_sim)
+            circuit.measure_all()
+            circuits.append(circuit)
+
+        noise_models = [QuacNoiseModel([1000 * (1 + ind) for _ in range(5)], [2000 * (1 + ind) for _ in range(5)])
+                        for ind in range(3)]
+        sweep_probs = self.quac_sim.run_sweep(circuits, noise_models)
+        self.assertEqual(sweep_probs.shape, (3, 3, 2 ** 5))
+
+        for model_index, noise_model in enumerate(noise_models):
+            result = execute(circuits, self.quac_sim, optimization_level=0, quac_noise_model=noise_model,
+                             result_type="probabilities").result()
+            for exp_index in range(len(circuits)):
+                self.assertTrue(np.allclose(sweep_probs[model_index, exp_index],
+                                            result.data(exp_index)["probabilities"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
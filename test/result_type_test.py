@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains test cases for ensuring the NumPy array result types of the density backend
+are working properly in the library.
+"""
+import unittest
+import numpy as np
+from qiskit import QuantumCircuit, execute
+from quac_qiskit import Quac
+from quac_qiskit.exceptions import QuacOptionsError
+from quac_qiskit.format import counts_to_list
+
+
+class ResultTypeTestCase(unittest.TestCase):
+    """Tests probability vector and density matrix results against counts results
+    """
+
+    def setUp(self):
+        # Set up QuaC simulator
+        self.quac_sim = Quac.get_backend("fake_yorktown_density_simulator", t1=True, t2=True, meas=True, zz=True)
+
+        self.test_circuit = QuantumCircuit(3, 3)
+        self.test_circuit.h(0)
+        self.test_circuit.cx(0, 1)
+        self.test_circuit.x(2)
+        self.test_circuit.measure([0, 1, 2], [0, 1, 2])
+
+    def test_probabilities(self):
+        result = execute(self.test_circuit, self.quac_sim, result_type="probabilities").result()
+        probs = result.data(0)["probabilities"]
+
+        self.assertEqual(probs.shape, (2 ** 3,))
+        self.assertAlmostEqual(probs.sum(), 1, 6)
+        self.assertTrue(np.all(probs >= 0))
+
+        counts_probs = counts_to_list(execute(self.test_circuit, self.quac_sim).result().get_counts())
+        self.assertTrue(np.allclose(probs, counts_probs))
+
+    def test_density_matrix(self):
+        result = execute(self.test_circuit, self.quac_sim, result_type="density_matrix", engine="numpy").result()
+        rho = result.data(0)["density_matrix"]
+
+        # The density matrix covers every qubit of the backend
+        n_qubits = self.quac_sim.configuration().n_qubits
+        self.assertEqual(rho.shape, (2 ** n_qubits, 2 ** n_qubits))
+        self.assertAlmostEqual(np.trace(rho).real, 1, 6)
+        self.assertTrue(np.allclose(rho, rho.conj().T))
+        self.assertGreaterEqual(np.linalg.eigvalsh(rho).min(), -1e-8)
+
+    def test_density_matrix_requires_numpy(self):
+        with self.assertRaises(QuacOptionsError):
+            execute(self.test_circuit, self.quac_sim, result_type="density_matrix").result()
+
+    def test_density_matrix_rejects_snapshots(self):
+        with self.assertRaises(QuacOptionsError):
+            execute(self.test_circuit, self.quac_sim, result_type="density_matrix", engine="numpy",
+                    snapshot_times=[0, 100]).result()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains test cases for ensuring integrator options are validated, translated into
+PETSc options, and handed to QuaC properly in the library.
+"""
+import os
+import unittest
+from unittest import mock
+from qiskit import QuantumCircuit, execute
+from quac_qiskit import Quac
+from quac_qiskit.exceptions import QuacOptionsError
+from quac_qiskit.simulators import parallel, solvers
+from quac_qiskit.simulators.solvers import check_solver_options, get_petsc_options, solver_header
+
+
+class SolversTestCase(unittest.TestCase):
+    """Tests integrator option validation, PETSc option translation, and solver result headers
+    """
+
+    def setUp(self):
+        # Set up QuaC simulator
+        self.quac_sim = Quac.get_backend("fake_yorktown_density_simulator", t1=True, t2=True, meas=False, zz=False)
+
+    def test_solver_rejections(self):
+        for solver in ["bdf", "cn"]:
+            with self.assertRaises(QuacOptionsError):
+                check_solver_options(engine="numpy", solver=solver)
+        with self.assertRaises(QuacOptionsError):
+            check_solver_options(engine="quac", solver="expm")
+        with self.assertRaises(QuacOptionsError):
+            check_solver_options(solver="euler")
+        for tolerance in ["atol", "rtol"]:
+            for value in [0, -1e-8]:
+                with self.assertRaises(QuacOptionsError):
+                    check_solver_options(**{tolerance: value})
+        with self.assertRaises(QuacOptionsError):
+            check_solver_options(petsc_options=["-ts_max_snes_failures", "10"])
+
+        # Supported combinations pass
+        check_solver_options(engine="quac", solver="bdf", atol=1e-8, rtol=1e-6)
+        check_solver_options(engine="numpy", solver="expm")
+
+    def test_petsc_options(self):
+        self.assertEqual(get_petsc_options(), "")
+        self.assertEqual(get_petsc_options(solver="bdf", atol=1e-8, petsc_options="-x"),
+                         "-ts_type bdf -ts_adapt_type basic -ts_atol 1e-08 -x")
+        self.assertEqual(get_petsc_options(rtol=1e-6),
+                         "-ts_type rk -ts_rk_type 5dp -ts_adapt_type basic -ts_rtol 1e-06")
+        self.assertEqual(get_petsc_options(solver="cn"), "-ts_type cn")
+
+    def test_solver_header(self):
+        self.assertEqual(solver_header(solver="bdf", atol=1e-8, dt=5),
+                         {"engine": "quac", "solver": "bdf", "dt": 5, "atol": 1e-8, "rtol": None,
+                          "petsc_options": "-ts_type bdf -ts_adapt_type basic -ts_atol 1e-08"})
+        self.assertEqual(solver_header(engine="numpy"),
+                         {"engine": "numpy", "solver": "rk4", "dt": 10, "atol": None, "rtol": None})
+        self.assertEqual(solver_header()["solver"], "default")
+        self.assertEqual(solver_header(engine="trajectories")["solver"], "waiting_time")
+
+        circuit = QuantumCircuit(1, 1)
+        circuit.x(0)
+        circuit.measure(0, 0)
+        result = execute(circuit, self.quac_sim, optimization_level=0, engine="numpy", solver="dopri5").result()
+        self.assertEqual(result.header.to_dict()["solver"], solver_header(engine="numpy", solver="dopri5"))
+
+    def test_worker_petsc_options(self):
+        # Pool workers are handed the PETSc options instead of reading them from this process
+        with mock.patch.object(parallel, "ProcessPoolExecutor") as executor, \
+                mock.patch.dict(os.environ, clear=False):
+            os.environ.pop("PETSC_OPTIONS", None)
+            executor.return_value.__enter__.return_value.map.return_value = []
+            parallel.simulate_in_process_pool(self.quac_sim, [], 2, solver="bdf")
+
+            self.assertNotIn("PETSC_OPTIONS", os.environ)
+            self.assertEqual(executor.call_args[1]["initargs"],
+                             (self.quac_sim, {"solver": "bdf"}, "-ts_type bdf -ts_adapt_type basic"))
+
+        # A worker appends them to its environment before initializing QuaC
+        with mock.patch.object(solvers, "_quac_initialized", False), \
+                mock.patch.object(solvers.quac, "initialize") as initialize, \
+                mock.patch.dict(os.environ, {"PETSC_OPTIONS": "-log_view"}):
+            initialize.side_effect = lambda: self.assertEqual(os.environ["PETSC_OPTIONS"],
+                                                              "-log_view -ts_type cn")
+            parallel._initialize_worker(self.quac_sim, {"solver": "cn"}, "-ts_type cn")
+            parallel._initialize_worker(self.quac_sim, {"solver": "cn"}, "-ts_type cn")
+
+            initialize.assert_called_once_with()
+            self.assertIs(parallel._worker_backend, self.quac_sim)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,8 @@ in the library.
 import random
 import unittest
 import numpy as np
-from quac_qiskit.stat import get_vec_angle, kl_dist_smoothing, discrete_one_samp_ks, choose_index
+from quac_qiskit.stat import get_vec_angle, kl_dist_smoothing, discrete_one_samp_ks, choose_index, \
+    sample_indices
 
 
 class StatTestCase(unittest.TestCase):
@@ -54,6 +55,24 @@ class StatTestCase(unittest.TestCase):
 
             self.assertTrue(discrete_one_samp_ks(experiments_accumulator, dist, 100000)[1])
 
+    def test_sample_indices(self):
+        rng = np.random.default_rng(1234)
+        for _ in range(100):
+            num_outcomes = random.randrange(4, 10)
+            dist = rng.random(num_outcomes)
+            dist /= dist.sum()
+
+            samples = sample_indices(dist, 100000, rng)
+            self.assertEqual(len(samples), 100000)
+            self.assertTrue(((samples >= 0) & (samples < num_outcomes)).all())
+
+            experiments_accumulator = np.bincount(samples, minlength=num_outcomes) / 100000
+            self.assertTrue(discrete_one_samp_ks(experiments_accumulator, dist, 100000)[1])
+
+        # Impossible outcomes are never chosen
+        samples = sample_indices([0, 0.5, 0, 0.5], 1000, rng)
+        self.assertEqual(set(samples.tolist()), {1, 3})
+
 
 if __name__ == '__main__':
     unittest.main()
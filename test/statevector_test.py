@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains test cases for ensuring the state vector fast path for noiseless and
+readout-only noise models matches density matrix simulation
+"""
+import unittest
+from unittest import mock
+import numpy as np
+from qiskit import execute, transpile
+from qiskit.circuit.random import random_circuit
+from quac_qiskit import Quac
+from quac_qiskit.models import QuacNoiseModel
+from quac_qiskit.simulators import CompiledExperiment
+
+
+class StatevectorTestCase(unittest.TestCase):
+    """Tests the state vector fast path against density matrix simulation
+    """
+
+    def setUp(self):
+        # Set up QuaC simulator with measurement error only
+        self.quac_sim = Quac.get_backend("fake_yorktown_density_simulator", t1=False, t2=False, meas=True, zz=False)
+
+    def test_readout_only_statevector(self):
+        for _ in range(3):
+            circuit = transpile(random_circuit(4, 4, measure=False), self.quac_sim)
+            circuit.measure_all()
+
+            fast_result = execute(circuit, self.quac_sim, optimization_level=0, split_clusters=False,
+                                  result_type="probabilities").result()
+            density_probs = execute(circuit, self.quac_sim, optimization_level=0, split_clusters=False,
+                                    statevector=False, result_type="probabilities").result().data(0)["probabilities"]
+
+            self.assertEqual(fast_result.results[0].metadata["simulation_method"], "statevector")
+            self.assertLess(np.abs(fast_result.data(0)["probabilities"] - density_probs).max(), 1e-6)
+
+    def test_noisy_model_is_not_routed(self):
+        circuit = transpile(random_circuit(2, 2, measure=False), self.quac_sim)
+        circuit.measure_all()
+
+        t1_noise_model = QuacNoiseModel([1000] * 5, [float('inf')] * 5)
+        result = execute(circuit, self.quac_sim, optimization_level=0, quac_noise_model=t1_noise_model,
+                         split_clusters=False).result()
+        self.assertNotIn("simulation_method", result.results[0].metadata)
+
+    def test_quac_only_gate_is_not_routed(self):
+        # czx is passed through to QuaC, but its matrix is not known to the state vector simulation
+        compiled_experiment = CompiledExperiment((
+            ("h", {"qubit1": 0, "time": 10}),
+            ("czx", {"qubit1": 0, "time": 20})
+        ), {0: [0]}, 50, 1)
+        noise_model = QuacNoiseModel.get_noiseless_model(1)
+
+        quac_instance = mock.Mock()
+        quac_instance.get_bitstring_probs.return_value = [0.5, 0.5]
+        with mock.patch.object(self.quac_sim, "_run_compiled", return_value=quac_instance) as run_compiled:
+            outcome = self.quac_sim._simulate_compiled(compiled_experiment, noise_model)
+
+        run_compiled.assert_called_once()
+        self.assertNotIn("metadata", outcome)
+        self.assertTrue(np.allclose(outcome["probabilities"], [0.5, 0.5]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains test cases for ensuring the quantum trajectory engine samples the same
+distribution as density matrix simulation
+"""
+import unittest
+import numpy as np
+from qiskit import QuantumCircuit, execute, transpile
+from qiskit.circuit.random import random_circuit
+from quac_qiskit import Quac
+from quac_qiskit.exceptions import QuacOptionsError
+from quac_qiskit.models import QuacNoiseModel
+from quac_qiskit.simulators import TrajectoryEngine, LindbladEngine, CompiledExperiment
+
+
+class TrajectoriesTestCase(unittest.TestCase):
+    """Tests trajectory sampling against density matrix simulation
+    """
+
+    def setUp(self):
+        # T1, T2, and ZZ noise with T2 <= 2 * T1 on every qubit
+        self.noise_model = QuacNoiseModel([800, 2000, 1500, 1000, 1200], [1000, 3000, 900, 1500, 2000],
+                                          zz={(0, 1): 1e-3, (1, 2): 3e-3})
+
+    def test_engine_matches_lindblad(self):
+        gates = (("h", {"qubit1": 0, "time": 1}), ("x", {"qubit1": 1, "time": 1}), ("h", {"qubit1": 2, "time": 1}),
+                 ("cnot", {"qubit1": 0, "qubit2": 2, "time": 300}), ("h", {"qubit1": 0, "time": 700}),
+                 ("h", {"qubit1": 2, "time": 800}))
+        compiled_experiment = CompiledExperiment(gates, {0: [0], 1: [1], 2: [2]}, 1500, 3)
+        noise_model = self.noise_model.restrict([0, 1, 2])
+
+        rho = LindbladEngine(3, noise_model, 1).run(compiled_experiment)
+        exact_probs = LindbladEngine.bitstring_probs(rho)
+
+        shots = 40000
+        engine = TrajectoryEngine(3, noise_model, rng=np.random.default_rng(0))
+        samples = engine.run(compiled_experiment, np.ones(shots, dtype=np.int64))
+        sampled_probs = np.bincount(samples, minlength=8) / shots
+
+        self.assertGreater(engine.jumps, 0)
+        self.assertLess(np.abs(sampled_probs - exact_probs).max(), 0.015)
+
+    def test_counts_match_density(self):
+        density_sim = Quac.get_backend("fake_yorktown_density_simulator", t1=True, t2=True, meas=False, zz=True)
+        counts_sim = Quac.get_backend("fake_yorktown_counts_simulator", t1=True, t2=True, meas=False, zz=True)
+
+        circuit = transpile(random_circuit(3, 3, measure=False), density_sim)
+        circuit.measure_all()
+
+        shots = 20000
+        density_probs = execute(circuit, density_sim, optimization_level=0, quac_noise_model=self.noise_model,
+                                engine="numpy").result().get_counts()
+        trajectory_result = execute(circuit, counts_sim, optimization_level=0, quac_noise_model=self.noise_model,
+                                    engine="trajectories", trajectories=2000, shots=shots,
+                                    seed_simulator=7).result()
+
+        self.assertEqual(trajectory_result.results[0].metadata["simulation_method"], "trajectories")
+        self.assertEqual(trajectory_result.results[0].metadata["trajectories"], 2000)
+        trajectory_counts = trajectory_result.get_counts()
+        for bitstring in set(density_probs) | set(trajectory_counts):
+            self.assertAlmostEqual(trajectory_counts.get(bitstring, 0) / shots, density_probs.get(bitstring, 0),
+                                   delta=0.05)
+
+        # Seeded runs are reproducible
+        repeated_counts = execute(circuit, counts_sim, optimization_level=0, quac_noise_model=self.noise_model,
+                                  engine="trajectories", trajectories=2000, shots=shots,
+                                  seed_simulator=7).result().get_counts()
+        self.assertEqual(trajectory_counts, repeated_counts)
+
+    def test_duplicate_experiments(self):
+        counts_sim = Quac.get_backend("fake_yorktown_counts_simulator", t1=True, t2=True, meas=False, zz=True)
+        circuit = QuantumCircuit(2, 2)
+        circuit.h(0)
+        circuit.cx(0, 1)
+        circuit.measure([0, 1], [0, 1])
+
+        def run_trajectories():
+            return execute([circuit, circuit], counts_sim, optimization_level=0, engine="trajectories", shots=200,
+                           memory=True, seed_simulator=11).result()
+
+        # Identical experiments of a seeded job sample different shots, but reproducibly
+        result = run_trajectories()
+        repeated_result = run_trajectories()
+        self.assertNotEqual(result.get_memory(0), result.get_memory(1))
+        self.assertEqual(result.get_memory(0), repeated_result.get_memory(0))
+        self.assertEqual(result.get_memory(1), repeated_result.get_memory(1))
+
+    def test_trajectory_options(self):
+        counts_sim = Quac.get_backend("fake_yorktown_counts_simulator", t1=True, t2=True, meas=False, zz=True)
+        circuit = QuantumCircuit(1, 1)
+        circuit.x(0)
+        circuit.measure(0, 0)
+
+        with self.assertRaises(QuacOptionsError):
+            execute(circuit, counts_sim, engine="numpy", trajectories=10).result()
+        with self.assertRaises(QuacOptionsError):
+            execute(circuit, counts_sim, max_parallel_trajectories=2).result()
+        with self.assertRaises(QuacOptionsError):
+            execute([circuit, circuit], counts_sim, engine="trajectories", max_parallel_trajectories=2,
+                    max_parallel_experiments=2).result()
+
+
+if __name__ == '__main__':
+    unittest.main()